@@ -1,26 +1,19 @@
-import os
-from secret import key
-
-def func_key(word, key):
-    return bytes([(word[i] * key[i % 4]) % 256 for i in range(len(word))])
-
-def feistel_round(L, R, key):
-    new_L = R
-    F = func_key(R, key)
-    new_R = bytes([L[j] ^ F[j] for j in range(len(L))])
-    return new_L, new_R
-
-def feistel_cipher(data, key, rounds=1):
-    if len(data) % 2 != 0:
-        data += b"\x00"  # padding
-        
-    mid = len(data) // 2
-    L, R = data[:mid], data[mid:]
-    
-    for _ in range(rounds):
-        L, R = feistel_round(L, R, key)
-    
-    return L + R
+"""
+as_cool_as_xor.py – chiffre une vidéo MP4 par un réseau de Feistel.
+
+Importable (encrypt_file, feistel_cipher…) ou en ligne de commande :
+
+    python3 as_cool_as_xor.py [entrée] [sortie] [--key SHLK | --key-hex 53484c4b]
+                              [--rounds 1] [--chunk N]
+
+Sans --key/--key-hex, la clé est lue dans le module secret (key).
+Le chiffrement se fait en flux : entrée et sortie sont projetées en mémoire
+et traitées par blocs alignés sur la clé, quelle que soit leur taille.
+"""
+import argparse, mmap, os, sys
+
+# func_key / feistel_round / feistel_cipher : moteur vectorisé (numpy ou repli)
+from feistel_backend import func_key, feistel_round, feistel_cipher
 
 input_file = "L-is-dead.mp4"
 output_encrypted = "video_encrypted.mp4"
@@ -28,22 +21,68 @@ output_encrypted = "video_encrypted.mp4"
 #Check header MP4
 expected_bits = "0000000000000000000000000001100001100110011101000111100101110000"
 
-with open(input_file, "rb") as f:
-    data = f.read(8)
-    actual_bits = ''.join(f'{byte:08b}' for byte in data)
+CHUNK = 4 << 20                     # 4 Mio par bloc (multiple de 4)
 
-if actual_bits == expected_bits:
-    print("OK")
-else:
+
+def check_header(path: str) -> bool:
+    with open(path, "rb") as f:
+        data = f.read(8)
+        actual_bits = ''.join(f'{byte:08b}' for byte in data)
+
+    if actual_bits == expected_bits:
+        print("OK")
+        return True
     print("KO")
     print(f"actual bits : {actual_bits}")
+    return False
+
+
+def encrypt_file(src_path: str, dst_path: str, key: bytes, rounds: int = 1,
+                 chunk: int = CHUNK) -> None:
+    """Équivalent en flux de feistel_cipher(open(src).read(), key, rounds)."""
+    if chunk <= 0 or chunk % len(key):
+        raise ValueError(f"Taille de bloc {chunk} non alignée sur la clé")
+    size = os.path.getsize(src_path)
+    mid = (size + 1) // 2                          # + padding si impair
+    with open(src_path, "rb") as f, open(dst_path, "w+b") as out:
+        out.truncate(2 * mid)
+        if not mid:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as src, \
+             mmap.mmap(out.fileno(), 0, access=mmap.ACCESS_WRITE) as dst:
+            for off in range(0, mid, chunk):
+                end = min(off + chunk, mid)
+                L, R = src[off:end], src[mid + off:mid + end]
+                R += b"\x00" * (end - off - len(R))  # padding
+                for _ in range(rounds):
+                    L, R = feistel_round(L, R, key)
+                dst[off:end], dst[mid + off:mid + end] = L, R
 
 
-with open(input_file, "rb") as f:
-    data = f.read()
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("input", nargs="?", default=input_file)
+    ap.add_argument("output", nargs="?", default=output_encrypted)
+    ap.add_argument("--key", help="clé ASCII")
+    ap.add_argument("--key-hex", help="clé en hexadécimal")
+    ap.add_argument("--rounds", type=int, default=1)
+    ap.add_argument("--chunk", type=int, default=CHUNK)
+    args = ap.parse_args(argv)
+
+    if args.key_hex:
+        key = bytes.fromhex(args.key_hex)
+    elif args.key:
+        key = args.key.encode()
+    else:
+        try:
+            from secret import key
+        except ImportError:
+            sys.exit("Clé absente : --key, --key-hex ou module secret")
+
+    check_header(args.input)
+    encrypt_file(args.input, args.output, key, args.rounds, args.chunk)
+    print("OK")
 
-ciphered_data = feistel_cipher(data, key)
-with open(output_encrypted, "wb") as f:
-    f.write(ciphered_data)
 
-print("OK")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_parallel.py
+-----------------
+Débit du déchiffrement multi-cœur (feistel_parallel) comparé à
+solve_video_final.main (lecture complète, un seul cœur).
+
+Un chiffré synthétique de --size Mio est fabriqué dans un dossier
+temporaire : moitiés aléatoires, en-tête MP4 forgé pour que derive_key
+retrouve la clé. Les condensats SHA-256 de toutes les variantes doivent
+être identiques.
+
+Usage :  python3 bench_parallel.py [--size 256] [--workers 1 2 4 8]
+"""
+
+import argparse, contextlib, io, os, re, tempfile, time
+
+import solve_video_final
+from feistel_backend import mix
+from feistel_parallel import parallel_decrypt
+
+KEY = b"SHLK"
+HDR = solve_video_final.HDR0 + solve_video_final.HDR1
+
+
+def make_cipher(path: str, size: int) -> None:
+    """Chiffré aléatoire de size octets dont le clair commence par HDR."""
+    mid, block = size // 2, 16 << 20
+    with open(path, "wb") as f:
+        for off in range(0, size, block):
+            f.write(os.urandom(min(block, size - off)))
+    with open(path, "r+b") as f:
+        R = f.read(len(HDR))
+        f.seek(mid); f.write(mix(HDR, R, KEY))            # CR = HDR ⊕ F(R)
+
+
+def run_main(workdir: str) -> str:
+    """Exécute solve_video_final.main() et renvoie le condensat imprimé."""
+    out, cwd = io.StringIO(), os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(out):
+            solve_video_final.main([])
+    finally:
+        os.chdir(cwd)
+    return re.search(r"SHLK\{([0-9a-f]{64})\}", out.getvalue()).group(1)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=256, help="taille en Mio")
+    ap.add_argument("--workers", type=int, nargs="+",
+                    default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = ap.parse_args()
+    size = args.size << 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ciph = os.path.join(tmp, solve_video_final.CIPH)
+        make_cipher(ciph, size)
+        print(f"Chiffré synthétique : {args.size} Mio, {os.cpu_count()} cœur(s)\n")
+        print(f"{'variante':<24}{'temps (s)':>10}{'Mo/s':>10}{'accél.':>8}")
+
+        t0 = time.perf_counter()
+        ref = run_main(tmp)
+        base = time.perf_counter() - t0
+        print(f"{'solve_video_final.main':<24}{base:>10.2f}{size / base / 1e6:>10.1f}{1:>8.2f}")
+
+        for w in args.workers:
+            t0 = time.perf_counter()
+            digest = parallel_decrypt(ciph, KEY, os.path.join(tmp, "par.mp4"), w)
+            dt = time.perf_counter() - t0
+            assert digest == ref, f"condensat divergent avec {w} worker(s)"
+            print(f"{f'parallel ×{w}':<24}{dt:>10.2f}{size / dt / 1e6:>10.1f}{base / dt:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
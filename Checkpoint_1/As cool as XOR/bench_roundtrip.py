@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_roundtrip.py
+------------------
+Aller-retour chiffrement (as_cool_as_xor.encrypt_file) / déchiffrement
+(feistel_stream.stream_decrypt) sur des fichiers synthétiques de 1 Mo à 4 Go.
+
+Chaque clair commence par l’en-tête MP4 attendu et son SHA-256 est calculé
+à la génération ; le condensat du fichier restauré doit être identique.
+Les fichiers sont créés puis supprimés un par un (prévoir ~3× la plus grande
+taille sur disque).
+
+Usage :  python3 bench_roundtrip.py [--sizes 1M 16M 256M 1G 4G] [--rounds 1]
+                                   [--key SHLK] [--odd] [--dir /tmp]
+"""
+
+import argparse, hashlib, os, tempfile, time
+
+from as_cool_as_xor import encrypt_file
+from feistel_stream import stream_decrypt
+
+HDR = b"\x00\x00\x00\x18ftypmp42"
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(s: str) -> int:
+    s = s.strip().upper()
+    return int(s[:-1]) * UNITS[s[-1]] if s[-1] in UNITS else int(s)
+
+
+def make_plain(path: str, size: int) -> str:
+    """Clair synthétique (en-tête MP4 + aléa), renvoie son SHA-256."""
+    sha, block = hashlib.sha256(), 16 << 20
+    with open(path, "wb") as f:
+        for off in range(0, size, block):
+            buf = bytearray(os.urandom(min(block, size - off)))
+            if not off:
+                buf[:len(HDR)] = HDR[:len(buf)]
+            if off + len(buf) == size and buf[-1] == 0:
+                buf[-1] = 1                        # évite l’ambiguïté du padding
+            f.write(buf)
+            sha.update(buf)
+    return sha.hexdigest()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", nargs="+", default=["1M", "16M", "256M", "1G", "4G"])
+    ap.add_argument("--rounds", type=int, default=1)
+    ap.add_argument("--key", default="SHLK")
+    ap.add_argument("--odd", action="store_true", help="tailles impaires (padding)")
+    ap.add_argument("--dir", default=None, help="dossier de travail")
+    args = ap.parse_args()
+    key = args.key.encode()
+
+    print(f"clé {key}, {args.rounds} tour(s)\n")
+    print(f"{'taille':>10}{'chiffr. Mo/s':>14}{'déchiffr. Mo/s':>16}  aller-retour")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        plain, ciph, back = (os.path.join(tmp, n) for n in ("p.mp4", "c.mp4", "r.mp4"))
+        for label in args.sizes:
+            size = parse_size(label) + (1 if args.odd else 0)
+            ref = make_plain(plain, size)
+
+            t0 = time.perf_counter()
+            encrypt_file(plain, ciph, key, args.rounds)
+            t_enc = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            digest = stream_decrypt(ciph, key, back, rounds=args.rounds)
+            t_dec = time.perf_counter() - t0
+
+            ok = digest == ref and os.path.getsize(back) == size
+            print(f"{label:>10}{size / t_enc / 1e6:>14.1f}{size / t_dec / 1e6:>16.1f}"
+                  f"  {'OK' if ok else 'ÉCHEC'}")
+            for p in (plain, ciph, back):
+                os.remove(p)
+            if not ok:
+                raise SystemExit(f"aller-retour incorrect pour {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_solvers.py
+----------------
+Suite de non-régression des solveurs : dérivation de clé et restauration
+complète sur des chiffrés synthétiques de taille croissante.
+
+Les solveurs d’origine (solve_video*.py du commit --baseline, relus par
+git show, sans toucher l’arbre) servent de référence face aux solveurs
+actuels (feistel_solver et ses points d’entrée). Étant en pur Python octet
+par octet, ils ne sont lancés que jusqu’à --baseline-max.
+
+Pour chaque implémentation et chaque taille : temps (s) et pic mémoire
+Python (tracemalloc, Mio). Les condensats de toutes les variantes, origine
+comprise, doivent être identiques. Les processus de --workers ne sont pas
+tracés : seul le pic du processus parent est compté.
+
+--save FICHIER  enregistre les mesures (JSON) comme référence ;
+--check FICHIER compare à la référence et sort en erreur si un temps ou un
+                pic dépasse tolérance × référence (les durées < 5 ms sont
+                ignorées, trop bruitées).
+
+Usage :  python3 bench_solvers.py [--sizes 1M 16M 64M 256M] [--save ref.json]
+                                  [--check ref.json] [--tolerance 1.5]
+                                  [--baseline 95f11b0] [--baseline-max 16M]
+"""
+
+import argparse, contextlib, io, json, os, re, subprocess, sys, tempfile, time, tracemalloc, types
+
+import feistel_keys, feistel_solver
+import solve_video, solve_video_fix, solve_video_final
+from bench_parallel import KEY, make_cipher
+from bench_roundtrip import parse_size
+
+HDR = feistel_solver.HDR
+REPEAT = 200                        # dérivations par mesure
+MIN_TIME = 5e-3                     # en deçà, pas de comparaison de temps
+BASELINE = "95f11b0"                # commit des solveurs d’origine
+BASELINE_MAX = "16M"                # au-delà, solveurs d’origine trop lents
+SOLVERS = ("solve_video", "solve_video_fix", "solve_video_final")
+
+
+# --- solveurs d’origine, relus dans l’historique git ---
+def load_baseline(name: str, rev: str = BASELINE) -> types.ModuleType:
+    """Module `name` tel qu’il était au commit rev (l’arbre n’est pas modifié)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    src = subprocess.run(["git", "show", f"{rev}:./{name}.py"], cwd=here,
+                         capture_output=True, check=True).stdout
+    mod = types.ModuleType(f"{name}@{rev}")
+    mod.__file__ = f"{rev}:{name}.py"
+    exec(compile(src, mod.__file__, "exec"), mod.__dict__)
+    return mod
+
+
+# --- implémentations comparées ---
+def _entry(fn, *args):
+    """main() d’un solveur lancé dans le dossier courant, condensat imprimé."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        fn(*args)
+    return re.search(r"SHLK\{([0-9a-f]{64})\}", out.getvalue()).group(1)
+
+
+def _derive(fn):
+    def run():
+        R, CR = feistel_solver.read_halves(feistel_solver.CIPH, len(HDR))
+        for _ in range(REPEAT):
+            key = fn(R, CR)
+        assert key == KEY, key
+    return run
+
+
+def implementations(rev: str = BASELINE):
+    """(dérivations, restaurations d’origine, restaurations actuelles)."""
+    old = {name: load_baseline(name, rev) for name in SOLVERS}
+    derive = {
+        **{f"{rev} {name}.derive_key": _derive(mod.derive_key) for name, mod in old.items()},
+        "feistel_solver.derive_key": _derive(feistel_solver.derive_key),
+        "feistel_keys.derive_key":   _derive(lambda R, CR: feistel_keys.derive_key(R, CR, HDR)),
+    }
+    baseline = {f"{rev} {name}": (lambda mod=mod: _entry(mod.main)) for name, mod in old.items()}
+    current = {
+        "solve_video":              lambda: _entry(solve_video.main),
+        "solve_video_fix":          lambda: _entry(solve_video_fix.main),
+        "solve_video_final":        lambda: _entry(solve_video_final.main, []),
+        "solve_video_final stream": lambda: _entry(solve_video_final.main, ["--stream"]),
+        "solve_video_final ×2":     lambda: _entry(solve_video_final.main, ["--workers", "2"]),
+        "solve_video_final pipe":   lambda: _entry(solve_video_final.main, ["--pipeline"]),
+    }
+    return derive, baseline, current
+
+
+# --- mesure : temps + pic tracemalloc ---
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, dt, peak
+
+
+def run_suite(sizes, rev: str = BASELINE, baseline_max: str = BASELINE_MAX) -> dict:
+    derive, baseline, current = implementations(rev)
+    results, cwd = {}, os.getcwd()
+    print(f"{'taille':>8}  {'implémentation':<36}{'temps (s)':>10}{'pic Mio':>10}")
+    for label in sizes:
+        size = parse_size(label)
+        runs = {**derive, **(baseline if size <= parse_size(baseline_max) else {}), **current}
+        with tempfile.TemporaryDirectory() as tmp:
+            make_cipher(os.path.join(tmp, feistel_solver.CIPH), size)
+            os.chdir(tmp)
+            try:
+                digests = set()
+                for name, fn in runs.items():
+                    digest, dt, peak = measure(fn)
+                    if digest is not None:
+                        digests.add(digest)
+                    results[f"{label} {name}"] = {"time": dt, "peak": peak}
+                    print(f"{label:>8}  {name:<36}{dt:>10.3f}{peak / 2**20:>10.1f}")
+            finally:
+                os.chdir(cwd)
+            if len(digests) != 1:
+                sys.exit(f"❌  condensats divergents pour {label} : {digests}")
+    return results
+
+
+def check(results: dict, ref: dict, tolerance: float) -> list:
+    """Mesures dépassant tolérance × référence."""
+    bad = []
+    for name, m in results.items():
+        r = ref.get(name)
+        if r is None:
+            continue
+        if r["time"] >= MIN_TIME and m["time"] > tolerance * r["time"]:
+            bad.append(f"{name} : temps {m['time']:.3f} s > {tolerance} × {r['time']:.3f} s")
+        if r["peak"] and m["peak"] > tolerance * r["peak"]:
+            bad.append(f"{name} : pic {m['peak'] / 2**20:.1f} Mio "
+                       f"> {tolerance} × {r['peak'] / 2**20:.1f} Mio")
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", nargs="+", default=["1M", "16M", "64M", "256M"])
+    ap.add_argument("--save", metavar="FICHIER", help="enregistrer comme référence")
+    ap.add_argument("--check", metavar="FICHIER", help="comparer à une référence")
+    ap.add_argument("--tolerance", type=float, default=1.5)
+    ap.add_argument("--baseline", default=BASELINE, metavar="REV",
+                    help="commit des solveurs d’origine (référence)")
+    ap.add_argument("--baseline-max", default=BASELINE_MAX, metavar="TAILLE",
+                    help="taille maximale pour les solveurs d’origine")
+    args = ap.parse_args()
+
+    results = run_suite(args.sizes, args.baseline, args.baseline_max)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"💾  Référence → {args.save}")
+    if args.check:
+        with open(args.check) as f:
+            bad = check(results, json.load(f), args.tolerance)
+        for line in bad:
+            print(f"⚠️   {line}")
+        if bad:
+            sys.exit(f"❌  {len(bad)} régression(s)")
+        print("✅  Aucune régression")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_anchors.py
+------------------
+Recherche de clé quand l’en-tête ftyp est inutilisable (capture tronquée ou
+corrompue) : la structure interne du MP4 sert de clair connu.
+
+Deux familles d’ancres, évaluées sur des fenêtres réparties dans L0 :
+
+  • octets nuls (remplissage des atomes free, champs version/flags, tailles
+    big-endian, préfixes de longueur AVCC dans mdat) : si L0[j] = 0 alors
+    R[j]·k ≡ CR[j], et pour R[j] impair k = CR[j]·R[j]⁻¹ (mod 256). Chaque
+    position vote pour une valeur de sa voie, par blocs de 16 Kio ; seuls
+    les pics significatifs d’un bloc comptent (le bruit se répartit sur 256
+    valeurs), la vraie clé ressort ;
+  • couples taille/type d’atome (moov, mvhd, trak, mdat…) : supposer le type
+    à la position p fixe les 4 voies d’un coup (quand R[p..p+3] est impair) ;
+    la taille déchiffrée juste avant doit être plausible. Les vraies
+    positions votent toutes pour la même clé de 32 bits.
+
+score(clé) = excédent « nul » de ses 4 octets + 4 × votes « atome » : toutes
+les 2^32 clés sont ainsi notées d’un bloc, sans énumération. Le calcul est
+vectorisé (numpy) avec un repli pur Python sur un échantillon réduit.
+
+best_key() n’accepte la première clé que si son score dépasse MIN_SCORE avec
+MIN_MARGIN d’avance sur la suivante, et si le clair qu’elle donne a une
+structure MP4 : deux atomes connus dont les tailles s’enchaînent (ftyp →
+moov…, ou frères dans moov) ou un atome de premier niveau qui finit pile en
+fin de fichier. Sinon RuntimeError, plutôt qu’un faux flag.
+
+Usage :  python3 feistel_anchors.py video_encrypted.mp4 [--top 5]
+"""
+
+import argparse, collections, os, struct
+
+try:
+    import numpy as np
+except ImportError:                 # repli pur Python
+    np = None
+
+from feistel_reader import FeistelReader
+
+KEY_LEN = 4
+BOX_TYPES = [b"moov", b"mvhd", b"trak", b"tkhd", b"mdia", b"mdhd", b"hdlr",
+             b"minf", b"vmhd", b"smhd", b"dinf", b"dref", b"stbl", b"stsd",
+             b"stts", b"stss", b"stsc", b"stsz", b"stco", b"co64", b"edts",
+             b"elst", b"udta", b"meta", b"ilst", b"mdat", b"free", b"skip",
+             b"avc1", b"avcC", b"mp4a", b"esds", b"ctts", b"sgpd", b"sbgp"]
+
+TOP_TYPES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"moof",
+             b"mfra", b"uuid"}
+CHAIN_TYPES = TOP_TYPES | set(BOX_TYPES)
+
+BLOCK = 1 << 14                     # granularité du test de pic « nul »
+MIN_SCORE = 100                     # score d’une vraie clé : ~ milliers ; bruit : < 10
+MIN_MARGIN = 16                     # avance exigée sur la clé suivante
+
+# inverse modulo 256 des octets impairs (0 pour les pairs : ignorés)
+INV = [pow(r, -1, 256) if r & 1 else 0 for r in range(256)]
+
+
+# --- fenêtres d’échantillonnage dans la première moitié ---
+def windows(mid: int, count: int, size: int, skip: int):
+    """Offsets (début, fin) de `count` fenêtres réparties dans [skip, mid)."""
+    span = mid - skip
+    if span <= count * size:
+        return [(skip, mid)] if span > 0 else []
+    step = (span - size) // max(count - 1, 1)
+    return [(skip + i * step, skip + i * step + size) for i in range(count)]
+
+
+# --- seuil de significativité d’un pic de votes ---
+def _excess(h: list) -> list:
+    """
+    Votes d’un bloc pour une voie : ne garde que l’excédent des pics
+    significatifs (bruit ~ Poisson de moyenne μ, seuil μ + 5√μ + 3). Les
+    blocs de données aléatoires (mdat compressé) n’apportent alors rien.
+    """
+    mu = sum(h) / 256
+    thr = mu + 5 * mu ** 0.5 + 3
+    return [v - mu if v >= thr else 0.0 for v in h]
+
+
+# --- moteur numpy ---
+def _scores_np(samples, limit: int):
+    inv = np.array(INV, np.uint16)
+    lanes = np.zeros((KEY_LEN, 256))
+    packed = []
+    for off, R, CR in samples:
+        r = np.frombuffer(R, np.uint8).astype(np.uint16)
+        c = np.frombuffer(CR, np.uint8).astype(np.uint16)
+        pos = np.arange(r.size) + off
+        odd = (r & 1).astype(bool)
+        k = (c * inv[r]) & 0xFF
+        nb = -(-r.size // BLOCK)
+        idx = ((pos - off) // BLOCK * KEY_LEN + pos % KEY_LEN) * 256 + k
+        h = np.bincount(idx[odd], minlength=nb * KEY_LEN * 256).reshape(nb, KEY_LEN, 256)
+        mu = h.sum(axis=2, keepdims=True) / 256
+        lanes += np.where(h >= mu + 5 * np.sqrt(mu) + 3, h - mu, 0).sum(axis=0)
+
+        n = r.size - 8
+        if n <= 0:
+            continue
+        ok = odd[4:4 + n] & odd[5:5 + n] & odd[6:6 + n] & odd[7:7 + n]
+        shifts = [(8 * ((pos[:n] + 4 + i) % KEY_LEN)).astype(np.uint32) for i in range(4)]
+        for t in BOX_TYPES:
+            key32 = np.zeros(n, np.uint32)
+            size = np.zeros(n, np.uint32)
+            for i in range(4):
+                ki = ((c[4 + i:4 + i + n] ^ t[i]) * inv[r[4 + i:4 + i + n]]) & 0xFF
+                si = c[i:i + n] ^ ((r[i:i + n] * ki) & 0xFF)        # même voie
+                key32 |= ki.astype(np.uint32) << shifts[i]
+                size = (size << 8) | si
+            packed.append(key32[ok & (size >= 8) & (size <= limit)])
+    boxes = collections.Counter()
+    if packed:
+        vals, counts = np.unique(np.concatenate(packed), return_counts=True)
+        boxes.update(dict(zip(vals.tolist(), counts.tolist())))
+    return lanes.tolist(), boxes
+
+
+# --- repli pur Python ---
+def _scores_py(samples, limit: int):
+    lanes = [[0.0] * 256 for _ in range(KEY_LEN)]
+    boxes = collections.Counter()
+    for off, R, CR in samples:
+        for b in range(0, len(R), BLOCK):
+            h = [[0] * 256 for _ in range(KEY_LEN)]
+            for j in range(b, min(b + BLOCK, len(R))):
+                if R[j] & 1:
+                    h[(off + j) % KEY_LEN][(CR[j] * INV[R[j]]) & 0xFF] += 1
+            for l in range(KEY_LEN):
+                lanes[l] = [a + e for a, e in zip(lanes[l], _excess(h[l]))]
+        for p in range(4, len(R) - 3):
+            if not (R[p] & R[p + 1] & R[p + 2] & R[p + 3] & 1):
+                continue
+            for t in BOX_TYPES:
+                key32 = size = 0
+                for i in range(4):
+                    ki = ((CR[p + i] ^ t[i]) * INV[R[p + i]]) & 0xFF
+                    size = (size << 8) | (CR[p - 4 + i] ^ ((R[p - 4 + i] * ki) & 0xFF))
+                    key32 |= ki << (8 * ((off + p + i) % KEY_LEN))
+                if 8 <= size <= limit:
+                    boxes[key32] += 1
+    return lanes, boxes
+
+
+def unpack(key32: int) -> bytes:
+    return key32.to_bytes(KEY_LEN, "little")
+
+
+# --- classement des clés ---
+def rank_keys(samples, limit: int, top: int = 5):
+    """[(clé, score, votes nuls, votes atomes)] triés par score décroissant."""
+    lanes, boxes = (_scores_np if np is not None else _scores_py)(samples, limit)
+    # candidats : meilleures clés « atome » + combinaisons des 2 meilleures valeurs par voie
+    best = [sorted(range(256), key=lambda k: -lanes[l][k])[:2] for l in range(KEY_LEN)]
+    cands = {k for k, _ in boxes.most_common(4 * top)}
+    for bits in range(1 << KEY_LEN):
+        key = bytes(best[l][(bits >> l) & 1] for l in range(KEY_LEN))
+        cands.add(int.from_bytes(key, "little"))
+    rows = []
+    for k32 in cands:
+        key = unpack(k32)
+        z = sum(lanes[l][key[l]] for l in range(KEY_LEN))
+        rows.append((key, round(z) + 4 * boxes[k32], round(z), boxes[k32]))
+    rows.sort(key=lambda row: -row[1])
+    return rows[:top]
+
+
+def scan_file(path: str, mid: int = None, count: int = 16, size: int = 1 << 18,
+              skip: int = 64, top: int = 5):
+    """
+    Classe les clés probables de `path`. mid : point de coupure des moitiés
+    (taille d’origine / 2 si la capture est tronquée), skip : octets d’en-tête
+    ignorés car abîmés.
+    """
+    total = os.path.getsize(path)
+    mid = total // 2 if mid is None else mid
+    if np is None:                                   # échantillon réduit
+        count, size = min(count, 8), min(size, 1 << 13)
+    samples = []
+    with open(path, "rb") as f:
+        for a, b in windows(min(mid, total - mid), count, size, skip):
+            f.seek(a);       R = f.read(b - a)
+            f.seek(mid + a); CR = f.read(b - a)
+            n = min(len(R), len(CR))
+            samples.append((a, R[:n], CR[:n]))
+    return rank_keys(samples, 2 * mid, top)
+
+
+# --- validation d’une clé par la structure du clair ---
+def _box(rd: FeistelReader, pos: int):
+    """(taille, type) de l’atome en pos, None si l’en-tête est invalide."""
+    hdr = rd.pread(pos, 16)
+    if len(hdr) < 8:
+        return None
+    size, kind = struct.unpack_from(">I4s", hdr)
+    if size == 1 and len(hdr) == 16:
+        size = struct.unpack_from(">Q", hdr, 8)[0]
+    return (size, kind) if size >= 8 and kind in CHAIN_TYPES else None
+
+
+def chained(path: str, key: bytes, search: int = 1 << 20) -> bool:
+    """Le clair des `search` premiers octets contient-il des atomes qui s’enchaînent ?"""
+    with FeistelReader(path, key) as rd:
+        head = rd.pread(0, search)
+        for t in CHAIN_TYPES:
+            i = head.find(t, 4)
+            while i >= 0:
+                box = _box(rd, i - 4)
+                if box:
+                    end = i - 4 + box[0]
+                    if _box(rd, end) or (t in TOP_TYPES and end in (rd.size, rd.size + 1)):
+                        return True
+                i = head.find(t, i + 1)
+    return False
+
+
+def best_key(path: str, **scan) -> bytes:
+    """Clé retenue par scan_file, RuntimeError si elle est incertaine ou invalide."""
+    ranked = scan_file(path, **scan)
+    if not ranked:
+        raise RuntimeError("chiffré trop court pour la recherche structurelle")
+    key, score = ranked[0][:2]
+    runner = ranked[1][1] if len(ranked) > 1 else 0
+    if score < MIN_SCORE or score - runner < MIN_MARGIN:
+        raise RuntimeError(f"clé structurelle incertaine : {key.hex()} score {score}, "
+                           f"suivante {runner} (minimum {MIN_SCORE}, écart {MIN_MARGIN})")
+    if not chained(path, key):
+        raise RuntimeError(f"clé {key.hex()} rejetée : aucun atome MP4 déchiffré ne s’enchaîne")
+    return key
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("cipher")
+    ap.add_argument("--mid", type=int, default=None,
+                    help="coupure des moitiés si la capture est tronquée")
+    ap.add_argument("--skip", type=int, default=64, help="octets d’en-tête ignorés")
+    ap.add_argument("--top", type=int, default=5)
+    args = ap.parse_args()
+    print(f"{'clé':<22}{'score':>10}{'nuls':>10}{'atomes':>8}")
+    for key, score, z, b in scan_file(args.cipher, args.mid, skip=args.skip, top=args.top):
+        print(f"{key.hex() + ' ' + repr(key.decode('latin1')):<22}{score:>10}{z:>10}{b:>8}")
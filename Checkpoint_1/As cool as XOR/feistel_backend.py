@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_backend.py
+------------------
+Moteur vectorisé de la F-fonction du Feistel de as_cool_as_xor.py :
+
+    F(R)[i] = R[i] · key[i mod 4]  (mod 256)      L' = L ⊕ F(R)
+
+Deux implémentations donnant des octets strictement identiques :
+  • numpy  : moitiés vues comme tableaux uint8, clé répétée, produit/XOR en bloc
+             (le produit uint8 est naturellement réduit mod 256) ;
+  • python : repli sans dépendance, une table de 256 octets par octet de clé
+             (bytes.translate sur chaque voie i mod 4) et XOR sur grands entiers.
+
+Le moteur le plus rapide disponible est exporté sous les noms func_key,
+xor_bytes, mix, mix_into (écriture dans un tampon réutilisable),
+feistel_round et feistel_cipher.
+
+Auto-vérification :  python3 feistel_backend.py
+"""
+
+import functools, sys
+
+try:
+    import numpy as np
+except ImportError:                 # repli pur Python
+    np = None
+
+# tables de multiplication : _MUL[k][b] = (b * k) mod 256
+_MUL = [bytes((b * k) & 0xFF for b in range(256)) for k in range(256)]
+
+
+# --- moteur pur Python ---
+def func_key_py(word: bytes, key: bytes) -> bytes:
+    word, klen = bytes(word), len(key)
+    out = bytearray(len(word))
+    for lane in range(min(klen, len(word))):
+        out[lane::klen] = word[lane::klen].translate(_MUL[key[lane]])
+    return bytes(out)
+
+def xor_bytes_py(a: bytes, b: bytes) -> bytes:
+    n = min(len(a), len(b))
+    x = int.from_bytes(a[:n], "little") ^ int.from_bytes(b[:n], "little")
+    return x.to_bytes(n, "little")
+
+def mix_py(L: bytes, R: bytes, key: bytes) -> bytes:
+    return xor_bytes_py(L, func_key_py(R, key))
+
+def mix_into_py(out, L: bytes, R: bytes, key: bytes) -> int:
+    n = len(R)
+    out[:n] = mix_py(L, R, key)
+    return n
+
+
+# --- moteur numpy ---
+@functools.lru_cache(maxsize=8)
+def _key_lanes(key: bytes, n: int):
+    """Clé répétée sur n octets (mise en cache : mêmes tailles de bloc)."""
+    k = np.frombuffer(bytes(key), np.uint8)
+    lanes = np.tile(k, -(-n // k.size))[:n] if k.size else k
+    lanes.flags.writeable = False
+    return lanes
+
+def func_key_np(word: bytes, key: bytes) -> bytes:
+    w = np.frombuffer(word, np.uint8)
+    return np.multiply(w, _key_lanes(bytes(key), w.size), dtype=np.uint8).tobytes()
+
+def xor_bytes_np(a: bytes, b: bytes) -> bytes:
+    n = min(len(a), len(b))
+    return np.bitwise_xor(np.frombuffer(a, np.uint8, n),
+                          np.frombuffer(b, np.uint8, n)).tobytes()
+
+def mix_np(L: bytes, R: bytes, key: bytes) -> bytes:
+    r = np.frombuffer(R, np.uint8)
+    f = np.multiply(r, _key_lanes(bytes(key), r.size), dtype=np.uint8)
+    return np.bitwise_xor(np.frombuffer(L, np.uint8, r.size), f, out=f).tobytes()
+
+def mix_into_np(out, L: bytes, R: bytes, key: bytes) -> int:
+    r = np.frombuffer(R, np.uint8)
+    o = np.frombuffer(out, np.uint8, r.size)
+    np.multiply(r, _key_lanes(bytes(key), r.size), out=o)
+    np.bitwise_xor(o, np.frombuffer(L, np.uint8, r.size), out=o)
+    return r.size
+
+
+BACKENDS = {"python": (func_key_py, xor_bytes_py, mix_py, mix_into_py)}
+if np is not None:
+    BACKENDS["numpy"] = (func_key_np, xor_bytes_np, mix_np, mix_into_np)
+
+BACKEND = "numpy" if np is not None else "python"
+func_key, xor_bytes, mix, mix_into = BACKENDS[BACKEND]
+
+
+# --- tour et chiffrement (mêmes signatures que as_cool_as_xor.py) ---
+def feistel_round(L: bytes, R: bytes, key: bytes):
+    return R, mix(L, R, key)
+
+def feistel_cipher(data: bytes, key: bytes, rounds: int = 1) -> bytes:
+    if len(data) % 2 != 0:
+        data += b"\x00"             # padding
+    mid = len(data) // 2
+    L, R = data[:mid], data[mid:]
+    for _ in range(rounds):
+        L, R = feistel_round(L, R, key)
+    return L + R
+
+
+# --- auto-vérification : tous les moteurs == définition d’origine ---
+def _reference(data: bytes, key: bytes, rounds: int) -> bytes:
+    if len(data) % 2 != 0:
+        data += b"\x00"
+    mid = len(data) // 2
+    L, R = data[:mid], data[mid:]
+    for _ in range(rounds):
+        F = bytes([(R[i] * key[i % 4]) % 256 for i in range(len(R))])
+        L, R = R, bytes([L[j] ^ F[j] for j in range(len(L))])
+    return L + R
+
+def self_check(max_len: int = 600) -> None:
+    import os
+    key = os.urandom(4)
+    for n in range(max_len):
+        data, rounds = os.urandom(n), 1 + n % 3
+        ref_f = bytes((b * key[i % 4]) & 0xFF for i, b in enumerate(data))
+        ref_c = _reference(data, key, rounds)
+        for name, (fk, xb, mx, mxi) in BACKENDS.items():
+            assert fk(data, key) == ref_f, (name, "func_key", n)
+            assert xb(data, ref_f) == bytes(a ^ b for a, b in zip(data, ref_f)), (name, "xor", n)
+            padded = data + b"\x00" * (n & 1)
+            L, R = padded[:len(padded) // 2], padded[len(padded) // 2:]
+            for _ in range(rounds):
+                L, R = R, mx(L, R, key)
+            assert L + R == ref_c, (name, "cipher", n)
+            buf = bytearray(len(R) + 3)
+            assert mxi(buf, L, R, key) == len(R) and buf[:len(R)] == mx(L, R, key), (name, "mix_into", n)
+    assert feistel_cipher(data, key, rounds) == ref_c
+    print(f"OK – moteurs {sorted(BACKENDS)} identiques (0 ≤ len < {max_len})")
+
+
+if __name__ == "__main__":
+    self_check(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
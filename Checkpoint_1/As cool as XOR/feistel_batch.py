@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_batch.py
+----------------
+Cassage en lot d’un dossier de fichiers chiffrés par as_cool_as_xor.py.
+
+Chaque fichier est confronté à une bibliothèque d’en-têtes connus (MP4,
+MKV/WebM, PNG, JPEG, ZIP, PDF, ELF). Les deux moitiés ne sont lues qu’une
+fois (PROBE octets de chacune) ; les formats sont essayés du plus contraignant
+(nombre d’octets de clair fixés) au moins contraignant et le premier dont
+toutes les voies de clé restent solubles est retenu (feistel_keys). Le
+fichier est ensuite restauré en flux (feistel_stream), les fichiers étant
+traités en parallèle.
+
+Un seul octet connu par voie ne prouve rien : R·k ≡ F (mod 256) a toujours
+une solution quand R est impair, n’importe quelles données « passent ». Un
+en-tête n’est donc essayé que s’il fixe au moins MIN_KNOWN octets dans
+chaque voie de clé ; les signatures courtes (ZIP, PDF, MP4 de marque
+quelconque) sont déclinées en variantes courantes assez longues.
+
+Même ainsi une voie peut garder plusieurs candidats (octets de R pairs aux
+positions connues). Les clés candidates sont alors départagées par
+décryption d’essai de la sonde : champs non fixés du format quand on les
+connaît (ZIP : méthode, longueur et nom du fichier ; MP4 : taille de ftyp,
+marques compatibles, boîte suivante), sinon plausibilité de toute la sonde
+(octets nuls et ASCII imprimable). Si la meilleure clé n’est pas unique, le
+fichier est signalé « clé ambiguë » et n’est pas restauré.
+
+Un octet nul final peut être le padding d’une longueur impaire ou une vraie
+donnée (ZIP sans commentaire, ELF). La longueur du clair est donc lue dans
+le format quand il la donne (EOCD du ZIP, atomes MP4, table des sections
+ELF ; PNG, JPEG et PDF ne finissent jamais par un nul) ; à défaut le nul est
+retiré et la colonne « padding » le signale comme présumé. Une erreur sur un
+fichier (sortie impossible à écrire…) est reportée dans sa ligne sans
+interrompre le lot.
+
+Usage :  python3 feistel_batch.py DOSSIER [-o SORTIE] [--workers N]
+"""
+
+import argparse, collections, concurrent.futures, math, os, struct
+
+from feistel_backend import func_key, xor_bytes
+from feistel_keys import fragment_pools, keys_from_pools
+from feistel_reader import FeistelReader, boxes
+from feistel_stream import stream_decrypt
+
+PROBE = 64                          # octets lus en tête de chaque moitié
+KEY_LEN = 4
+MIN_KNOWN = 2                       # octets de clair connus exigés par voie de clé
+MAX_CANDIDATES = 4096               # clés départagées par décryption d’essai
+
+# --- scores d’un clair d’essai (plus grand = plus plausible) ---
+def plausible(L0: bytes) -> int:
+    """Sonde quelconque : 2 par octet nul, 1 par caractère ASCII imprimable."""
+    return sum(2 if c == 0 else 9 <= c <= 13 or 32 <= c < 127 for c in L0)
+
+
+def _text(field: bytes) -> int:
+    """Champ texte : +1 par caractère imprimable, −2 pour tout autre octet."""
+    return sum(1 if 32 <= c < 127 else -2 for c in field)
+
+
+def _zip_score(L0: bytes) -> int:
+    """En-tête local ZIP : méthode connue, tailles, nom de fichier imprimable."""
+    if len(L0) < 30:
+        return plausible(L0)
+    method, = struct.unpack_from("<H", L0, 8)
+    nlen, = struct.unpack_from("<H", L0, 26)
+    return (4 * (method in (0, 8, 9, 12, 14, 93, 95)) + 4 * (0 < nlen <= 255)
+            + plausible(L0[18:26]) + _text(L0[30:30 + nlen]))
+
+
+def _ftyp_score(L0: bytes) -> int:
+    """Boîte ftyp : taille cohérente, marques compatibles, type de la boîte suivante."""
+    size = int.from_bytes(L0[:4], "big")
+    return (4 * (16 <= size and not size % 4) + plausible(L0[12:16])
+            + _text(L0[16:size]) + _text(L0[size + 4:size + 8]))
+
+
+# --- longueur du clair d’après le format (rd : clair complet, sans padding retiré) ---
+def _zip_end(rd: FeistelReader):
+    """Fin de l’enregistrement EOCD et de son commentaire."""
+    start = max(rd.size - 22 - 0xFFFF - 1, 0)
+    tail = rd.pread(start, rd.size - start)
+    i = tail.rfind(b"PK\x05\x06")
+    if i < 0 or i + 22 > len(tail):
+        return None
+    return start + i + 22 + int.from_bytes(tail[i + 20:i + 22], "little")
+
+
+def _mp4_end(rd: FeistelReader):
+    """Fin du dernier atome de premier niveau."""
+    end = 0
+    for pos, size, _ in boxes(rd):
+        end = pos + size
+    return end or None
+
+
+def _elf_end(rd: FeistelReader):
+    """Fin de la table des sections (e_shoff + e_shnum · e_shentsize)."""
+    h = rd.pread(0, 64)
+    if h[4] == 2:
+        shoff, = struct.unpack_from("<Q", h, 0x28)
+        entsize, num = struct.unpack_from("<HH", h, 0x3A)
+    else:
+        shoff, = struct.unpack_from("<I", h, 0x20)
+        entsize, num = struct.unpack_from("<HH", h, 0x2E)
+    return shoff + entsize * num if shoff else None
+
+
+def _no_nul_end(rd: FeistelReader):
+    """Formats qui ne finissent jamais par un octet nul (IEND, EOI, %%EOF)."""
+    return rd.size - (rd.pread(rd.size - 1, 1) == b"\0")
+
+
+# --- bibliothèque d’en-têtes : fragments (offset, octets) du clair ---
+Header = collections.namedtuple("Header", "name ext fragments score length",
+                                defaults=(plausible, None))
+
+_EBML = (0, b"\x1a\x45\xdf\xa3")
+_EBML_HDR = (5, b"\x42\x86\x81\x01\x42\xf7\x81\x01\x42\xf2\x81\x04"
+                b"\x42\xf3\x81\x08\x42\x82")
+
+# marques ftyp courantes (la taille de boîte, octet 3, est libre)
+_FTYP = [("isom", ".mp4"), ("iso2", ".mp4"), ("iso5", ".mp4"), ("iso6", ".mp4"),
+         ("mp41", ".mp4"), ("mp42", ".mp4"), ("avc1", ".mp4"), ("dash", ".mp4"),
+         ("M4V ", ".m4v"), ("M4A ", ".m4a"), ("qt  ", ".mov"), ("3gp4", ".3gp"),
+         ("3gp5", ".3gp")]
+# ZIP : version requise × drapeaux usuels (descripteur de données, UTF-8)
+_ZIP = [bytes([v, 0]) + f for v in (0x0a, 0x14, 0x2d)
+        for f in (b"\x00\x00", b"\x08\x00", b"\x00\x08", b"\x08\x08")]
+
+HEADERS = [
+    Header("mp4/mp42",  ".mp4",  [(0, b"\x00\x00\x00\x18ftypmp42")], _ftyp_score, _mp4_end),
+    *(Header(f"mp4/{brand.strip()}", ext, [(0, b"\x00\x00\x00"), (4, b"ftyp" + brand.encode())],
+             _ftyp_score, _mp4_end) for brand, ext in _FTYP),
+    Header("mkv",       ".mkv",  [_EBML, _EBML_HDR, (23, b"\x88matroska")]),
+    Header("webm",      ".webm", [_EBML, _EBML_HDR, (23, b"\x84webm")]),
+    Header("png",       ".png",  [(0, b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR")],
+           length=_no_nul_end),
+    Header("jpeg/jfif", ".jpg",  [(0, b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01")],
+           length=_no_nul_end),
+    Header("jpeg/exif", ".jpg",  [(0, b"\xff\xd8\xff\xe1"), (6, b"Exif\x00\x00")],
+           length=_no_nul_end),
+    *(Header(f"zip/{z.hex()}", ".zip", [(0, b"PK\x03\x04" + z)], _zip_score, _zip_end)
+      for z in _ZIP),
+    *(Header(f"pdf/{v}", ".pdf", [(0, f"%PDF-{v}".encode())], length=_no_nul_end)
+      for v in ("1.0", "1.1", "1.2", "1.3", "1.4", "1.5", "1.6", "1.7", "2.0")),
+    Header("elf64",     ".elf",  [(0, b"\x7fELF\x02\x01\x01\x00" + bytes(8))], length=_elf_end),
+    Header("elf32",     ".elf",  [(0, b"\x7fELF\x01\x01\x01\x00" + bytes(8))], length=_elf_end),
+]
+
+def constrained(h: Header) -> int:
+    return sum(len(b) for _, b in h.fragments)
+
+
+def lane_coverage(h: Header, key_len: int = KEY_LEN) -> int:
+    """Nombre d’octets connus de la voie de clé la moins couverte."""
+    counts = [0] * key_len
+    for off, b in h.fragments:
+        for j in range(off, off + len(b)):
+            counts[j % key_len] += 1
+    return min(counts)
+
+HEADERS.sort(key=constrained, reverse=True)        # plus contraignant d’abord
+
+
+# --- départage des clés candidates par décryption d’essai ---
+def best_keys(R: bytes, CR: bytes, h: Header, pools) -> list:
+    """Clés de score maximal sur la sonde ; plusieurs = clé ambiguë, [] = trop de candidates."""
+    if math.prod(len(p) for p in pools) > MAX_CANDIDATES:
+        return []
+    scored = [(h.score(xor_bytes(CR, func_key(R, key))), key)
+              for key in keys_from_pools(pools)]
+    top = max(score for score, _ in scored)
+    return [key for score, key in scored if score == top]
+
+
+# --- identification du format et de la clé à partir des deux sondes ---
+def identify(R: bytes, CR: bytes):
+    """(Header, meilleures clés) du premier format compatible, (None, []) sinon."""
+    for h in HEADERS:
+        if max(off + len(b) for off, b in h.fragments) > len(R) \
+                or lane_coverage(h) < MIN_KNOWN:
+            continue
+        pools = fragment_pools(R, CR, h.fragments)
+        if all(pools):
+            return h, best_keys(R, CR, h, pools)
+    return None, []
+
+
+def restored_name(path: str, ext: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.replace("_encrypted", "") + "_restored" + ext
+
+
+def padding(path: str, key: bytes, h: Header) -> str:
+    """Sort de l’octet nul final : « retiré », « conservé » ou « présumé » (retiré)."""
+    with FeistelReader(path, key, pad=False) as rd:
+        try:
+            n = h.length(rd) if h.length else None
+        except struct.error:                # structure tronquée : indécidable
+            n = None
+        if n == rd.size - 1:
+            return "retiré"
+        if n == rd.size:
+            return "conservé"
+    return "présumé"
+
+
+def crack_file(path: str, out_dir: str) -> dict:
+    row = dict(file=os.path.basename(path), format="—", key=None, out="—", sha="—",
+               pad="—")
+    try:
+        _crack(path, out_dir, row)
+    except (OSError, ValueError, RuntimeError, struct.error) as e:
+        row.update(key=None, out="—", sha="—", pad="—", error=f"{type(e).__name__} : {e}")
+    return row
+
+
+def _crack(path: str, out_dir: str, row: dict) -> None:
+    size = os.path.getsize(path)
+    if size & 1 or not size:
+        row["error"] = "longueur impaire ou nulle"
+        return
+    mid = size // 2
+    with open(path, "rb") as f:
+        R = f.read(min(PROBE, mid))
+        f.seek(mid - 1)
+        last = f.read(1)                    # dernier octet du clair (R0 en clair)
+        CR = f.read(min(PROBE, mid))
+    h, keys = identify(R, CR)
+    if h is None:
+        row["error"] = "aucun en-tête compatible"
+        return
+    row["format"] = f"{h.name} ({constrained(h)} o)"
+    if len(keys) != 1:
+        row["error"] = (f"clé ambiguë ({len(keys)} ex æquo)" if keys
+                        else f"clé ambiguë (> {MAX_CANDIDATES} candidates)")
+        return
+    key = keys[0]
+    if last == b"\0":
+        row["pad"] = padding(path, key, h)
+    out = os.path.join(out_dir, restored_name(path, h.ext))
+    row.update(key=key, out=out,
+               sha=stream_decrypt(path, key, out, pad=row["pad"] in ("retiré", "présumé")))
+
+
+# --- tableau récapitulatif ---
+def print_table(rows) -> None:
+    cols = [("fichier", lambda r: r["file"]),
+            ("format", lambda r: r["format"]),
+            ("clé", lambda r: f"{r['key'].hex()} {r['key'].decode('latin1')!r}"
+                              if r["key"] else r.get("error", "—")),
+            ("padding", lambda r: r["pad"]),
+            ("restauré", lambda r: r["out"]),
+            ("SHA-256", lambda r: r["sha"])]
+    cells = [[fmt(r) for _, fmt in cols] for r in rows]
+    widths = [max([len(name)] + [len(c[i]) for c in cells]) for i, (name, _) in enumerate(cols)]
+    line = lambda vals: "  ".join(v.ljust(w) for v, w in zip(vals, widths)).rstrip()
+    print(line([name for name, _ in cols]))
+    print(line(["─" * w for w in widths]))
+    for c in cells:
+        print(line(c))
+
+
+def crack_dir(directory: str, out_dir: str, workers: int = None) -> list:
+    os.makedirs(out_dir, exist_ok=True)
+    paths = sorted(os.path.join(directory, n) for n in os.listdir(directory)
+                   if os.path.isfile(os.path.join(directory, n)))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(crack_file, paths, [out_dir] * len(paths)))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("dir", help="dossier de fichiers chiffrés")
+    ap.add_argument("-o", "--out", default="restored", help="dossier de sortie")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="fichiers traités en parallèle (défaut : nb de cœurs)")
+    args = ap.parse_args()
+    print_table(crack_dir(args.dir, args.out, args.workers))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_keys.py
+---------------
+Récupération algébrique de la clé multiplicative du Feistel de as_cool_as_xor.py.
+
+Pour un tour, chaque octet de clair connu L0[j] donne une congruence :
+
+    R[j] · k  ≡  F[j] = CR[j] ⊕ L0[j]   (mod 256),   k = key[j mod n]
+
+On l’écrit R[j] = 2^v · r (r impair) : elle n’a de solution que si 2^v | F[j],
+et alors k ≡ (F[j] / 2^v) · r⁻¹  (mod 2^(8-v)), soit 2^v valeurs exactement.
+Les solutions de chaque voie (j mod n) sont intersectées ; aucune des 256
+valeurs n’est essayée à l’aveugle.
+
+Avec plusieurs tours, chaque position reste indépendante (même voie de clé à
+chaque tour) : on filtre les 256 valeurs de chaque voie en remontant les
+tours position par position. Le coût croît en 256·n·tours, jamais en 256^n.
+
+Les candidats de chaque voie sont classés (lettres ASCII, chiffres,
+imprimables, puis le reste) avant toute décryption d’essai.
+"""
+
+import itertools
+
+# --- congruence R·k ≡ F (mod 256) ---
+def solve_lane(r: int, f: int) -> list:
+    """Toutes les k ∈ [0, 256) telles que (r · k) mod 256 == f."""
+    r, f = r & 0xFF, f & 0xFF
+    if r == 0:
+        return list(range(256)) if f == 0 else []
+    v = (r & -r).bit_length() - 1                 # valuation 2-adique de r
+    if f & ((1 << v) - 1):
+        return []
+    mod = 256 >> v
+    k0 = ((f >> v) * pow(r >> v, -1, mod)) % mod  # inverse de la partie impaire
+    return list(range(k0, 256, mod))
+
+
+# --- remontée de plusieurs tours sur une position ---
+def unround(a: int, b: int, k: int, rounds: int) -> int:
+    """(L_n[j], R_n[j]) → L0[j] pour la valeur de clé k."""
+    for _ in range(rounds):
+        a, b = b ^ ((a * k) & 0xFF), a
+    return a
+
+
+# --- ensembles de candidats par voie ---
+def lane_pools(R: bytes, CR: bytes, known: bytes, key_len: int = 4,
+               rounds: int = 1, offset: int = 0) -> list:
+    """Candidats de chaque octet de clé d’après known = L0[offset:offset+len]."""
+    pools = [set(range(256)) for _ in range(key_len)]
+    for i, p in enumerate(known):
+        j = offset + i
+        lane = j % key_len
+        if rounds == 1:
+            pools[lane].intersection_update(solve_lane(R[j], CR[j] ^ p))
+        else:
+            pools[lane] = {k for k in pools[lane]
+                           if unround(R[j], CR[j], k, rounds) == p}
+    return [sorted(pool, key=rank) for pool in pools]
+
+
+def rank(k: int) -> tuple:
+    """Clé de tri : lettres ASCII, chiffres, imprimables, puis le reste."""
+    c = chr(k)
+    return (not (c.isascii() and c.isalpha()), not (c.isascii() and c.isalnum()),
+            not 32 <= k < 127, k)
+
+
+def fragment_pools(R: bytes, CR: bytes, fragments, key_len: int = 4,
+                   rounds: int = 1) -> list:
+    """Comme lane_pools pour plusieurs fragments (offset, octets) de L0."""
+    pools = [set(range(256)) for _ in range(key_len)]
+    for offset, known in fragments:
+        for pool, lane in zip(pools, lane_pools(R, CR, known, key_len, rounds, offset)):
+            pool.intersection_update(lane)
+    return [sorted(pool, key=rank) for pool in pools]
+
+
+def recover_keys(R: bytes, CR: bytes, known: bytes, key_len: int = 4,
+                 rounds: int = 1, offset: int = 0, score=None, limit: int = 4096):
+    """
+    Génère les clés compatibles avec le clair connu, les plus probables
+    d’abord. score(key) (optionnel, plus grand = meilleur) reclasse les
+    `limit` premières par décryption d’essai.
+    """
+    pools = lane_pools(R, CR, known, key_len, rounds, offset)
+    yield from keys_from_pools(pools, score, limit)
+
+
+def keys_from_pools(pools, score=None, limit: int = 4096):
+    """Produit cartésien des voies classées (voir recover_keys)."""
+    keys = (bytes(c) for c in itertools.product(*pools))
+    if score is None:
+        yield from keys
+        return
+    head = list(itertools.islice(keys, limit))
+    head.sort(key=score, reverse=True)
+    yield from head
+    yield from keys
+
+
+def derive_key(R: bytes, CR: bytes, known: bytes, key_len: int = 4,
+               rounds: int = 1, offset: int = 0, score=None) -> bytes:
+    """Clé la mieux classée, RuntimeError si le clair connu est incompatible."""
+    for key in recover_keys(R, CR, known, key_len, rounds, offset, score):
+        return key
+    raise RuntimeError("Aucune clé compatible avec le clair connu")
+
+
+if __name__ == "__main__":
+    import os, sys, time
+    from feistel_backend import feistel_cipher
+
+    # démonstration : clé/tours arbitraires, en-tête MP4 comme clair connu
+    key = sys.argv[1].encode() if len(sys.argv) > 1 else b"SHLK"
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    hdr = b"\x00\x00\x00\x18ftypmp42isommp42"
+    data = hdr + os.urandom(1 << 16)
+    c = feistel_cipher(data, key, rounds)
+    mid = len(c) // 2
+    t0 = time.perf_counter()
+    pools = lane_pools(c[:mid], c[mid:], hdr, len(key), rounds)
+    found = derive_key(c[:mid], c[mid:], hdr, len(key), rounds)
+    dt = time.perf_counter() - t0
+    print("Taille des voies :", [len(p) for p in pools])
+    print(f"Clé retrouvée    : {found}  ({dt * 1e3:.2f} ms)  attendue : {key}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_parallel.py
+-------------------
+Déchiffrement multi-cœur du Feistel 1 tour de as_cool_as_xor.py.
+
+Chaque position i du clair ne dépend que de R[i], CR[i] et key[i mod 4] :
+les moitiés sont donc découpées en blocs alignés sur la clé (offsets
+multiples de 4) et confiées à un pool de processus. Entrée et sortie sont
+partagées par projection mémoire (mmap du chiffré en lecture, du fichier
+restauré en écriture partagée) : seuls des couples (début, fin) transitent
+entre processus. Les blocs sont rendus dans l’ordre du fichier, ce qui
+permet au processus principal de tenir le SHA-256 du flag au fil de l’eau.
+
+Usage :  python3 feistel_parallel.py video_encrypted.mp4 SHLK [sortie] [--workers N]
+"""
+
+import argparse, hashlib, mmap, multiprocessing, os
+
+from feistel_backend import mix
+
+CHUNK = 4 << 20                     # 4 Mio par tâche (multiple de 4)
+
+# --- état propre à chaque processus du pool ---
+_W = {}
+
+def _init(cipher_path: str, out_path: str, key: bytes) -> None:
+    fc, fo = open(cipher_path, "rb"), open(out_path, "r+b")
+    _W.update(key=key,
+              cipher=mmap.mmap(fc.fileno(), 0, access=mmap.ACCESS_READ),
+              out=mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_WRITE),
+              files=(fc, fo))
+
+def _work(task):
+    """task = (dst, src, n, xor_src) ; xor_src < 0 → simple recopie de R0."""
+    dst, src, n, xor_src = task
+    cm, om = _W["cipher"], _W["out"]
+    if xor_src < 0:
+        om[dst:dst + n] = cm[src:src + n]
+    else:
+        om[dst:dst + n] = mix(cm[xor_src:xor_src + n], cm[src:src + n], _W["key"])
+    return dst, n
+
+
+# --- découpage en tâches alignées ---
+def _tasks(mid: int, stop: int, chunk: int):
+    for off in range(0, mid, chunk):                      # L0 = CR ⊕ F(R0)
+        yield off, off, min(chunk, mid - off), mid + off
+    for off in range(0, stop, chunk):                     # R0 recopié
+        yield mid + off, off, min(chunk, stop - off), -1
+
+
+def parallel_decrypt(cipher_path: str, key: bytes, out_path: str,
+                     workers: int = None, chunk: int = CHUNK) -> str:
+    """Restaure le clair dans out_path et renvoie son SHA-256 (hex)."""
+    if chunk <= 0 or chunk % len(key):
+        raise ValueError(f"Taille de bloc {chunk} non alignée sur la clé")
+    size = os.path.getsize(cipher_path)
+    if size & 1:
+        raise ValueError("Longueur chiffré impaire – anormal")
+    mid = size // 2
+    sha = hashlib.sha256()
+
+    last = b""
+    if mid:
+        with open(cipher_path, "rb") as f:
+            f.seek(mid - 1)
+            last = f.read(1)
+    stop = mid - 1 if last == b"\x00" else mid            # padding éventuel
+    with open(out_path, "wb") as out:
+        out.truncate(mid + stop)
+    if not mid + stop:
+        return sha.hexdigest()
+
+    workers = workers or os.cpu_count() or 1
+    with open(out_path, "rb") as fo, \
+         mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ) as om, \
+         multiprocessing.Pool(workers, _init, (cipher_path, out_path, key)) as pool:
+        with memoryview(om) as view:
+            for dst, n in pool.imap(_work, _tasks(mid, stop, chunk)):
+                sha.update(view[dst:dst + n])             # ordre du fichier
+    return sha.hexdigest()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("cipher")
+    ap.add_argument("key")
+    ap.add_argument("out", nargs="?", default="L-is-dead_restored.mp4")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="taille du pool (défaut : nombre de cœurs)")
+    ap.add_argument("--chunk", type=int, default=CHUNK)
+    args = ap.parse_args()
+    digest = parallel_decrypt(args.cipher, args.key.encode(), args.out,
+                              args.workers, args.chunk)
+    print(f"✅  Fichier restauré → {args.out}")
+    print(f"🏁  Flag : SHLK{{{digest}}}")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_pipeline.py
+-------------------
+Restauration en pipeline : lecture, déchiffrement et écriture+SHA-256 se
+recouvrent au lieu de s’enchaîner.
+
+    lecteur ──q_read──▶ déchiffrement ──q_write──▶ écriture + SHA-256
+       ▲                   │    ▲                        │
+       └──── free_in ◀─────┘    └──────── free_out ◀─────┘
+
+Les files sont bornées et les tampons (bytearray) sont recyclés : la
+mémoire vaut (depth + 1) × 3 × chunk quelle que soit la taille de la vidéo,
+chunk étant ramené à la demi-longueur d’un petit fichier. La
+clé est dérivée des premiers tampons lus, sans relecture préalable ; chaque
+octet du clair est produit, écrit et haché une seule fois. Seule R0, dont
+le condensat vient après celui de L0, est relue en fin de parcours.
+
+Chaque étage mesure son temps actif : le rapport en Mo/s désigne l’étage
+limitant.
+
+Usage :  python3 feistel_pipeline.py video_encrypted.mp4 [sortie] [--chunk N] [--depth N]
+         python3 feistel_pipeline.py --self-check
+"""
+
+import argparse, hashlib, os, queue, sys, tempfile, threading, time
+
+from feistel_backend import mix_into
+
+CHUNK = 4 << 20                     # 4 Mio par tampon (multiple de 4)
+DEPTH = 4                           # tampons en vol par étage
+_END = None                         # sentinelle de fin de flux
+
+
+class _Stage:
+    """Compteurs d’un étage : octets traités et temps actif."""
+    def __init__(self, name: str):
+        self.name, self.bytes, self.busy = name, 0, 0.0
+
+    def mbps(self) -> float:
+        return self.bytes / self.busy / 1e6 if self.busy else float("inf")
+
+
+def _get(q: queue.Queue, errors: list):
+    """get() bloquant mais interrompu si un autre étage a échoué."""
+    while True:
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if errors:
+                raise RuntimeError("étage voisin interrompu") from errors[0]
+
+
+def _put(q: queue.Queue, item, errors: list) -> None:
+    """put() bloquant sur une file bornée, interrompu de même : un étage dont
+    le consommateur est mort ne reste pas coincé sur une file pleine."""
+    while True:
+        try:
+            return q.put(item, timeout=0.1)
+        except queue.Full:
+            if errors:
+                raise RuntimeError("étage voisin interrompu") from errors[0]
+
+
+def pipeline_restore(cipher_path: str, out_path: str, key: bytes = None,
+                     derive=None, chunk: int = CHUNK, depth: int = DEPTH):
+    """
+    Restaure le clair dans out_path. La clé est fournie (key) ou calculée
+    par derive(R, CR) sur le premier bloc de chaque moitié.
+    Renvoie (clé, SHA-256 hex, {étage: _Stage}).
+    """
+    if chunk < 64 or chunk % 4:     # le 1er bloc doit couvrir l’en-tête
+        raise ValueError(f"Taille de bloc {chunk} trop petite ou non alignée sur la clé")
+    size = os.path.getsize(cipher_path)
+    if size & 1:
+        raise ValueError("Longueur chiffré impaire – anormal")
+    mid = size // 2
+    chunk = min(chunk, max(-(-mid // 4) * 4, 4))     # tampons bornés par la moitié
+    stats = {n: _Stage(n) for n in ("lecture", "déchiffrement", "écriture+sha256")}
+    q_read, q_write = queue.Queue(depth), queue.Queue(depth)
+    free_in, free_out = queue.Queue(), queue.Queue()
+    for _ in range(depth + 1):
+        free_in.put((bytearray(chunk), bytearray(chunk)))
+        free_out.put(bytearray(chunk))
+    errors, sha, found = [], hashlib.sha256(), [key]
+
+    # --- étage 1 : lecture (R et CR en parallèle, puis R seule) ---
+    def reader():
+        st = stats["lecture"]
+        with open(cipher_path, "rb") as fr, open(cipher_path, "rb") as fc:
+            fc.seek(mid)
+            for off in range(0, mid, chunk):                # L0 : R et CR
+                r, c = _get(free_in, errors)
+                t0 = time.perf_counter()
+                n = fr.readinto(memoryview(r)[:min(chunk, mid - off)])
+                fc.readinto(memoryview(c)[:n])
+                st.busy += time.perf_counter() - t0; st.bytes += 2 * n
+                _put(q_read, ("mix", n, r, c), errors)
+            fr.seek(0)
+            for off in range(0, mid, chunk):                # R0 : recopie
+                r, c = _get(free_in, errors)
+                t0 = time.perf_counter()
+                n = fr.readinto(memoryview(r)[:min(chunk, mid - off)])
+                st.busy += time.perf_counter() - t0; st.bytes += n
+                _put(q_read, ("copy", n, r, c), errors)
+        _put(q_read, _END, errors)
+
+    # --- étage 3 : écriture + SHA-256, dans l’ordre du fichier ---
+    def writer():
+        st = stats["écriture+sha256"]
+        with open(out_path, "wb") as out:
+            while (item := _get(q_write, errors)) is not _END:
+                n, buf, home = item
+                t0 = time.perf_counter()
+                view = memoryview(buf)[:n]
+                out.write(view)
+                sha.update(view)
+                st.busy += time.perf_counter() - t0; st.bytes += n
+                home.put(buf)
+
+    def guarded(fn):
+        def run():
+            try:
+                fn()
+            except BaseException as e:                      # relayée au thread principal
+                errors.append(e)
+        return threading.Thread(target=run, daemon=True)
+
+    threads = [guarded(reader), guarded(writer)]
+    for t in threads:
+        t.start()
+
+    # --- étage 2 : déchiffrement (thread principal) ---
+    st, done = stats["déchiffrement"], 0
+    try:
+        while (item := _get(q_read, errors)) is not _END:
+            kind, n, r, c = item
+            if kind == "mix":
+                t0 = time.perf_counter()
+                if found[0] is None:
+                    found[0] = derive(bytes(r[:n]), bytes(c[:n]))
+                out = _get(free_out, errors)
+                mix_into(out, memoryview(c)[:n], memoryview(r)[:n], found[0])
+                st.busy += time.perf_counter() - t0; st.bytes += n
+                free_in.put((r, c))
+                _put(q_write, (n, out, free_out), errors)
+            else:
+                done += n
+                if done == mid and n and r[n - 1] == 0:     # padding final
+                    n -= 1
+                _put(q_write, (n, r, _Recycle(free_in, c)), errors)
+        _put(q_write, _END, errors)
+    except BaseException as e:
+        errors.append(e)
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]                             # la panne d’origine
+    return found[0], sha.hexdigest(), stats
+
+
+class _Recycle:
+    """Rend le couple (R, CR) à free_in quand l’écrivain libère R."""
+    def __init__(self, pool: queue.Queue, mate: bytearray):
+        self.pool, self.mate = pool, mate
+
+    def put(self, buf: bytearray) -> None:
+        self.pool.put((buf, self.mate))
+
+
+def report(stats: dict, wall: float, size: int) -> None:
+    for st in stats.values():
+        print(f"  {st.name:<16} {st.mbps():>9.1f} Mo/s   (actif {st.busy:6.2f} s)")
+    print(f"  {'global':<16} {size / wall / 1e6:>9.1f} Mo/s   (mur   {wall:6.2f} s)")
+
+
+def self_check(timeout: float = 10.0) -> None:
+    """Aller-retour sur petits fichiers, puis écrivain en panne (sortie =
+    dossier) : l’erreur doit remonter au lieu de bloquer le pipeline."""
+    from as_cool_as_xor import encrypt_file
+
+    key = b"SHLK"
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, ciph, back = (os.path.join(tmp, n) for n in ("p", "c", "r"))
+        for size in (1, 63, 64, 1000, 4097):
+            data = bytearray(os.urandom(size))
+            data[-1] |= 1                           # évite l’ambiguïté du padding
+            with open(plain, "wb") as f:
+                f.write(data)
+            encrypt_file(plain, ciph, key)
+            _, digest, _ = pipeline_restore(ciph, back, key=key, chunk=64, depth=2)
+            assert digest == hashlib.sha256(data).hexdigest(), ("aller-retour", size)
+
+        outcome = []
+
+        def broken():
+            try:
+                pipeline_restore(ciph, tmp, key=key, chunk=64, depth=2)
+                outcome.append(None)
+            except BaseException as e:
+                outcome.append(e)
+        t = threading.Thread(target=broken, daemon=True)
+        t.start()
+        t.join(timeout)
+        assert not t.is_alive(), f"pipeline bloqué plus de {timeout} s après la panne de l’écrivain"
+        assert isinstance(outcome[0], OSError), outcome
+    print("OK – aller-retour identique, panne de l’écrivain remontée "
+          f"({type(outcome[0]).__name__})")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--self-check"]:
+        self_check()
+        sys.exit(0)
+
+    from solve_video_final import derive_key, PLAIN_OUT
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("cipher")
+    ap.add_argument("out", nargs="?", default=PLAIN_OUT)
+    ap.add_argument("--chunk", type=int, default=CHUNK)
+    ap.add_argument("--depth", type=int, default=DEPTH)
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    key, digest, stats = pipeline_restore(args.cipher, args.out, derive=derive_key,
+                                          chunk=args.chunk, depth=args.depth)
+    print(f"🔑  Clé retrouvée : {key}")
+    print(f"🏁  Flag : SHLK{{{digest}}}")
+    report(stats, time.perf_counter() - t0, os.path.getsize(args.cipher))
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_reader.py
+-----------------
+Lecture à accès aléatoire d’une vidéo chiffrée par as_cool_as_xor.py.
+
+Un seul tour de Feistel sur deux moitiés : l’octet p du clair vaut
+
+    p <  mid :  L0[p]     = CR[p] ⊕ (R[p] · key[p mod 4])
+    p >= mid :  R0[p-mid] = R[p - mid]
+
+FeistelReader est un fichier binaire en lecture seule et « seekable » qui ne
+déchiffre que les plages demandées : ffprobe ou un lecteur atteignent
+l’atome moov et les morceaux utiles de mdat sans matérialiser le clair.
+serve() l’expose derrière un petit serveur HTTP local gérant les requêtes
+Range, pour prévisualiser une énorme vidéo chiffrée instantanément.
+
+Usage :  python3 feistel_reader.py video_encrypted.mp4 [--key SHLK] [--serve PORT]
+"""
+
+import argparse, http.server, io, mmap, os, re, shutil, struct
+
+from feistel_backend import mix
+from feistel_keys import derive_key
+
+HDR = b"\x00\x00\x00\x18ftypmp42"   # clair connu pour dériver la clé
+
+
+class FeistelReader(io.RawIOBase):
+    """Clair de `path` vu comme un fichier, déchiffré à la demande."""
+
+    def __init__(self, path: str, key: bytes = None, known: bytes = HDR,
+                 pad: bool = None):
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        if size & 1:
+            self._f.close()
+            raise ValueError("Longueur chiffré impaire – anormal")
+        self._mid = size // 2
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if key is None:
+            n = min(len(known), self._mid)
+            key = derive_key(self._mm[:n], self._mm[self._mid:self._mid + n], known[:n])
+        self.key = bytes(key)
+        # padding éventuel : dernier octet de R0 = dernier octet du clair
+        # (pad : None = octet nul final retiré, True / False pour l’imposer)
+        if pad is None:
+            pad = bool(size) and self._mm[self._mid - 1] == 0
+        self.size = 2 * self._mid - pad
+        self._pos = 0
+
+    # --- interface io.RawIOBase ---
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self.size}[whence]
+        if base + offset < 0:
+            raise ValueError("position négative")
+        self._pos = base + offset
+        return self._pos
+
+    def readinto(self, buf) -> int:
+        data = self.pread(self._pos, len(buf))
+        buf[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            if isinstance(self._mm, mmap.mmap):
+                self._mm.close()
+            self._f.close()
+        super().close()
+
+    # --- déchiffrement d’une plage [pos, pos + n) ---
+    def pread(self, pos: int, n: int) -> bytes:
+        end = min(pos + n, self.size)
+        if pos >= end:
+            return b""
+        mid, mm, parts = self._mid, self._mm, []
+        if pos < mid:                                    # partie L0
+            stop = min(end, mid)
+            r = pos % len(self.key)                      # voie de clé du 1er octet
+            parts.append(mix(mm[mid + pos:mid + stop], mm[pos:stop],
+                             self.key[r:] + self.key[:r]))
+            pos = stop
+        if pos < end:                                    # partie R0 : en clair
+            parts.append(mm[pos - mid:end - mid])
+        return b"".join(parts)
+
+
+# --- atomes MP4 de premier niveau (quelques octets lus par atome) ---
+def boxes(reader: FeistelReader):
+    pos = 0
+    while pos + 8 <= reader.size:
+        reader.seek(pos)
+        size, kind = struct.unpack(">I4s", reader.read(8))
+        if size == 1:
+            size = struct.unpack(">Q", reader.read(8))[0]
+        elif size == 0:
+            size = reader.size - pos
+        if size < 8:
+            break
+        yield pos, size, kind.decode("latin1")
+        pos += size
+
+
+# --- serveur HTTP local avec prise en charge de Range ---
+def serve(path: str, key: bytes = None, port: int = 8000,
+          bind: str = "127.0.0.1", ctype: str = "video/mp4") -> None:
+    key = FeistelReader(path, key).key              # dérivée une seule fois
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self._send(body=False)
+
+        def do_GET(self):
+            self._send(body=True)
+
+        def _send(self, body: bool):
+            with FeistelReader(path, key) as rd:
+                start, end = 0, rd.size - 1
+                m = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+                if m and (m[1] or m[2]):
+                    if m[1]:
+                        start, end = int(m[1]), min(int(m[2] or end), end)
+                    else:                                # suffixe : N derniers octets
+                        start = max(rd.size - int(m[2]), 0)
+                    if start > end:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{rd.size}")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{rd.size}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                if body:
+                    rd.seek(start)
+                    try:
+                        shutil.copyfileobj(_Limited(rd, end - start + 1), self.wfile, 1 << 20)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass                             # le lecteur a coupé
+
+    with http.server.ThreadingHTTPServer((bind, port), Handler) as httpd:
+        print(f"▶️   http://{bind}:{port}/  (clé {key})")
+        httpd.serve_forever()
+
+
+class _Limited:
+    """Lecture bornée à n octets depuis la position courante."""
+    def __init__(self, f, n: int):
+        self.f, self.n = f, n
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.n if size < 0 else min(size, self.n)
+        data = self.f.read(size)
+        self.n -= len(data)
+        return data
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("cipher", help="fichier chiffré (video_encrypted.mp4)")
+    ap.add_argument("--key", help="clé ASCII (sinon dérivée de l’en-tête MP4)")
+    ap.add_argument("--serve", type=int, metavar="PORT",
+                    help="servir le clair en HTTP (Range) sur ce port")
+    args = ap.parse_args()
+    key = args.key.encode() if args.key else None
+
+    if args.serve:
+        serve(args.cipher, key, args.serve)
+    else:
+        with FeistelReader(args.cipher, key) as rd:
+            print(f"🔑  Clé : {rd.key}   taille du clair : {rd.size} octets")
+            for pos, size, kind in boxes(rd):
+                print(f"  {pos:>12}  {size:>12}  {kind}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_solver.py
+-----------------
+Bibliothèque commune des solveurs solve_video.py, solve_video_fix.py et
+solve_video_final.py, qui n’en sont plus que des points d’entrée.
+
+  • read_halves   : 12 octets de chaque moitié suffisent à la clé ;
+  • derive_key    : voies résolues sur les 8 octets sûrs (HDR0), puis
+                    candidats classés et validés sur l’en-tête complet ;
+  • feistel_decrypt / strip_padding : inverse du tour, padding retiré ;
+  • restore       : lecture complète, déchiffrement, écriture + SHA-256.
+
+Les moteurs (numpy ou pur Python) viennent de feistel_backend, la résolution
+algébrique de feistel_keys.
+"""
+
+import hashlib
+
+from feistel_backend import func_key, xor_bytes
+from feistel_keys import lane_pools, recover_keys
+
+# --- constantes ---
+CIPH = "video_encrypted.mp4"
+PLAIN_OUT = "L-is-dead_restored.mp4"
+HDR0 = b"\x00\x00\x00\x18ftyp"      # 8 octets fixes d’un MP4
+HDR1 = b"mp42"                      # major_brand le + courant
+HDR = HDR0 + HDR1                   # 12 octets de clair connu
+KEY_LEN = 4                         # k0 k1 k2 k3
+
+
+# --- lecture des moitiés ---
+def read_halves(path: str, n: int = None):
+    """(R, CR) : les n premiers octets de chaque moitié (tout si n est None)."""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        mid = f.tell() // 2
+        n = mid if n is None else min(n, mid)
+        f.seek(0);   R = f.read(n)
+        f.seek(mid); CR = f.read(n)
+    return R, CR
+
+
+# --- dérivation de la clé ---
+def derive_key(R: bytes, CR: bytes, known: bytes = HDR, safe: bytes = HDR0,
+               key_len: int = KEY_LEN) -> bytes:
+    """
+    Clé la mieux classée compatible avec known = L0[:len(known)].
+    safe (préfixe sûr de known) sert à détecter tôt une voie sans solution.
+    """
+    pools = lane_pools(R, CR, safe, key_len)
+    for idx, pool in enumerate(pools):
+        if not pool:
+            raise RuntimeError(f"Aucune clé possible pour l’octet {idx}")
+    n = len(known)
+    for key in recover_keys(R, CR, known, key_len):
+        # validation rapide : doit refaire l’en-tête complet
+        if xor_bytes(CR[:n], func_key(R[:n], key)) == known:
+            return key
+    raise RuntimeError("clé introuvable ; pools = " + repr(pools))
+
+
+# --- déchiffrement (1 tour Feistel : récupérer L, R) ---
+def feistel_decrypt(cipher: bytes, key: bytes) -> bytes:
+    if len(cipher) & 1:
+        raise ValueError("Longueur chiffré impaire – anormal")
+    mid = len(cipher) // 2
+    R, CR = cipher[:mid], cipher[mid:]          # R0, L0 ⊕ F(R0)
+    return xor_bytes(CR, func_key(R, key)) + R  # L0 ∥ R0
+
+
+def strip_padding(plain: bytes) -> bytes:
+    """Retire l’octet nul ajouté au chiffrement d’une longueur impaire."""
+    if plain and plain[-1] == 0 and (len(plain) - 1) & 1:
+        return plain[:-1]
+    return plain
+
+
+# --- restauration complète en mémoire ---
+def restore(cipher_path: str, out_path: str, key: bytes) -> str:
+    """Écrit le clair dans out_path et renvoie son SHA-256 hexadécimal."""
+    with open(cipher_path, "rb") as f:
+        plain = strip_padding(feistel_decrypt(f.read(), key))
+    with open(out_path, "wb") as f:
+        f.write(plain)
+    return hashlib.sha256(plain).hexdigest()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feistel_stream.py
+-----------------
+Déchiffrement en flux du Feistel de as_cool_as_xor.py (1 tour par défaut).
+
+Les deux moitiés du chiffré (R puis CR = L ⊕ F(R)) sont projetées en mémoire
+(mmap) puis parcourues par blocs de taille fixe ; chaque bloc restauré est
+écrit aussitôt et injecté dans le SHA-256 du flag. La mémoire consommée ne
+dépend que de la taille de bloc, pas de celle de la vidéo.
+
+Avec plusieurs tours, chaque position reste indépendante : le bloc (L_n, R_n)
+est remonté tour par tour ; R0 n’étant plus une simple copie, il est
+recalculé lors du second passage.
+
+Usage :  python3 feistel_stream.py video_encrypted.mp4 SHLK [sortie.mp4] [tours]
+"""
+
+import hashlib, mmap, os, sys
+
+from feistel_backend import mix
+
+CHUNK = 4 << 20                     # 4 Mio par bloc (multiple de 4)
+
+
+# --- écriture d’un bloc + mise à jour du condensat ---
+def _emit(out, sha, block: bytes) -> None:
+    out.write(block)
+    sha.update(block)
+
+
+# --- remontée des tours sur un bloc aligné ---
+def unrounds(Ln: bytes, Rn: bytes, key: bytes, rounds: int):
+    """(L_n, R_n) → (L0, R0) ; pour 1 tour : (CR ⊕ F(R), R)."""
+    a, b = Ln, Rn
+    for _ in range(rounds):
+        a, b = mix(b, a, key), a
+    return a, b
+
+
+# --- déchiffrement bloc par bloc ---
+def stream_decrypt(cipher_path: str, key: bytes, out_path: str,
+                   chunk: int = CHUNK, rounds: int = 1, pad: bool = None) -> str:
+    """
+    Restaure le clair dans out_path et renvoie son SHA-256 (hex).
+    pad : l’octet final est-il du padding ? None = oui s’il est nul (cas de
+    la vidéo) ; True / False quand l’appelant le sait (format du clair).
+    """
+    if chunk <= 0 or chunk % len(key):
+        raise ValueError(f"Taille de bloc {chunk} non alignée sur la clé")
+    size = os.path.getsize(cipher_path)
+    if size & 1:
+        raise ValueError("Longueur chiffré impaire – anormal")
+    mid = size // 2
+    sha = hashlib.sha256()
+
+    with open(cipher_path, "rb") as f, open(out_path, "wb") as out:
+        if not size:
+            return sha.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            def block(off):
+                end = min(off + chunk, mid)
+                return unrounds(mm[off:end], mm[mid + off:mid + end], key, rounds)
+
+            # padding éventuel : dernier octet de R0 = dernier octet du clair
+            last = block((mid - 1) // chunk * chunk)[1] if rounds > 1 else mm[mid - 1:mid]
+            stop = mid - 1 if (last[-1] == 0 if pad is None else pad) else mid
+
+            # 1) L0 (1 tour : CR ⊕ F(R0)), bloc par bloc (offsets multiples de 4)
+            for off in range(0, mid, chunk):
+                _emit(out, sha, block(off)[0])
+
+            # 2) R0 : recopié tel quel (1 tour) ou recalculé, sans le padding
+            for off in range(0, stop, chunk):
+                R0 = mm[off:min(off + chunk, stop)] if rounds == 1 else block(off)[1]
+                _emit(out, sha, R0[:stop - off])
+
+    return sha.hexdigest()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(f"Usage : {sys.argv[0]} chiffré clé [sortie] [tours]")
+    out_path = sys.argv[3] if len(sys.argv) > 3 else "L-is-dead_restored.mp4"
+    rounds = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+    digest = stream_decrypt(sys.argv[1], sys.argv[2].encode(), out_path, rounds=rounds)
+    print(f"✅  Fichier restauré → {out_path}")
+    print(f"🏁  Flag : SHLK{{{digest}}}")
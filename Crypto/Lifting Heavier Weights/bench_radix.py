@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_radix.py
+--------------
+Décomposition base 1000 : boucle divmod (scripts d’origine) contre
+radix.to_base (diviser pour régner + Barrett), de 100 à 1 000 000 de
+chiffres. Les deux listes de restes doivent être identiques.
+
+La boucle étant quadratique, elle n’est mesurée que jusqu’à --loop-max
+chiffres (au-delà, seule to_base tourne).
+
+Usage :  python3 bench_radix.py [--digits 100 1000 10000 100000 1000000]
+                                [--loop-max 100000]
+"""
+
+import argparse, math, random, time
+
+from radix import BASE, divmod_loop, to_base
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--digits", type=int, nargs="+",
+                    default=[100, 1000, 10000, 100000, 1000000])
+    ap.add_argument("--loop-max", type=int, default=100000,
+                    help="taille maximale mesurée avec la boucle divmod")
+    args = ap.parse_args()
+    rng = random.Random(2025)
+
+    print(f"{'chiffres':>10}{'boucle (s)':>12}{'to_base (s)':>13}{'accél.':>9}  identiques")
+    for d in args.digits:
+        n = rng.getrandbits(math.ceil(d * math.log2(BASE)))
+        t0 = time.perf_counter()
+        fast = to_base(n)
+        t_fast = time.perf_counter() - t0
+        if d <= args.loop_max:
+            t0 = time.perf_counter()
+            ref = divmod_loop(n)
+            t_loop = time.perf_counter() - t0
+            same = "oui" if fast == ref else "NON"
+            print(f"{d:>10}{t_loop:>12.4f}{t_fast:>13.4f}{t_loop / t_fast:>9.1f}  {same}")
+            if fast != ref:
+                raise SystemExit(f"❌  divergence à {d} chiffres")
+        else:
+            print(f"{d:>10}{'–':>12}{t_fast:>13.4f}{'–':>9}  –")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,20 @@
 from Crypto.Util.number import getPrime, GCD
-import random
+import os, random, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import valuation   # découpage binaire p^(2^k) ou gmpy2
+from lifting.bigint import big  # gmpy2.mpz si installé, sinon int
 
 FLAG = b'??????????????????????????????????????'
 
 def f(p, x):
-    res = 0
-    while x % p == 0 :
-        x //= p
-        res += 1
-    return res
-
-def encrypt_flag(flag):
-    p = getPrime(512)
-    first = getPrime(345)
-    setup = pow(p, first)
+    return valuation(p, x)
+
+def encrypt_flag(flag, get_prime=getPrime):
+    # get_prime : crochet (ex. lifting.primes.PrimePool(...).get_prime)
+    p = get_prime(512)
+    first = get_prime(345)
+    setup = pow(big(p), first)
     x = random.randrange(-setup, setup)
     y = x - setup
     while x % p == 0 or y % p == 0 or x == 0 or y == 0:
@@ -22,8 +23,8 @@ def encrypt_flag(flag):
         
     big_big_big = 1
     for byte in flag:
-        n = pow(p, byte * big_big_big) * getPrime(512)
-        temp = pow(x, n) - pow(y, n)
+        n = pow(p, byte * big_big_big) * get_prime(512)
+        temp = pow(big(x), n) - pow(big(y), n)
         big_big_big *= 1000
 
         while True:
@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 # coding: utf-8
 
+import os, sys
+
+from radix import to_base        # base 1000 sous-quadratique
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import read_pair    # lecture sûre de (v, first)
+
 def recover_flag(v: int) -> bytes:
-    octets = []
-    while v:
-        v, rem = divmod(v, 1000)
-        octets.append(rem % 256)
-    return bytes(octets)
+    return bytes(rem % 256 for rem in to_base(v))
 
 def main():
     with open('out.txt', 'r') as f:
-        v_str = f.read().strip().lstrip('(').split(',',1)[0]
-    v = int(v_str)
+        v, _ = read_pair(f)
 
     flag = recover_flag(v)
     try:
@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os, sys
+
+from radix import to_base        # base 1000 sous-quadratique
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import read_pair    # lecture sûre de (v, first)
+from lifting.trace import DETAIL, SUMMARY, Trace, level_from_argv
+
+# -q silencieux, -s résumé, -v détail (défaut), --full chiffres complets
+trace = Trace(level_from_argv(sys.argv[1:], DETAIL))
+
 def extract_base1000(n: int):
     """Décompose n en restes base 1000, et affiche chaque rem_i"""
-    rems = []
-    i = 0
-    while n:
-        n, rem = divmod(n, 1000)
-        print(f"[i={i:02d}] rem_i = {rem} → {chr(rem) if 32 <= rem < 127 else '?'}")
-        rems.append(rem)
-        i += 1
+    rems = to_base(n, 1000)
+    if trace.enabled(DETAIL):
+        for i, rem in enumerate(rems):
+            trace(DETAIL, f"[i={i:02d}] rem_i = {rem} → {chr(rem) if 32 <= rem < 127 else '?'}")
     return rems
 
 def recover_flag(rem_list):
@@ -24,15 +32,13 @@ def recover_flag(rem_list):
 def main():
     # Lecture de v et first
     with open('out.txt', 'r') as f:
-        s = f.read().strip().strip('()')
-    v_str, first_str = s.split(',', 1)
-    v, first = int(v_str), int(first_str)
-    print("Lue : v =", v)
-    print("       first =", first)
+        v, first = read_pair(f)
+    trace(SUMMARY, "Lue : v = {}", v)
+    trace(SUMMARY, "       first = {}", first)
 
     # On retire la constante fixe
     M = v - first
-    print("\nM = v – first =", M, "\n")
+    trace(SUMMARY, "\nM = v – first = {}\n", M)
 
     # Extraction des codes ASCII
     rems = extract_base1000(M)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gen_fixtures.py
+---------------
+Jeux d’essai (f(p, temp), first) pour Lifting Heavier Weights, sans la
+chaîne d’exponentiations de chal.py (temp = x^n − y^n réinjecté dans le
+tirage suivant : des entiers de taille « tour de puissances »).
+
+Seule la valuation p-adique est suivie. Invariant de la chaîne : x − y = temp
+précédent (p^first au départ) et p ∤ x, donc p ∤ y ≡ x (mod p). Pour p impair,
+le LTE (lifting/lte.py) donne, avec n = p^(b·1000^i) · q :
+
+    v_p(x^n − y^n) = v_p(x − y) + v_p(n) = v + b·1000^i + v_p(q)
+
+soit, de proche en proche, f = first + Σ b_i·1000^i (+ v_p(q_i), nul sauf
+si q_i = p). Le tirage de x n’intervient pas : p ∤ x est garanti par la
+chaîne, et x mod p ne change pas la valuation. L’état (p, v, 1000^i) tient
+en trois entiers : un drapeau de 1000 octets se traite en quelques
+millisecondes.
+
+Génération en lot, ligne de commande et réserve de premiers (--pool) :
+lifting/fixtures.py, commune aux deux défis Lifting. Sortie au format de
+chal.py, (f(p, temp), first) ; --verify compare avec la vraie chaîne sur de
+petits premiers et des drapeaux courts.
+
+Usage :  python3 gen_fixtures.py --random 1000 --length 1000 -o fixtures.jsonl
+"""
+
+import os, random, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import fixtures, lte_odd, valuation
+from lifting.bigint import big
+from lifting.primes import _get_prime
+
+BASE = 1000                         # big_big_big *= 1000
+P_BITS, FIRST_BITS, Q_BITS = 512, 345, 512
+
+
+# --- suivi de la valuation le long de la chaîne ---
+class Track:
+    """État compact de la chaîne : v = v_p(x − y) et 1000^i."""
+    __slots__ = ("p", "v", "big", "base")
+
+    def __init__(self, p: int, first: int, base: int = BASE):
+        if p == 2:
+            raise ValueError("suivi réservé aux p impairs (LTE p = 2 : v_2(x + y) requis)")
+        self.p, self.v, self.big, self.base = p, first, 1, base
+
+    def step(self, byte: int, q: int) -> None:
+        """temp = x^n − y^n avec n = p^(byte·big) · q (p | x − y, p ∤ x)."""
+        assert self.v >= 1, "hypothèse du LTE violée : p ∤ x − y"
+        self.v = lte_odd(self.v, byte * self.big + valuation(self.p, q))
+        self.big *= self.base
+
+
+def track_chain(flag: bytes, p: int, first: int, qs, base: int = BASE) -> int:
+    """f(p, temp) final, d’après les premiers tirés (p, first, q_i)."""
+    t = Track(p, first, base)
+    for byte, q in zip(flag, qs):
+        t.step(byte, q)
+    return t.v
+
+
+def encrypt_flag(flag: bytes, get_prime=_get_prime):
+    """Même sortie que chal.encrypt_flag : (f(p, temp), first)."""
+    p = get_prime(P_BITS)
+    first = get_prime(FIRST_BITS)
+    qs = [get_prime(Q_BITS) for _ in flag]
+    return track_chain(flag, p, first, qs), first
+
+
+# --- chaîne littérale de chal.py (petits paramètres seulement) ---
+def chal_chain(flag: bytes, p: int, first: int, qs, base: int = BASE,
+               rng=random, limit: int = 1 << 22) -> int:
+    setup = pow(p, first)
+    x = rng.randrange(-setup, setup)
+    y = x - setup
+    while x % p == 0 or y % p == 0 or x == 0 or y == 0:
+        x = rng.randrange(-setup, setup)
+        y = x - setup
+    big_big_big = 1
+    for byte, q in zip(flag, qs):
+        n = pow(p, byte * big_big_big) * q
+        if n * max(abs(x), abs(y)).bit_length() > limit:
+            raise OverflowError("chaîne trop grande pour le calcul direct")
+        temp = int(pow(big(x), n) - pow(big(y), n))
+        big_big_big *= base
+        while True:
+            x = rng.randrange(-temp, temp)
+            y = x - temp
+            if x % p != 0 and y % p != 0 and x != 0 and y != 0:
+                break
+    return valuation(p, temp)
+
+
+def verify(trials: int, seed: int = 0) -> None:
+    """Petits p, first, q et drapeaux de 1 à 3 octets ; base 2 ou 1000."""
+    rng = random.Random(seed)
+    small = [2, 3, 5, 7, 11, 13]
+    done = skipped = 0
+    for i in range(trials):
+        p, first = rng.choice(small[1:]), rng.choice(small[:3])
+        base = rng.choice([2, BASE])
+        flag = bytes(rng.randrange(0, 3) for _ in range(rng.randrange(1, 4)))
+        qs = [rng.choice(small[1:]) for _ in flag]   # impairs (n pair : temp < 0 possible), q = p possible
+        try:
+            expected = chal_chain(flag, p, first, qs, base, rng)
+        except OverflowError:
+            skipped += 1
+            continue
+        got = track_chain(flag, p, first, qs, base)
+        if got != expected:
+            raise AssertionError(f"essai {i} : p={p} first={first} flag={flag} "
+                                 f"q={qs} suivi={got} réel={expected}")
+        done += 1
+    print(f"OK – suivi identique à la chaîne de chal.py ({done} essais, {skipped} trop grands)")
+
+
+if __name__ == "__main__":
+    fixtures.main(encrypt_flag, verify, length=38, chunksize=4)
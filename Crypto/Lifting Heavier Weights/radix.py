@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+radix.py
+--------
+Décomposition d’un grand entier en chiffres base 1000 (restes rem_i), en
+temps sous-quadratique.
+
+La boucle historique `n, rem = divmod(n, 1000)` parcourt tout n à chaque
+chiffre : coût quadratique en la taille de n. Ici, diviser pour régner :
+
+  • puissances précalculées 1000^(2^k) (une élévation au carré par niveau) ;
+  • n = q · 1000^(2^k) + r : r donne exactement 2^k chiffres bas (zéros
+    compris), q les chiffres hauts ; on descend ainsi jusqu’à de petits
+    blocs traités par la boucle simple ;
+  • pour les grands diviseurs, division de Barrett : l’inverse de chaque
+    puissance est calculé une fois par itération de Newton, et chaque
+    division ne coûte plus que deux multiplications (Karatsuba).
+
+to_base(n) renvoie la liste des restes, poids faible d’abord, identique à
+celle de la boucle (liste vide pour 0). Avec gmpy2 (lifting/bigint.py), la
+base 1000 = 10^3 passe par la conversion décimale de GMP, regroupée par
+3 chiffres.
+
+Usage :  python3 radix.py          (auto-vérification contre la boucle)
+"""
+
+import os, random, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import bigint
+
+BASE = 1000
+CUTOFF = 32                         # blocs ≤ 2·CUTOFF chiffres : boucle divmod
+BARRETT_BITS = 1 << 14              # diviseurs plus petits : divmod natif
+
+
+# --- référence : la boucle des scripts d’origine ---
+def divmod_loop(n: int, base: int = BASE) -> list:
+    rems = []
+    while n:
+        n, rem = divmod(n, base)
+        rems.append(rem)
+    return rems
+
+
+# --- inverse de Barrett : floor(4^b / d), b = taille de d en bits ---
+def _recip(d: int) -> int:
+    b = d.bit_length()
+    if b <= BARRETT_BITS:
+        return (1 << 2 * b) // d
+    s = b - (b + 1) // 2                            # demi-précision, puis Newton
+    x = _recip(d >> s) << s
+    one = 1 << 2 * b
+    x += (x * (one - d * x)) >> 2 * b
+    r = one - d * x                                 # quelques unités d’écart
+    while r >= d:
+        x, r = x + 1, r - d
+    while r < 0:
+        x, r = x - 1, r + d
+    return x
+
+
+class _Level:
+    """Diviseur 1000^(2^k) et, au besoin, son inverse de Barrett."""
+    __slots__ = ("d", "bits", "inv")
+
+    def __init__(self, d: int):
+        self.d, self.bits, self.inv = d, d.bit_length(), None
+
+    def divmod(self, m: int):
+        """divmod(m, d) pour 0 ≤ m < d²."""
+        if self.bits <= BARRETT_BITS:
+            return divmod(m, self.d)
+        if self.inv is None:
+            self.inv = _recip(self.d)
+        b, d = self.bits, self.d
+        q = ((m >> (b - 1)) * self.inv) >> (b + 1)  # sous-estime q d’au plus 2
+        r = m - q * d
+        while r >= d:
+            r -= d
+            q += 1
+        return q, r
+
+
+# --- conversion diviser-pour-régner ---
+def to_base(n: int, base: int = BASE) -> list:
+    """Chiffres de n en base `base`, poids faible d’abord (= divmod_loop)."""
+    if n < 0:
+        raise ValueError("entier négatif : la boucle divmod ne terminerait pas")
+    if bigint.gmpy2 is not None and base == BASE:
+        s = bigint.to_str(n) if n else ""
+        return [int(s[max(i - 3, 0):i]) for i in range(len(s), 0, -3)]
+    levels = [_Level(base)]                         # levels[k].d = base^(2^k)
+    while True:
+        sq = levels[-1].d * levels[-1].d
+        if sq > n:
+            break
+        levels.append(_Level(sq))
+    out = []
+
+    def split(m: int, k: int, pad: bool) -> None:
+        # m < base^(2^(k+1)) ; pad : émettre exactement 2^(k+1) chiffres
+        if (1 << k) <= CUTOFF:
+            start = len(out)
+            while m:
+                m, rem = divmod(m, base)
+                out.append(rem)
+            if pad:
+                out.extend([0] * ((2 << k) - (len(out) - start)))
+            return
+        q, r = levels[k].divmod(m)
+        if not (q or pad):                          # pas de chiffres hauts
+            split(r, k - 1, False)
+            return
+        split(r, k - 1, True)
+        split(q, k - 1, pad)
+
+    split(n, len(levels) - 1, False)
+    return out
+
+
+# --- auto-vérification ---
+def self_check(trials: int = 100) -> None:
+    rng = random.Random(1000)
+    cases = [0, 1, 999, 1000, 1001, 10**3000, 10**3000 - 1, 1000**4096, 1000**4096 - 1]
+    for _ in range(trials):
+        cases.append(rng.getrandbits(rng.randrange(1, 40000)))
+    for n in cases:
+        assert to_base(n) == divmod_loop(n), n.bit_length()
+    for base in (2, 10, 256, 7919):
+        n = rng.getrandbits(50000)
+        assert to_base(n, base) == divmod_loop(n, base), base
+    print(f"OK – to_base identique à la boucle divmod ({len(cases)} entiers)")
+
+
+if __name__ == "__main__":
+    self_check()
@@ -1,23 +1,24 @@
 from Crypto.Util.number import getPrime
-import random
+import os, random, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import v2          # valuation 2-adique par bit de poids faible
+from lifting.bigint import big  # gmpy2.mpz si installé, sinon int
 
 FLAG = b'????????????????????????????????'
 
 def f(x):
-    res = 0
-    while x % 2 == 0 :
-        x //= 2
-        res += 1
-    return res
+    return v2(x)
 
-def encrypt_flag(flag):
+def encrypt_flag(flag, get_prime=getPrime):
+    # get_prime : crochet (ex. lifting.primes.PrimePool(...).get_prime)
     encrypted = []
     for byte in flag:
-        r = getPrime(512)
-        n = pow(2, r * byte)
+        r = get_prime(512)
+        n = pow(big(2), r * byte)
         x = random.randrange(-n, n, 2) + 1
         y = x - n
-        t = pow(x, n) - pow(y, n)
+        t = pow(big(x), n) - pow(big(y), n)
 
         encrypted.append((r, f(t)))
 
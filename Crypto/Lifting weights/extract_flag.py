@@ -1,15 +1,11 @@
-# lecture depuis out.txt :
-with open('out.txt') as fd:
-    encrypted = eval(fd.read().strip())
+import os, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import iter_bytes
 
-flag_bytes = []
-for i, (r, f) in enumerate(encrypted):
-    if f % (2 * r) != 0:
-        raise ValueError(f"Tuple {i} : f={f} non multiple de 2*r={2*r}")
-    b = f // (2 * r)
-    if not (0 <= b < 256):
-        raise ValueError(f"Tuple {i} : octet invalide b={b}")
-    flag_bytes.append(b)
+# lecture en flux depuis out.txt (sans eval) : b = f // (2*r) par tuple,
+# 2*r | f et 0 <= b < 256 vérifiés au passage (voir lifting/outparse.py)
+with open('out.txt') as fd:
+    flag = bytes(iter_bytes(fd))
 
-flag = bytes(flag_bytes)
 print(flag)
@@ -1,35 +1,45 @@
 # extract_flag_verbose.py
 
-# ⚠️ Remplace cette ligne par le contenu exact de out.txt
-with open('out.txt') as fd:
-    encrypted = eval(fd.read().strip())
+import os, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import iter_tuples
+from lifting.bigint import divexact, is_divisible   # gmpy2 si installé
+from lifting.trace import DETAIL, SUMMARY, Trace, level_from_argv, summary
 
+# -q silencieux, -s résumé, -v détail (défaut), --full chiffres complets :
+# r, f et 2*r sont résumés (bits, tête…queue, empreinte) sauf avec --full
+trace = Trace(level_from_argv(sys.argv[1:], DETAIL))
+
+# lecture en flux de out.txt, tuple par tuple, sans eval (voir lifting/outparse.py)
 flag_bytes = []
 
-for i, (r, f) in enumerate(encrypted):
-    print(f"--- Octet #{i} ---")
-    print(f"r = {r}")
-    print(f"f = {f}")
+with open('out.txt') as fd:
+    for i, (off, (r, f)) in enumerate(iter_tuples(fd)):
+        trace(DETAIL, f"--- Octet #{i} ---")
+        trace(DETAIL, "r = {}", r)
+        trace(DETAIL, "f = {}", f)
 
-    denom = 2 * r
-    print(f"Calcul de l'octet b = f // (2*r) avec 2*r = {denom}")
+        denom = 2 * r
+        trace(DETAIL, "Calcul de l'octet b = f // (2*r) avec 2*r = {}", denom)
 
-    if f % denom != 0:
-        raise ValueError(f"[ERREUR] Tuple {i} : f={f} n’est pas divisible par 2*r={denom}")
-    else:
-        print(f"[OK] f est divisible par 2*r")
+        if not is_divisible(f, denom):
+            raise ValueError(f"[ERREUR] Tuple {i} (offset {off}) : f={summary(f)} "
+                             f"n’est pas divisible par 2*r={summary(denom)}")
+        else:
+            trace(DETAIL, f"[OK] f est divisible par 2*r")
 
-    b = f // denom
-    print(f"Résultat b = {b} (valeur entière)")
+        b = int(divexact(f, denom))
+        trace(DETAIL, f"Résultat b = {b} (valeur entière)")
 
-    if not (0 <= b < 256):
-        raise ValueError(f"[ERREUR] Tuple {i} : octet invalide b={b}")
-    else:
-        print(f"[OK] octet b est dans la plage valide [0;255]")
+        if not (0 <= b < 256):
+            raise ValueError(f"[ERREUR] Tuple {i} (offset {off}) : octet invalide b={summary(b)}")
+        else:
+            trace(DETAIL, f"[OK] octet b est dans la plage valide [0;255]")
 
-    flag_bytes.append(b)
-    print(f"Octet ASCII correspondant: {b} -> '{chr(b)}'\n")
+        flag_bytes.append(b)
+        trace(DETAIL, f"Octet ASCII correspondant: {b} -> '{chr(b)}'\n")
 
 flag = bytes(flag_bytes)
-print("=== Flag complet ===")
+trace(SUMMARY, f"=== Flag complet ({len(flag)} octets) ===")
 print(flag)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gen_fixtures.py
+---------------
+Jeux d’essai (r, f(t)) pour Lifting weights, sans l’exponentiation
+pow(x, n) − pow(y, n) de chal.py (n = 2^(r·b) avec r de 512 bits : elle ne
+termine jamais).
+
+Pour chaque octet b, chal.py tire r premier, n = 2^(r·b), x impair et
+y = x − n. Le LTE (p = 2, voir lifting/lte.py) donne directement :
+
+    v_2(x − y) = v_2(n) = r·b,   v_2(x + y) = v_2(2x − n) = 1   (r·b ≥ 2)
+    f(t) = v_2(x^n − y^n) = r·b + 1 + r·b − 1 = 2·r·b
+
+et pour b = 0 : n = 1, x = 0, y = −1, t = 1, f(t) = 0.
+
+Génération en lot, ligne de commande et réserve de premiers (--pool) :
+lifting/fixtures.py, commune aux deux défis Lifting. Modes --flag, --flags,
+--random et --verify (comparaison avec le vrai calcul de chal.py).
+
+Usage :  python3 gen_fixtures.py --random 5000 --length 32 -o fixtures.jsonl
+"""
+
+import os, random, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lifting import fixtures, lte_two, v2
+from lifting.bigint import big
+from lifting.primes import _get_prime
+
+BITS = 512                          # taille de r dans chal.py
+
+
+# --- forme close ---
+def encrypt_byte(byte: int, r: int) -> int:
+    """f(t) de chal.py pour l’octet `byte` et le premier r, par le LTE."""
+    v_n = r * byte                  # n = 2^(r·b)
+    if v_n == 0:
+        return 0                    # n = 1 : t = x − y = 1
+    # x impair, x + y = 2x − 2^v_n avec v_n ≥ 2 (r premier) : v_2 = 1
+    return lte_two(v_n, 1, v_n)
+
+
+def encrypt_flag(flag: bytes, get_prime=_get_prime, bits: int = BITS) -> list:
+    """Même sortie que chal.encrypt_flag, en temps linéaire."""
+    encrypted = []
+    for byte in flag:
+        r = get_prime(bits)
+        encrypted.append((r, encrypt_byte(byte, r)))
+    return encrypted
+
+
+# --- calcul littéral de chal.py (petits r·b seulement) ---
+def chal_byte(byte: int, r: int, rng=random) -> int:
+    n = pow(2, r * byte)
+    x = rng.randrange(-n, n, 2) + 1
+    y = x - n
+    t = pow(big(x), n) - pow(big(y), n)
+    return v2(t)
+
+
+def verify(trials: int, max_rb: int = 14, seed: int = 0) -> None:
+    """Compare forme close et calcul réel pour r premier et r·b ≤ max_rb."""
+    rng = random.Random(seed)
+    primes = [q for q in range(2, max_rb + 1) if all(q % d for d in range(2, q))]
+    for i in range(trials):
+        r = rng.choice(primes)
+        byte = rng.randrange(0, max_rb // r + 1)
+        expected = chal_byte(byte, r, rng)
+        got = encrypt_byte(byte, r)
+        if got != expected:
+            raise AssertionError(f"essai {i} : r={r} b={byte} LTE={got} réel={expected}")
+    print(f"OK – LTE identique au calcul de chal.py ({trials} essais, r·b ≤ {max_rb})")
+
+
+if __name__ == "__main__":
+    fixtures.main(encrypt_flag, verify, length=32, chunksize=16, bits=BITS)
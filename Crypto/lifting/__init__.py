@@ -0,0 +1,14 @@
+"""
+lifting
+-------
+Outils partagés des défis « Lifting weights » et « Lifting Heavier Weights ».
+
+Depuis un dossier de défi :
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from lifting import valuation
+"""
+
+from .valuation import valuation, v2
+from .lte import lte, lte_odd, lte_two
+from .outparse import iter_bytes, iter_tuples, read_pair
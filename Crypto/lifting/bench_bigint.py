@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_bigint.py
+---------------
+Gain par opération de la façade bigint : int de Python (replis *_py)
+contre gmpy2.mpz, sur les grandeurs réelles des out.txt puis sur des
+entiers synthétiques 10 fois plus grands (en bits).
+
+  • réel : (r, f) du premier tuple de Lifting weights/out.txt,
+           (v, first) de Lifting Heavier Weights/out.txt ;
+  • ×10  : r de 5120 bits, f = 2·r·b, v et first de 10 × leur taille.
+
+Sans gmpy2, seule la colonne int est mesurée.
+
+Usage :  python3 bench_bigint.py
+"""
+
+import os, random, sys, timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, ".."))
+from lifting import bigint
+from lifting.outparse import iter_tuples, read_pair
+from lifting.valuation import valuation_py
+
+gmpy2 = bigint.gmpy2
+
+
+def magnitudes():
+    with open(os.path.join(HERE, "..", "Lifting weights", "out.txt")) as fd:
+        r, f = next(iter_tuples(fd))[1]
+    with open(os.path.join(HERE, "..", "Lifting Heavier Weights", "out.txt")) as fd:
+        v, first = read_pair(fd)
+    yield "réel", int(r), int(f), int(v), int(first)
+    rng = random.Random(10)
+    r10 = rng.getrandbits(10 * int(r).bit_length()) | 1
+    yield ("×10", r10, 2 * r10 * (int(f) // (2 * int(r))),
+           rng.getrandbits(10 * int(v).bit_length()), rng.getrandbits(10 * int(first).bit_length()))
+
+
+def operations(r, f, v, first):
+    """(nom, opération int, opération gmpy2 ou None)."""
+    d, x = 2 * r, r ** 64 * f
+    ops = [("2r | f, f // 2r",
+            lambda: bigint.is_divisible_py(f, d) and bigint.divexact_py(f, d),
+            (lambda F=gmpy2 and gmpy2.mpz(f), D=gmpy2 and gmpy2.mpz(d):
+             gmpy2.is_divisible(F, D) and gmpy2.divexact(F, D))),
+           ("pow(r, 2^8)", lambda: pow(r, 1 << 8),
+            lambda R=gmpy2 and gmpy2.mpz(r): pow(R, 1 << 8)),
+           ("v_r(r^64 · f)", lambda: valuation_py(r, x),
+            lambda X=gmpy2 and gmpy2.mpz(x): gmpy2.remove(X, r)),
+           ("décimal → entier (v)", lambda s=str(v): bigint.from_str_py(s),
+            lambda s=str(v): gmpy2.mpz(s)),
+           ("entier → décimal (v−first)", lambda: bigint.to_str_py(v - first),
+            lambda M=gmpy2 and gmpy2.mpz(v - first): M.digits(10))]
+    return [(name, a, b if gmpy2 is not None else None) for name, a, b in ops]
+
+
+def per_call(fn) -> float:
+    t = timeit.Timer(fn)
+    n, _ = t.autorange()
+    return min(t.repeat(3, n)) / n
+
+
+def main():
+    sys.set_int_max_str_digits(0)                   # str(v) des entiers ×10
+    print(f"moteur actif : {bigint.BACKEND}"
+          + ("" if gmpy2 is not None else "  (gmpy2 absent : colonne int seule)") + "\n")
+    print(f"{'grandeur':<10}{'opération':<28}{'int (µs)':>12}{'gmpy2 (µs)':>12}{'gain':>8}")
+    for label, r, f, v, first in magnitudes():
+        for name, op_int, op_gmp in operations(r, f, v, first):
+            t_int = per_call(op_int) * 1e6
+            if op_gmp is None:
+                print(f"{label:<10}{name:<28}{t_int:>12.2f}{'–':>12}{'–':>8}")
+                continue
+            t_gmp = per_call(op_gmp) * 1e6
+            print(f"{label:<10}{name:<28}{t_int:>12.2f}{t_gmp:>12.2f}{t_int / t_gmp:>7.1f}×")
+
+
+if __name__ == "__main__":
+    main()
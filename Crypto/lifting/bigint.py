@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bigint.py
+---------
+Façade arithmétique des défis Lifting : gmpy2.mpz (GMP) s’il est installé,
+int de Python sinon. Le choix est fait une fois, à l’import.
+
+  • big(x)             : entier du moteur choisi ; pow, *, //, %, divmod,
+                         &, bit_length… s’appliquent ensuite tels quels ;
+  • from_str / to_str  : conversions décimales sans la limite de chiffres
+                         de CPython (GMP, sinon diviser pour régner) ;
+  • is_divisible / divexact : test et division exacte (GMP dédiés).
+
+Les boucles chaudes (exponentiations de chal.py, décodage des out.txt,
+valuations, décomposition base 1000) passent par ici ; les résultats
+restent comparables et mélangeables avec des int.
+"""
+
+import functools
+
+try:
+    import gmpy2
+except ImportError:                 # repli pur Python
+    gmpy2 = None
+
+BACKEND = "gmpy2" if gmpy2 is not None else "int"
+STR_DIGITS = 4000                   # sous la limite int ↔ str de CPython
+
+
+@functools.lru_cache(maxsize=64)
+def _pow10(k: int) -> int:
+    return 10 ** k
+
+
+# --- repli pur Python (toujours défini : référence des mesures) ---
+def from_str_py(s: str) -> int:
+    """Décimal → entier ; au-delà de STR_DIGITS, moitié haute · 10^k + moitié basse."""
+    if len(s) <= STR_DIGITS:
+        return int(s)
+    if s[0] == "-":
+        return -from_str_py(s[1:])
+    k = len(s) // 2
+    return from_str_py(s[:-k]) * _pow10(k) + from_str_py(s[-k:])
+
+
+def to_str_py(n: int) -> str:
+    """Entier → décimal ; au-delà de STR_DIGITS, divmod par 10^k puis récursion."""
+    if n < 0:
+        return "-" + to_str_py(-n)
+    if n.bit_length() <= STR_DIGITS * 3:            # < 10^STR_DIGITS
+        return str(n)
+    k = 1
+    while _pow10(2 * k) <= n:
+        k *= 2                                      # 10^k ≤ n < 10^(2k) : moitiés équilibrées
+    hi, lo = divmod(n, _pow10(k))
+    return to_str_py(hi) + to_str_py(lo).rjust(k, "0")
+
+
+def is_divisible_py(a: int, b: int) -> bool:
+    return a % b == 0
+
+
+def divexact_py(a: int, b: int) -> int:
+    return a // b
+
+
+# --- moteur retenu ---
+if gmpy2 is not None:
+    big = gmpy2.mpz
+    from_str = gmpy2.mpz
+    is_divisible = gmpy2.is_divisible
+    divexact = gmpy2.divexact
+
+    def to_str(n) -> str:
+        return gmpy2.mpz(n).digits(10)
+else:
+    big = int
+    from_str, to_str = from_str_py, to_str_py
+    is_divisible, divexact = is_divisible_py, divexact_py
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fixtures.py
+-----------
+Fabrique commune des jeux d’essai des défis Lifting : drapeaux aléatoires,
+lot parallèle en JSON lines et ligne de commande. Chaque gen_fixtures.py ne
+garde que ce qui est propre à son défi — la forme close encrypt_flag(flag,
+get_prime), le calcul littéral de chal.py et verify(trials, seed) — puis
+délègue à main() :
+
+    from lifting.fixtures import main
+    main(encrypt_flag, verify, length=32, bits=BITS)
+
+Modes de la ligne de commande :
+  --flag SHLK{…} [--out out.txt]  un out.txt au format de chal.py ;
+  --flags FICHIER | --random N    lot : une ligne JSON par drapeau,
+                                  {"flag": …, "out": …}, produite en
+                                  parallèle (--workers) et écrite au fil de
+                                  l’eau, dans l’ordre d’entrée ;
+  --verify N                      petits paramètres : comparaison avec le
+                                  vrai calcul de chal.py.
+
+Les premiers viennent de Crypto.Util.number.getPrime, ou d’une réserve
+pré-générée (--pool, voir primes.py).
+"""
+
+import argparse, functools, json, multiprocessing, random, string, sys
+
+from .primes import PrimePool, _get_prime
+
+ALPHABET = string.ascii_letters + string.digits + "_!?-"
+
+_hook = _get_prime                  # crochet get_prime des processus du lot
+_encrypt = None                     # encrypt_flag du défi, dans chaque processus
+
+
+def _init(pool_dir: str, encrypt=None) -> None:
+    global _hook, _encrypt
+    if pool_dir:
+        _hook = PrimePool(pool_dir).get_prime
+    if encrypt is not None:
+        _encrypt = encrypt
+
+
+# --- lot parallèle, JSON lines ---
+def _job(flag: str) -> str:
+    return json.dumps({"flag": flag, "out": list(_encrypt(flag.encode(), _hook))})
+
+
+def random_flags(count: int, length: int, seed: int = None):
+    rng = random.Random(seed)
+    for _ in range(count):
+        body = "".join(rng.choice(ALPHABET) for _ in range(max(length - 6, 0)))
+        yield f"SHLK{{{body}}}"
+
+
+def batch(flags, out, encrypt, workers: int = None, pool_dir: str = None,
+          chunksize: int = 16) -> int:
+    """Écrit une ligne JSON par drapeau (ordre conservé), renvoie leur nombre."""
+    done = 0
+    with multiprocessing.Pool(workers, _init, (pool_dir, encrypt)) as pool:
+        for line in pool.imap(_job, flags, chunksize=chunksize):
+            out.write(line + "\n")
+            done += 1
+    return done
+
+
+# --- ligne de commande ---
+def main(encrypt_flag, verify, length: int = 32, chunksize: int = 16,
+         bits: int = None, argv=None) -> None:
+    """
+    CLI d’un gen_fixtures.py. bits : taille par défaut des premiers, qui
+    ajoute --bits (passé à encrypt_flag(…, bits=…)) ; None si le défi fixe
+    ses tailles lui-même.
+    """
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--flag", help="un drapeau → out.txt au format de chal.py")
+    src.add_argument("--flags", metavar="FICHIER", help="un drapeau par ligne")
+    src.add_argument("--random", type=int, metavar="N", help="N drapeaux aléatoires")
+    src.add_argument("--verify", type=int, metavar="N", help="N essais petits paramètres")
+    ap.add_argument("--length", type=int, default=length, help="longueur des drapeaux --random")
+    ap.add_argument("--seed", type=int, default=None)
+    if bits is not None:
+        ap.add_argument("--bits", type=int, default=bits, help="taille des premiers r")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--pool", metavar="DOSSIER", default=None,
+                    help="premiers pré-générés (lifting/primes.py)")
+    ap.add_argument("-o", "--out", default=None, help="fichier de sortie (sinon stdout)")
+    args = ap.parse_args(argv)
+
+    if args.verify is not None:
+        verify(args.verify, seed=args.seed or 0)
+        return
+    encrypt = encrypt_flag if bits is None else functools.partial(encrypt_flag, bits=args.bits)
+    _init(args.pool, encrypt)
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        if args.flag:
+            out.write(str(encrypt(args.flag.encode(), _hook)) + "\n")
+            return
+        if args.flags:
+            with open(args.flags) as fd:
+                n = batch((line.rstrip("\n") for line in fd if line.strip()),
+                          out, encrypt, args.workers, args.pool, chunksize)
+        else:
+            n = batch(random_flags(args.random, args.length, args.seed),
+                      out, encrypt, args.workers, args.pool, chunksize)
+        print(f"✅  {n} jeu(x) d’essai générés", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
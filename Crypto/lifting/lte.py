@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lte.py
+------
+Lemme du relèvement des exposants (LTE) : v_p(x^n − y^n) sans calculer
+x^n − y^n, à partir des seules valuations de x − y, x + y et n.
+
+  • p impair, p | x − y, p ∤ x·y :
+        v_p(x^n − y^n) = v_p(x − y) + v_p(n)
+  • p = 2, x et y impairs :
+        n impair : v_2(x^n − y^n) = v_2(x − y)
+        n pair   : v_2(x^n − y^n) = v_2(x − y) + v_2(x + y) + v_2(n) − 1
+
+Les formes « valuations » (lte_two, lte_odd) servent quand n est trop grand
+pour être écrit (n = 2^(r·b), r de 512 bits) ; lte() vérifie les hypothèses
+sur des entiers explicites.
+"""
+
+from .valuation import valuation
+
+
+def lte_two(v_diff: int, v_sum: int, v_n: int) -> int:
+    """v_2(x^n − y^n) pour x, y impairs, d’après v_2(x−y), v_2(x+y), v_2(n)."""
+    return v_diff if v_n == 0 else v_diff + v_sum + v_n - 1
+
+
+def lte_odd(v_diff: int, v_n: int) -> int:
+    """v_p(x^n − y^n) pour p impair, p | x − y et p ∤ x·y."""
+    return v_diff + v_n
+
+
+def lte(p: int, x: int, y: int, n: int) -> int:
+    """v_p(x^n − y^n) par le LTE ; ValueError si ses hypothèses échouent."""
+    if n < 1 or x == y:
+        raise ValueError("LTE : n ≥ 1 et x ≠ y requis")
+    if p == 2:
+        if not (x & y & 1):
+            raise ValueError("LTE (p = 2) : x et y doivent être impairs")
+        v_sum = valuation(2, x + y) if x + y else None
+        if v_sum is None and not n & 1:
+            raise ValueError("LTE (p = 2) : x + y = 0 avec n pair")
+        return lte_two(valuation(2, x - y), v_sum, valuation(2, n))
+    if x % p == 0 or y % p == 0 or (x - y) % p:
+        raise ValueError("LTE (p impair) : p | x − y et p ∤ x·y requis")
+    return lte_odd(valuation(p, x - y), valuation(p, n))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+outparse.py
+-----------
+Lecture sûre et en flux des out.txt des défis Lifting, à la place de
+eval(fd.read()).
+
+  • Lifting weights : [(r, f), (r, f), …]  (un tuple par octet du drapeau)
+  • Heavier         : (v, first)
+
+Le fichier est lu par blocs et découpé en jetons (entiers signés, ( ) [ ] ,)
+par une expression régulière ; seuls des entiers sont construits, jamais de
+code ni d’AST. Chaque groupe d’entiers entre parenthèses est produit dès sa
+fermeture avec son offset dans le fichier : la mémoire ne dépend pas du
+nombre de tuples. Un nombre coupé entre deux blocs est recollé.
+
+iter_bytes() décode b = f // (2r) au fil de l’eau et vérifie les invariants
+des extracteurs (2r | f, 0 ≤ b < 256) : l’erreur désigne le tuple fautif
+(indice et offset) sans avoir chargé la liste.
+"""
+
+import itertools, re
+
+from .bigint import divexact, from_str, is_divisible
+
+CHUNK = 1 << 16
+_TOKEN = re.compile(r"\s*(?:(-?\d+)|([\[\]\(\),]))")
+_PARTIAL = re.compile(r"\s*-?\d*")  # fin de bloc : nombre peut-être incomplet
+
+
+# --- jetons (texte, offset) ---
+def _tokens(fd, chunk: int):
+    buf, base = "", 0
+    while True:
+        data = fd.read(max(chunk, len(buf)))        # nombre géant : blocs doublés
+        buf += data
+        pos = 0
+        while True:
+            m = _TOKEN.match(buf, pos)
+            if not m or (data and m.group(1) and m.end() == len(buf)):
+                break                               # fin de bloc (ou nombre coupé)
+            tok = m.group(1) or m.group(2)
+            yield tok, base + m.start(1 if m.group(1) else 2)
+            pos = m.end()
+        rest = buf[pos:]
+        if not data:
+            if rest.strip():
+                off = base + pos + len(rest) - len(rest.lstrip())
+                raise ValueError(f"offset {off} : caractère inattendu {rest.lstrip()[0]!r}")
+            return
+        if _PARTIAL.fullmatch(rest) is None:
+            m = _PARTIAL.match(rest)
+            raise ValueError(f"offset {base + pos + m.end()} : caractère inattendu "
+                             f"{rest[m.end()]!r}")
+        buf, base = rest, base + pos
+
+
+# --- groupes d’entiers ---
+def iter_tuples(fd, chunk: int = CHUNK):
+    """(offset, tuple d’entiers) pour chaque groupe le plus interne."""
+    stack = []                                      # [ouvrant, entiers, sous-groupes, offset]
+    closing = {")": "(", "]": "["}
+    expect_item = True
+    for tok, off in _tokens(fd, chunk):
+        if tok in "([":
+            if not expect_item:
+                raise ValueError(f"offset {off} : ',' attendue avant {tok!r}")
+            stack.append([tok, [], False, off])
+        elif tok in ")]":
+            if not stack or stack[-1][0] != closing[tok]:
+                raise ValueError(f"offset {off} : {tok!r} sans ouvrant correspondant")
+            opener, ints, nested, start = stack.pop()
+            if ints and nested:
+                raise ValueError(f"offset {start} : groupe mêlant entiers et sous-groupes")
+            if ints or (opener == "(" and not nested):
+                yield start, tuple(ints)
+            if stack:
+                stack[-1][2] = True
+            expect_item = False
+        elif tok == ",":
+            if expect_item or not stack:
+                raise ValueError(f"offset {off} : ',' inattendue")
+            expect_item = True
+        else:
+            if not stack:
+                raise ValueError(f"offset {off} : entier hors de tout groupe")
+            if not expect_item:
+                raise ValueError(f"offset {off} : ',' attendue avant l’entier")
+            stack[-1][1].append(from_str(tok))
+            expect_item = False
+    if stack:
+        raise ValueError(f"offset {stack[-1][3]} : {stack[-1][0]!r} jamais fermé")
+
+
+# --- Lifting weights : octets du drapeau ---
+def iter_bytes(fd, chunk: int = CHUNK):
+    """b = f // (2r) pour chaque tuple (r, f), invariants vérifiés au passage."""
+    for i, (off, tup) in enumerate(iter_tuples(fd, chunk)):
+        if len(tup) != 2:
+            raise ValueError(f"Tuple {i} (offset {off}) : {len(tup)} élément(s) au lieu de 2")
+        r, f = tup
+        if r <= 0:
+            raise ValueError(f"Tuple {i} (offset {off}) : r={r} non positif")
+        if not is_divisible(f, 2 * r):
+            raise ValueError(f"Tuple {i} (offset {off}) : f={f} non multiple de 2*r={2*r}")
+        b = int(divexact(f, 2 * r))
+        if not (0 <= b < 256):
+            raise ValueError(f"Tuple {i} (offset {off}) : octet invalide b={b}")
+        yield b
+
+
+# --- Heavier : (v, first) ---
+def read_pair(fd, chunk: int = CHUNK):
+    """Le couple (v, first) d’un out.txt de Lifting Heavier Weights."""
+    found = list(itertools.islice(iter_tuples(fd, chunk), 2))
+    if len(found) != 1 or len(found[0][1]) != 2:
+        raise ValueError(f"un seul couple (v, first) attendu, {len(found)} groupe(s) lu(s)")
+    return found[0][1]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+primes.py
+---------
+Réserve de nombres premiers pour les générateurs des défis Lifting.
+
+Les chal.py et gen_fixtures.py tirent un premier de 512 bits par octet de
+drapeau (plus 512 + 345 bits par exécution pour Heavier) : c’est le coût
+dominant d’une régénération de jeux d’essai. Les premiers sont donc
+produits à l’avance, en parallèle, et stockés sur disque :
+
+  • un fichier binaire par taille, primes_<bits>.bin : en-tête de 16 octets
+    (b"PRM1", bits, indice du prochain premier à distribuer) puis des
+    enregistrements de taille fixe ⌈bits/8⌉ octets, gros-boutistes ;
+  • fill() génère dans un pool de processus et ajoute en fin de fichier ;
+  • get_prime(bits) distribue chaque premier une seule fois, y compris
+    entre processus : les blocs sont réservés sous verrou (flock) en
+    avançant l’indice de l’en-tête.
+
+PrimePool(dossier).get_prime a la signature de Crypto.Util.number.getPrime :
+c’est le crochet `get_prime` des générateurs.
+
+Usage :  python3 primes.py DOSSIER --bits 512 345 --count 10000 [--workers N]
+         python3 primes.py DOSSIER                (état de la réserve)
+"""
+
+import argparse, fcntl, multiprocessing, os, struct
+
+HEADER = struct.Struct(">4sIQ")     # magic, bits, prochain indice
+MAGIC = b"PRM1"
+BATCH = 64                          # premiers par tâche de génération
+BLOCK = 32                          # premiers réservés d’un coup par processus
+
+
+def _get_prime(bits: int) -> int:
+    from Crypto.Util.number import getPrime
+    return getPrime(bits)
+
+
+def _generate(task) -> bytes:
+    bits, n = task
+    size = (bits + 7) // 8
+    return b"".join(_get_prime(bits).to_bytes(size, "big") for _ in range(n))
+
+
+class PrimePool:
+    """Premiers pré-générés dans `directory`, distribués sans répétition."""
+
+    def __init__(self, directory: str, block: int = BLOCK, fallback: bool = True):
+        self.directory, self.block, self.fallback = directory, block, fallback
+        self._pid, self._local = os.getpid(), {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, bits: int) -> str:
+        return os.path.join(self.directory, f"primes_{bits}.bin")
+
+    # --- fichier verrouillé ---
+    def _open(self, bits: int):
+        f = open(self.path(bits), "a+b")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        head = f.read(HEADER.size)
+        if not head:
+            f.write(HEADER.pack(MAGIC, bits, 0))
+            f.flush()
+            return f, 0
+        magic, b, nxt = HEADER.unpack(head)
+        if magic != MAGIC or b != bits:
+            f.close()
+            raise ValueError(f"{self.path(bits)} : en-tête invalide")
+        return f, nxt
+
+    @staticmethod
+    def _set_next(f, bits: int, nxt: int) -> None:
+        # "a+b" n’écrit qu’en fin de fichier : en-tête réécrit par un second descripteur
+        with open(f.name, "r+b") as w:
+            w.write(HEADER.pack(MAGIC, bits, nxt))
+
+    def stats(self, bits: int):
+        """(distribués, disponibles) pour cette taille."""
+        if not os.path.exists(self.path(bits)):
+            return 0, 0
+        f, nxt = self._open(bits)
+        with f:
+            total = (os.fstat(f.fileno()).st_size - HEADER.size) // ((bits + 7) // 8)
+        return nxt, total - nxt
+
+    # --- pré-génération ---
+    def fill(self, bits: int, count: int, workers: int = None) -> int:
+        """Ajoute `count` premiers de `bits` bits, générés en parallèle."""
+        tasks = [(bits, min(BATCH, count - i)) for i in range(0, count, BATCH)]
+        added = 0
+        with multiprocessing.Pool(workers) as pool:
+            for blob in pool.imap_unordered(_generate, tasks):
+                f, _ = self._open(bits)
+                with f:
+                    f.write(blob)                   # mode ajout : fin de fichier
+                added += len(blob) // ((bits + 7) // 8)
+        return added
+
+    # --- distribution ---
+    def _reserve(self, bits: int) -> list:
+        size = (bits + 7) // 8
+        f, nxt = self._open(bits)
+        with f:
+            total = (os.fstat(f.fileno()).st_size - HEADER.size) // size
+            n = min(self.block, total - nxt)
+            if n <= 0:
+                return []
+            f.seek(HEADER.size + nxt * size)
+            blob = f.read(n * size)
+            self._set_next(f, bits, nxt + n)
+        return [int.from_bytes(blob[i:i + size], "big") for i in range(0, n * size, size)]
+
+    def get_prime(self, bits: int) -> int:
+        """Premier de `bits` bits jamais distribué (crochet get_prime)."""
+        if os.getpid() != self._pid:                # processus fils : réserve propre
+            self._pid, self._local = os.getpid(), {}
+        local = self._local.setdefault(bits, [])
+        if not local:
+            local.extend(reversed(self._reserve(bits)))
+        if local:
+            return local.pop()
+        if self.fallback:
+            return _get_prime(bits)
+        raise RuntimeError(f"réserve de premiers de {bits} bits épuisée")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("directory")
+    ap.add_argument("--bits", type=int, nargs="+", default=[512, 345])
+    ap.add_argument("--count", type=int, default=0, help="premiers à ajouter par taille")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+    pool = PrimePool(args.directory)
+    for bits in args.bits:
+        if args.count:
+            pool.fill(bits, args.count, args.workers)
+        used, left = pool.stats(bits)
+        print(f"{bits:>5} bits : {left} disponible(s), {used} distribué(s)  → {pool.path(bits)}")
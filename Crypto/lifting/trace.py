@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+trace.py
+--------
+Traces des solveurs verbeux sans écrire les grands entiers en entier.
+
+Convertir un entier en décimal est quadratique (et bute sur la limite de
+chiffres de CPython) : une trace qui imprime v, M ou chaque r en clair
+coûte plus cher que le calcul. Ici, un grand entier est résumé par
+
+    123456…789012  (1234 bits, 372 chiffres, #3fa9c01be2)
+
+  • tête : premiers chiffres déduits des 128 bits de poids fort (decimal à
+    40 chiffres de précision), sans conversion complète ;
+  • queue : n mod 10^k ;
+  • empreinte : SHA-256 des octets de n (linéaire), pour comparer deux runs.
+
+Trace(niveau) ne formate un message que si son niveau est actif :
+
+    0  silencieux      1  résumé      2  détail (par étape)
+    3  chiffres complets (bigint.to_str, sans limite)
+"""
+
+import decimal, hashlib, sys
+
+from .bigint import to_str
+
+QUIET, SUMMARY, DETAIL, FULL = 0, 1, 2, 3
+PREVIEW = 6                         # chiffres de tête et de queue
+SMALL_BITS = 64                     # en deçà : écrit tel quel
+
+
+def _head(n: int, k: int):
+    """(k premiers chiffres, nombre de chiffres) de n > 0, sans str(n)."""
+    shift = max(n.bit_length() - 128, 0)
+    top = n >> shift
+    found = set()
+    with decimal.localcontext() as ctx:         # encadrement top·2^s ≤ n < (top+1)·2^s
+        ctx.prec, ctx.Emax = 40, decimal.MAX_EMAX  # ± 10^-30 : marge d’arrondi
+        for t, eps in ((top, "-1e-30"), (top + 1 if shift else top, "1e-30")):
+            x = decimal.Decimal(t) * decimal.Decimal(2) ** shift * (1 + decimal.Decimal(eps))
+            digits = x.adjusted() + 1
+            head = x.scaleb(k - digits).to_integral_value(rounding=decimal.ROUND_FLOOR)
+            found.add((str(head), digits))
+    if len(found) == 1:
+        return found.pop()
+    # n à moins de 2^s d’une frontière (…999 / 10^d) : une division exacte
+    digits = max(d for _, d in found)
+    head = n // 10 ** (digits - k)
+    if head < 10 ** (k - 1):
+        digits -= 1
+        head = n // 10 ** (digits - k)
+    return str(head), digits
+
+
+def summary(n: int, preview: int = PREVIEW) -> str:
+    """Résumé borné d’un entier : tête…queue, taille et empreinte."""
+    n = int(n)
+    if abs(n).bit_length() <= SMALL_BITS:
+        return str(n)
+    sign, a = ("-", -n) if n < 0 else ("", n)
+    head, digits = _head(a, preview)
+    tail = str(a % 10 ** preview).rjust(preview, "0")
+    tag = hashlib.sha256(a.to_bytes((a.bit_length() + 7) // 8, "big")).hexdigest()[:10]
+    return f"{sign}{head}…{tail}  ({a.bit_length()} bits, {digits} chiffres, #{tag})"
+
+
+class Trace:
+    """Journal à niveaux ; les entiers ne sont rendus qu’à l’impression."""
+
+    def __init__(self, level: int = SUMMARY, stream=None, preview: int = PREVIEW):
+        self.level, self.stream, self.preview = level, stream, preview
+
+    def enabled(self, level: int) -> bool:
+        return level <= self.level
+
+    def show(self, x):
+        if isinstance(x, bool) or not hasattr(x, "bit_length"):
+            return x
+        return to_str(x) if self.level >= FULL else summary(x, self.preview)
+
+    def __call__(self, level: int, msg: str = "", *args, **kw) -> None:
+        """print(msg.format(...)) si `level` est actif, entiers résumés."""
+        if level > self.level:
+            return
+        if args or kw:
+            msg = msg.format(*map(self.show, args),
+                             **{k: self.show(v) for k, v in kw.items()})
+        print(msg, file=self.stream or sys.stdout)
+
+
+def level_from_argv(argv, default: int = DETAIL) -> int:
+    """-q : silencieux, -s : résumé, -v : détail, --full : chiffres complets."""
+    level = default
+    for a in argv:
+        level = {"-q": QUIET, "-s": SUMMARY, "-v": DETAIL, "--full": FULL}.get(a, level)
+    return level
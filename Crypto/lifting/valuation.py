@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+valuation.py
+------------
+Valuation p-adique v_p(x) : plus grand e tel que p^e divise x.
+
+La boucle des chal.py (`while x % p == 0: x //= p`) coûte une division
+complète d’un grand entier par unité de valuation ; ici :
+
+  • p = 2 : bit de poids faible, v_2(x) = taille de (x & -x) − 1 ;
+  • p quelconque : découpage binaire par les puissances p^(2^k) mises en
+    cache (montée tant que p^(2^k) divise, puis descente), soit O(log v)
+    divisions ;
+  • gmpy2, s’il est installé (détecté par bigint.py) : gmpy2.remove.
+
+Usage :  python3 lifting/valuation.py    (depuis Crypto/ : auto-vérification)
+"""
+
+import functools, os, random, sys
+
+try:
+    from .bigint import BACKEND, gmpy2  # moteur détecté une seule fois
+except ImportError:                     # lancé en script : auto-vérification
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from lifting.bigint import BACKEND, gmpy2
+
+
+# --- référence : la boucle des chal.py ---
+def valuation_loop(p: int, x: int) -> int:
+    res = 0
+    while x % p == 0:
+        x //= p
+        res += 1
+    return res
+
+
+def v2(x: int) -> int:
+    """Valuation 2-adique : nombre de zéros de poids faible."""
+    if not x:
+        raise ValueError("valuation de 0 infinie")
+    return (x & -x).bit_length() - 1
+
+
+# --- puissances p^(2^k), étendues à la demande ---
+@functools.lru_cache(maxsize=16)
+def _powers(p: int) -> list:
+    return [p]
+
+
+def _split(p: int, x: int) -> int:
+    pw, res, k = _powers(p), 0, 0
+    while True:                                     # montée : p, p², p⁴…
+        if k == len(pw):
+            if pw[-1].bit_length() * 2 > x.bit_length() + 1:
+                break
+            pw.append(pw[-1] * pw[-1])
+        q, r = divmod(x, pw[k])
+        if r:
+            break
+        x, res, k = q, res + (1 << k), k + 1
+    for j in range(k - 1, -1, -1):                  # descente
+        q, r = divmod(x, pw[j])
+        if not r:
+            x, res = q, res + (1 << j)
+    return res
+
+
+def valuation_py(p: int, x: int) -> int:
+    """Moteur pur Python de valuation() (bit de poids faible ou découpage)."""
+    if p == 2:
+        return v2(x)
+    if x % p:
+        return 0
+    return _split(p, abs(x))
+
+
+def valuation(p: int, x: int) -> int:
+    """v_p(x) pour p ≥ 2 et x ≠ 0 (même résultat que la boucle des chal.py)."""
+    if p < 2:
+        raise ValueError(f"base {p} invalide")
+    if not x:
+        raise ValueError("valuation de 0 infinie")
+    if gmpy2 is not None:
+        return int(gmpy2.remove(gmpy2.mpz(x), p)[1])
+    return valuation_py(p, x)
+
+
+# --- auto-vérification ---
+def self_check(trials: int = 300) -> None:
+    rng = random.Random(2)
+    for _ in range(trials):
+        p = rng.choice([2, 3, 5, 7, 1000, 65537, rng.getrandbits(64) | 1])
+        e = rng.randrange(0, 1000)
+        x = rng.choice([1, -1]) * rng.randrange(1, 1 << 256) * p ** e
+        assert valuation(p, x) == valuation_loop(p, x), (p, e)
+    print(f"OK – valuation identique à la boucle ({trials} cas, moteur {BACKEND})")
+
+
+if __name__ == "__main__":
+    self_check()
@@ -6,28 +6,55 @@ solve_basic_shellcode_final.py
 Reproduction exacte de la logique du crackme + vérifications.
 
 Étapes :
- 1) Constantes KEY (16o) & SECRET (32o) extraites de check().
+ 1) Constantes KEY (16o) & SECRET (32o) et permutation relevées en
+    exécutant le binaire dans x64emu (plus de lecture manuelle dans Ghidra).
  2) Reconstruction du buffer attendu (après permutation) par XOR.
- 3) Inversion de la permutation j = (7*i) mod 32 -> i = (23*j) mod 32.
+ 3) Inversion de la permutation relevée (ici j = (7*i) mod 32 -> i = (23*j) mod 32).
  4) Simulation fidèle des 4 appels à check().
  5) Vérifications internes + affichage du flag à saisir dans le binaire.
 
+Usage :  python3 solve_basic_shellcode.py [basic_shellcode]
+         (un binaire recompilé avec d'autres constantes se résout pareil)
 """
 
 from __future__ import annotations
 
+import argparse
+import time
+
+from x64emu import extract
+
 # 1. Constantes
+#    Valeurs lues à la main dans Ghidra pour le binaire d'origine : gardées
+#    comme témoin, les valeurs utilisées sont celles relevées par l'émulateur.
 KEY_HEX = "79 30 55 46 6f 75 4e 64 6d 59 78 30 72 4b 45 79"
 SECRET_HEX = (
     "2a 43 3b 12 29 44 2d 0e 5f 30 26 08 2d 21 02 37"
     " 1a 6a 1d 55 32 12 11 5f 3c 36 68 49 09 26 0b 1c"
 )
+GHIDRA_KEY = bytes.fromhex(KEY_HEX)
+GHIDRA_SECRET = bytes.fromhex(SECRET_HEX)
+
+ap = argparse.ArgumentParser()
+ap.add_argument("binary", nargs="?", default="basic_shellcode")
+args = ap.parse_args()
 
-KEY    = bytes.fromhex(KEY_HEX)
-SECRET = bytes.fromhex(SECRET_HEX)
+t0 = time.perf_counter()
+found = extract(args.binary)
+elapsed = time.perf_counter() - t0
+
+# check(block, p) : block[i] ^ KEY[4(p-1) + (i & 3)] == SECRET[8(p-1) + i]
+# -> la clé vue à la position 8b+i est KEY[4b + (i & 3)]
+ks = found.keystream
+KEY = b"".join(ks[8*blk:8*blk + 4] for blk in range(len(ks) // 8))
+SECRET = found.secret
+PERM = found.perm                 # PERM[i] = j (index vu par check)
+N = found.length
 
 assert len(KEY) == 16, len(KEY)
 assert len(SECRET) == 32, len(SECRET)
+assert all(ks[8*blk + 4 + i] == ks[8*blk + i] for blk in range(4) for i in range(4)), \
+    "clé non périodique : check() n'a pas la forme KEY[4(p-1) + (i & 3)]"
 
 # 2. Reconstruction du buffer attendu par check() (après permutation)
 def build_expected_buffer() -> bytes:
@@ -39,28 +66,39 @@ def build_expected_buffer() -> bytes:
 
 EXPECTED_BUFFER = build_expected_buffer()
 assert len(EXPECTED_BUFFER) == 32
+assert EXPECTED_BUFFER == found.expected
 
 # 3. Permutation & inverse (shellcode)
-#    j = (7 * i) % 32         (i = index dans l'input utilisateur, j = index vu par check)
-#    inverse : i = (23 * j) % 32 car 7 * 23 ≡ 1 (mod 32)
+#    j = PERM[i]         (i = index dans l'input utilisateur, j = index vu par check)
+#    pour le binaire d'origine PERM[i] = (7 * i) % 32, inverse (23 * j) % 32
+INVERSE = [0] * N
+for i, j in enumerate(PERM):
+    INVERSE[j] = i
+
 def apply_permutation(user_input: str) -> bytes:
-    assert len(user_input) == 32
-    buf = bytearray(32)
+    assert len(user_input) == N
+    buf = bytearray(N)
     raw = user_input.encode('latin1')  # 1 byte par char attendu
     for i, ch_val in enumerate(raw):
-        j = (7 * i) % 32
-        buf[j] = ch_val
+        buf[PERM[i]] = ch_val
     return bytes(buf)
 
 def inverse_permutation(buffer_bytes: bytes) -> str:
-    assert len(buffer_bytes) == 32
-    chars = ['?'] * 32
+    assert len(buffer_bytes) == N
+    chars = ['?'] * N
     for j, b in enumerate(buffer_bytes):
-        i = (23 * j) % 32
         # b est un int (car on itère directement sur bytes) -> safe pour chr()
-        chars[i] = chr(b)
+        chars[INVERSE[j]] = chr(b)
     return "".join(chars)
 
+def affine_form(perm: list) -> str:
+    """'(a*i) mod n' si la permutation est une multiplication, sinon '?'."""
+    n = len(perm)
+    for a in range(1, n):
+        if all(perm[i] == (a * i) % n for i in range(n)):
+            return f"({a}*i) mod {n}"
+    return "?"
+
 # 4. Simulation de check()
 def check_block(block: bytes, p: int) -> bool:
     if len(block) != 8 or not (1 <= p <= 4):
@@ -84,15 +122,21 @@ permuted_flag = apply_permutation(user_flag)
 # Validations internes
 assert permuted_flag == EXPECTED_BUFFER, "Permutation/inversion incohérente"
 assert run_full_check(permuted_flag), "La simulation de check() échoue – logique cassée"
+assert user_flag == found.flag, "Flag de l'émulateur différent de la reconstruction"
 
 # 6. Affichage détaillé
+print("Binaire                 :", args.binary)
+print(f"Relevé par émulation    : {1000 * elapsed:.1f} ms, shellcode de {len(found.shellcode)} octets")
+print("Permutation             :", affine_form(PERM))
 print("KEY (hex)               :", KEY.hex())
 print("SECRET (hex)            :", SECRET.hex())
+print("Concordance Ghidra ?    :", KEY == GHIDRA_KEY and SECRET == GHIDRA_SECRET)
 print("Buffer attendu (hex)    :", EXPECTED_BUFFER.hex())
 print("Buffer attendu (ASCII)  :", EXPECTED_BUFFER.decode('latin1'))
 print("Flag reconstruit        :", user_flag)
 print("Longueur flag           :", len(user_flag))
 print("Tous les blocs valides ?:", run_full_check(permuted_flag))
+print("Binaire émulé           :", found.output.strip())
 print()
 
 # 7. Comparaison avec flag attendu officiel (optionnel)
@@ -102,6 +146,9 @@ print("Concordance ?           :", user_flag == OFFICIAL)
 if user_flag == OFFICIAL:
     print("\n=> Utilisez ce flag dans le binaire :")
     print(OFFICIAL)
+elif found.ok:
+    print("\n=> Binaire différent de l'original, flag accepté par l'émulation :")
+    print(user_flag)
 else:
     print("\nATTENTION: Discordance entre reconstruction et flag officiel fourni.")
 
@@ -111,7 +158,7 @@ print("\nSelf-test sur OFFICIAL : blocs OK ?",
       run_full_check(perm_official))
 
 # 9. (Debug) différencier si besoin
-if user_flag != OFFICIAL:
+if user_flag != OFFICIAL and not found.ok:
     print("\nDifférences position par position :")
     for i, (a, b) in enumerate(zip(user_flag, OFFICIAL)):
         if a != b:
@@ -0,0 +1,1061 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+x64emu.py
+---------
+Chargeur ELF64 et émulateur x86-64 (sous-ensemble) en Python pur, pour
+relever sans Ghidra les constantes de « Basic Shellcode ».
+
+Elf lit les segments PT_LOAD, la table .symtab (main, check…) et les
+relocations : chaque fonction importée (calloc, fgets, mmap, memcpy…) reçoit
+dans la GOT une adresse factice que l’émulateur intercepte et sert par une
+fonction Python (Libc). Le binaire s’exécute donc tel quel : main construit
+le shellcode sur la pile, le copie dans une zone mmap, l’appelle, et le
+shellcode permute la saisie avant d’appeler check() sur chaque bloc.
+
+Emulator décode une fois chaque bloc de base en une liste de fermetures
+(une par instruction, qui renvoie l’adresse suivante) et garde ces blocs
+d’une exécution à l’autre ; un bloc n’est redécodé que si les octets à son
+adresse ont changé (le shellcode est recopié à chaque run, à la même
+adresse). Jeu couvert : ce que produit gcc -O0 pour ce genre de binaire —
+mov/movabs/movzx/movsx/lea, ALU, shifts, mul/div, push/pop, call/ret/leave,
+jcc/setcc, cdqe/cqo, préfixes REX et 66, adressage ModRM/SIB et RIP-relatif.
+
+Deux points d’observation, sans coût quand ils ne servent pas :
+  • watch(adresse, fn) : fn(emu) appelée à l’entrée du bloc (arguments
+    d’un appel de fonction) ;
+  • cmp_log=True : chaque CMP exécuté est noté (rip, taille, a, b).
+
+extract() s’en sert pour tout relever automatiquement :
+  1) longueur attendue : premier CMP du shellcode dont un opérande suit la
+     longueur saisie sur deux sondes (1 et 2 octets) — EmuError sinon ;
+  2) permutation : entrée sonde à octets distincts, blocs reçus par check() ;
+  3) constantes : CMP octet de check(), gauche = bloc ^ KEY, droite = SECRET ;
+  4) le flag en découle, puis est vérifié par une dernière exécution.
+
+Usage :  python3 x64emu.py [basic_shellcode] [--input FLAG] [--bench N]
+"""
+
+import argparse, struct, time
+from typing import NamedTuple
+
+M64 = (1 << 64) - 1
+MASK = {1: 0xff, 2: 0xffff, 4: 0xffffffff, 8: M64}
+RAX, RCX, RDX, RBX, RSP, RBP, RSI, RDI = range(8)
+
+BASE = 0x555555554000               # chargement du PIE (comme gdb)
+STACK_TOP, STACK_SIZE = 0x7ffffffff000, 0x21000
+HEAP, HEAP_SIZE = 0x10000000, 1 << 20
+MMAP_TOP = 0x7ffff7ff0000
+LIBC = 0x7ffff7a00000               # adresses factices des imports
+STOP = 0x7ffff7900000               # adresse de retour de main
+MAX_STEPS = 1_000_000
+MAX_BLOCK = 64
+
+
+class EmuError(RuntimeError):
+    pass
+
+
+# --- mémoire ---
+class Memory:
+    """Régions [début, fin) → bytearray ; lecture / écriture petit-boutiste."""
+
+    def __init__(self):
+        self.regions = []
+
+    def clear(self) -> None:
+        self.regions.clear()
+
+    def map(self, start: int, size: int, data: bytes = b"") -> bytearray:
+        buf = bytearray(size)
+        buf[:len(data)] = data
+        self.regions.append((start, start + size, buf))
+        return buf
+
+    def _find(self, addr: int, n: int):
+        for start, end, buf in self.regions:
+            if start <= addr and addr + n <= end:
+                return buf, addr - start
+        raise EmuError(f"accès mémoire hors zone : {addr:#x} (+{n})")
+
+    def read(self, addr: int, n: int) -> bytes:
+        buf, off = self._find(addr, n)
+        return bytes(buf[off:off + n])
+
+    def write(self, addr: int, data: bytes) -> None:
+        buf, off = self._find(addr, len(data))
+        buf[off:off + len(data)] = data
+
+    def read_int(self, addr: int, size: int) -> int:
+        buf, off = self._find(addr, size)
+        return int.from_bytes(buf[off:off + size], "little")
+
+    def write_int(self, addr: int, value: int, size: int) -> None:
+        buf, off = self._find(addr, size)
+        buf[off:off + size] = (value & MASK[size]).to_bytes(size, "little")
+
+    def cstring(self, addr: int, limit: int = 1 << 16) -> bytes:
+        buf, off = self._find(addr, 1)
+        end = buf.find(b"\0", off, off + limit)
+        return bytes(buf[off:end if end >= 0 else off + limit])
+
+
+# --- ELF ---
+class Elf:
+    """Image chargée (relocations appliquées), symboles et imports d’un ELF64 x86-64."""
+
+    def __init__(self, path: str, base: int = BASE):
+        with open(path, "rb") as f:
+            raw = f.read()
+        if raw[:4] != b"\x7fELF" or raw[4] != 2 or raw[5] != 1:
+            raise EmuError(f"{path} : pas un ELF64 petit-boutiste")
+        (etype, machine, _, entry, phoff, shoff, _, _, phentsize, phnum,
+         shentsize, shnum, shstrndx) = struct.unpack_from("<HHIQQQIHHHHHH", raw, 16)
+        if machine != 62:
+            raise EmuError(f"{path} : machine {machine}, x86-64 attendu")
+        self.base = base if etype == 3 else 0       # ET_DYN : PIE relogé
+        self.entry = self.base + entry
+
+        loads = []
+        for i in range(phnum):
+            ptype, _, off, vaddr, _, filesz, memsz, _ = struct.unpack_from(
+                "<IIQQQQQQ", raw, phoff + i * phentsize)
+            if ptype == 1:                                      # PT_LOAD
+                loads.append((vaddr, raw[off:off + filesz], memsz))
+        lo = min(v for v, _, _ in loads) & ~0xfff
+        hi = (max(v + m for v, _, m in loads) + 0xfff) & ~0xfff
+        self.start = self.base + lo
+        image = bytearray(hi - lo)
+        for vaddr, data, _ in loads:
+            image[vaddr - lo:vaddr - lo + len(data)] = data
+
+        sections = [struct.unpack_from("<IIQQQQIIQQ", raw, shoff + i * shentsize)
+                    for i in range(shnum)]
+        shstr = sections[shstrndx]
+        names = {raw[shstr[4] + s[0]:raw.index(b"\0", shstr[4] + s[0])].decode(): s
+                 for s in sections}
+
+        def strtab(sec, off):
+            start = sec[4] + off
+            return raw[start:raw.index(b"\0", start)].decode()
+
+        def symbols(sec):
+            link = sections[sec[6]]
+            out = []
+            for k in range(sec[5] // 24):
+                name, info, _, _, value, size = struct.unpack_from("<IBBHQQ", raw, sec[4] + 24 * k)
+                out.append((strtab(link, name), info & 0xf, value, size))
+            return out
+
+        # symboles locaux (non strippé) : nom → (adresse, taille)
+        self.symbols = {}
+        if ".symtab" in names:
+            for name, kind, value, size in symbols(names[".symtab"]):
+                if name and kind in (1, 2) and value:           # OBJECT, FUNC
+                    self.symbols[name] = (self.base + value, size)
+
+        # relocations : RELATIVE appliquées, imports → adresses factices
+        dynsym = symbols(names[".dynsym"]) if ".dynsym" in names else []
+        self.imports = {}                                       # adresse factice → nom
+        slots = {}
+        for sec in sections:
+            if sec[1] != 4:                                     # SHT_RELA
+                continue
+            for k in range(sec[5] // 24):
+                off, info, addend = struct.unpack_from("<QQq", raw, sec[4] + 24 * k)
+                rtype, sym = info & 0xffffffff, info >> 32
+                where = off - lo
+                if rtype == 8:                                  # R_X86_64_RELATIVE
+                    value = self.base + addend
+                elif rtype in (6, 7) and sym:                   # GLOB_DAT, JUMP_SLOT
+                    name, kind, svalue, _ = dynsym[sym]
+                    if svalue:
+                        value = self.base + svalue
+                    else:
+                        if name not in slots:
+                            slots[name] = LIBC + 16 * len(slots)
+                            self.imports[slots[name]] = name
+                        value = slots[name]
+                else:
+                    continue
+                image[where:where + 8] = (value & M64).to_bytes(8, "little")
+        self.image = bytes(image)
+
+    def symbol(self, name: str) -> int:
+        try:
+            return self.symbols[name][0]
+        except KeyError:
+            raise EmuError(f"symbole absent : {name}") from None
+
+    def span(self, name: str) -> range:
+        try:
+            addr, size = self.symbols[name]
+        except KeyError:
+            raise EmuError(f"symbole absent : {name}") from None
+        return range(addr, addr + size)
+
+
+# --- fonctions importées ---
+class Libc:
+    """Le strict nécessaire de la libc, sur la mémoire de l’émulateur."""
+
+    def __init__(self, emu):
+        self.emu = emu
+        self.table = {"calloc": self.calloc, "malloc": self.malloc, "free": self.free,
+                      "strlen": self.strlen, "memcpy": self.memcpy, "memset": self.memset,
+                      "mmap": self.mmap, "munmap": self.free, "fgets": self.fgets,
+                      "puts": self.puts, "printf": self.printf, "perror": self.puts,
+                      "putchar": self.putchar}
+
+    def _args(self, n):
+        R = self.emu.R
+        return [R[r] for r in (RDI, RSI, RDX, RCX, 8, 9)[:n]]
+
+    def _alloc(self, n: int) -> int:
+        emu = self.emu
+        addr = emu.brk
+        emu.brk = (emu.brk + max(n, 1) + 15) & ~15
+        if emu.brk > HEAP + HEAP_SIZE:
+            raise EmuError("tas épuisé")
+        return addr
+
+    def malloc(self):
+        return self._alloc(self._args(1)[0])
+
+    def calloc(self):
+        nmemb, size = self._args(2)
+        return self._alloc(nmemb * size)               # le tas part de zéros
+
+    def free(self):
+        return 0
+
+    def strlen(self):
+        return len(self.emu.mem.cstring(self._args(1)[0]))
+
+    def memcpy(self):
+        dst, src, n = self._args(3)
+        self.emu.mem.write(dst, self.emu.mem.read(src, n))
+        self.emu.copies.append((dst, n))
+        return dst
+
+    def memset(self):
+        dst, c, n = self._args(3)
+        self.emu.mem.write(dst, bytes([c & 0xff]) * n)
+        return dst
+
+    def mmap(self):
+        emu, (_, n) = self.emu, self._args(2)
+        n = (n + 0xfff) & ~0xfff
+        emu.mmap_top -= n
+        emu.mem.map(emu.mmap_top, n)
+        return emu.mmap_top
+
+    def fgets(self):
+        buf, n, _ = self._args(3)
+        emu = self.emu
+        if emu.stdin_pos >= len(emu.stdin):
+            return 0
+        end = emu.stdin.find(b"\n", emu.stdin_pos)
+        end = len(emu.stdin) if end < 0 else end + 1
+        line = emu.stdin[emu.stdin_pos:min(end, emu.stdin_pos + n - 1)]
+        emu.stdin_pos += len(line)
+        emu.mem.write(buf, line + b"\0")
+        return buf
+
+    def puts(self):
+        self.emu.stdout += self.emu.mem.cstring(self._args(1)[0]) + b"\n"
+        return 1
+
+    def printf(self):
+        fmt = self.emu.mem.cstring(self._args(1)[0])    # pas de conversion %
+        self.emu.stdout += fmt
+        return len(fmt)
+
+    def putchar(self):
+        self.emu.stdout += bytes([self._args(1)[0] & 0xff])
+        return self._args(1)[0]
+
+
+# --- décodage ---
+def _sext(v: int, bits: int) -> int:
+    return v - (1 << bits) if v >> (bits - 1) & 1 else v
+
+
+def _conditions(F):
+    """cc (0…15) → prédicat sur les drapeaux F = [CF, ZF, SF, OF, PF]."""
+    base = [lambda: F[3], lambda: F[0], lambda: F[1], lambda: F[0] or F[1],
+            lambda: F[2], lambda: F[4], lambda: F[2] != F[3],
+            lambda: F[1] or F[2] != F[3]]
+    out = []
+    for cc in range(16):
+        p = base[cc >> 1]
+        out.append(p if not cc & 1 else (lambda p=p: not p()))
+    return out
+
+
+class _Insn:
+    """Octets d’une instruction en cours de décodage."""
+
+    def __init__(self, code: bytes, addr: int):
+        self.code, self.addr, self.pos = code, addr, 0
+
+    def u(self, n: int) -> int:
+        v = int.from_bytes(self.code[self.pos:self.pos + n], "little")
+        self.pos += n
+        return v
+
+    def s(self, n: int) -> int:
+        return _sext(self.u(n), 8 * n)
+
+
+class Emulator:
+    """Un ELF chargé, rejouable pour n’importe quelle entrée standard."""
+
+    def __init__(self, elf: Elf, cmp_log: bool = False):
+        self.elf = elf
+        self.R = [0] * 16
+        self.F = [0, 0, 0, 0, 0]
+        self.cond = _conditions(self.F)
+        self.cmp_log = [] if cmp_log else None
+        self.blocks = {}                    # adresse → (octets, [fermetures])
+        self.decoded = 0
+        self.watches = {}
+        self.mem = Memory()
+        self.libc = Libc(self)
+        self.hooks = {addr: self.libc.table.get(name, self._missing(name))
+                      for addr, name in elf.imports.items()}
+        self.steps = 0
+
+    @staticmethod
+    def _missing(name):
+        def fn():
+            raise EmuError(f"import non émulé : {name}")
+        return fn
+
+    def watch(self, addr: int, fn) -> None:
+        """fn(emu) à chaque passage en `addr` ; seul un bloc qui l’enjambe est oublié."""
+        self.watches[addr] = fn
+        for start in [s for s, (raw, _) in self.blocks.items() if s < addr < s + len(raw)]:
+            del self.blocks[start]
+
+    # --- état ---
+    def reset(self, stdin: bytes = b"") -> None:
+        self.mem.clear()
+        self.mem.map(self.elf.start, len(self.elf.image), self.elf.image)
+        self.mem.map(STACK_TOP - STACK_SIZE, STACK_SIZE)
+        self.mem.map(HEAP, HEAP_SIZE)
+        self.brk, self.mmap_top = HEAP, MMAP_TOP
+        self.stdin, self.stdin_pos, self.stdout, self.copies = stdin, 0, b"", []
+        self.R[:] = [0] * 16
+        self.F[:] = [0] * 5
+        self.R[RSP] = STACK_TOP - 0x1000
+        if self.cmp_log is not None:
+            self.cmp_log.clear()
+
+    def push(self, v: int) -> None:
+        self.R[RSP] = (self.R[RSP] - 8) & M64
+        self.mem.write_int(self.R[RSP], v, 8)
+
+    def pop(self) -> int:
+        v = self.mem.read_int(self.R[RSP], 8)
+        self.R[RSP] = (self.R[RSP] + 8) & M64
+        return v
+
+    # --- exécution ---
+    def call(self, addr: int, *args, max_steps: int = MAX_STEPS) -> int:
+        """Appelle `addr` (convention System V) et renvoie rax."""
+        for r, v in zip((RDI, RSI, RDX, RCX, 8, 9), args):
+            self.R[r] = v & M64
+        self.push(STOP)
+        rip, steps, blocks, hooks, watches = addr, 0, self.blocks, self.hooks, self.watches
+        while rip != STOP:
+            hook = hooks.get(rip)
+            if hook is not None:
+                self.R[RAX] = hook() & M64
+                rip = self.pop()
+                continue
+            if watches and rip in watches:
+                watches[rip](self)
+            blk = blocks.get(rip)
+            if blk is None or self.mem.read(rip, len(blk[0])) != blk[0]:
+                blk = blocks[rip] = self._block(rip)
+            for fn in blk[1]:
+                rip = fn()
+            steps += len(blk[1])
+            if steps > max_steps:
+                raise EmuError(f"plus de {max_steps} instructions exécutées")
+        self.steps += steps
+        return self.R[RAX]
+
+    def run(self, stdin: bytes = b"", entry: str = "main") -> int:
+        """Exécute `entry` depuis un état neuf ; renvoie le code de retour (eax)."""
+        self.reset(stdin)
+        return self.call(self.elf.symbol(entry), 1, 0, 0) & 0xffffffff
+
+    def _block(self, addr: int):
+        """Décode un bloc de base : jusqu’à un branchement ou un point observé."""
+        start, insns = addr, []
+        while True:
+            fn, addr, ends = self._decode(addr)
+            insns.append(fn)
+            if ends or len(insns) >= MAX_BLOCK or addr in self.watches:
+                break
+        self.decoded += 1
+        return self.mem.read(start, addr - start), insns
+
+    # --- opérandes ---
+    def _reg(self, r: int, size: int, rex: bool):
+        R = self.R
+        if size == 1 and not rex and 4 <= r < 8:                # ah, ch, dh, bh
+            h = r - 4
+
+            def set_(v):
+                R[h] = R[h] & ~0xff00 | (v & 0xff) << 8
+            return (lambda: R[h] >> 8 & 0xff), set_
+        if size == 8:
+            def set_(v):
+                R[r] = v & M64
+            return (lambda: R[r]), set_
+        if size == 4:
+            def set_(v):
+                R[r] = v & 0xffffffff                          # extension par zéros
+            return (lambda: R[r] & 0xffffffff), set_
+        m = MASK[size]
+
+        def set_(v):
+            R[r] = R[r] & ~m & M64 | v & m
+        return (lambda: R[r] & m), set_
+
+    def _modrm(self, ins: _Insn, rex: int):
+        """(mod, reg, rm, adresse) ; adresse = (base, index, échelle, disp, rip-relatif)."""
+        modrm = ins.u(1)
+        mod, reg, rm = modrm >> 6, (modrm >> 3 & 7) | (rex & 4) << 1, modrm & 7
+        if mod == 3:
+            return mod, reg, rm | (rex & 1) << 3, None
+        base, index, scale, riprel, disp = rm | (rex & 1) << 3, None, 1, False, 0
+        if rm == 4:
+            sib = ins.u(1)
+            scale, idx, b = 1 << (sib >> 6), (sib >> 3 & 7) | (rex & 2) << 2, sib & 7
+            index = None if idx == 4 else idx
+            base = None if b == 5 and mod == 0 else b | (rex & 1) << 3
+            if base is None:
+                disp = ins.s(4)
+        elif rm == 5 and mod == 0:
+            base, riprel, disp = None, True, ins.s(4)
+        if mod == 1:
+            disp = ins.s(1)
+        elif mod == 2:
+            disp = ins.s(4)
+        return mod, reg, None, (base, index, scale, disp, riprel)
+
+    def _ea(self, addr, nxt: int):
+        base, index, scale, disp, riprel = addr
+        R = self.R
+        if riprel:
+            c = (nxt + disp) & M64
+            return lambda: c
+        if index is None:
+            if base is None:
+                c = disp & M64
+                return lambda: c
+            return lambda: (R[base] + disp) & M64
+        if base is None:
+            return lambda: (R[index] * scale + disp) & M64
+        return lambda: (R[base] + R[index] * scale + disp) & M64
+
+    def _rm(self, rm, addr, size: int, rex: bool, nxt: int):
+        if addr is None:
+            return self._reg(rm, size, rex)
+        ea, mem = self._ea(addr, nxt), self.mem
+
+        def set_(v):
+            mem.write_int(ea(), v, size)
+        return (lambda: mem.read_int(ea(), size)), set_
+
+    # --- drapeaux ---
+    def _alu(self, op: int, size: int):
+        """op 0…7 = add or adc sbb and sub xor cmp → f(a, b) qui pose F."""
+        F, bits, m = self.F, 8 * size, MASK[size]
+        top = bits - 1
+
+        def flags(r):
+            F[1] = r == 0
+            F[2] = r >> top
+            F[4] = not bin(r & 0xff).count("1") & 1
+            return r
+
+        if op in (0, 2):
+            def f(a, b):
+                full = a + b + (F[0] if op == 2 else 0)
+                r = full & m
+                F[0], F[3] = full >> bits, ((a ^ r) & (b ^ r)) >> top & 1
+                return flags(r)
+        elif op in (3, 5, 7):
+            def f(a, b):
+                c = F[0] if op == 3 else 0
+                r = (a - b - c) & m
+                F[0], F[3] = a < b + c, ((a ^ b) & (a ^ r)) >> top & 1
+                return flags(r)
+        else:
+            fn = {1: int.__or__, 4: int.__and__, 6: int.__xor__}[op]
+
+            def f(a, b):
+                F[0] = F[3] = 0
+                return flags(fn(a, b))
+        return f
+
+    def _binop(self, op, get_d, set_d, get_s, nxt, size, rip):
+        f = self._alu(op, size)
+        if op == 7:
+            log = self.cmp_log
+            if log is None:
+                def fn():
+                    f(get_d(), get_s())
+                    return nxt
+            else:
+                def fn():
+                    a, b = get_d(), get_s()
+                    log.append((rip, size, a, b))
+                    f(a, b)
+                    return nxt
+            return fn
+
+        def fn():
+            set_d(f(get_d(), get_s()))
+            return nxt
+        return fn
+
+    # --- une instruction ---
+    def _decode(self, addr: int):
+        """(fermeture, adresse suivante, fin de bloc ?) pour l’instruction en `addr`."""
+        code = self.mem.read(addr, min(15, self._limit(addr) - addr))
+        ins = _Insn(code, addr)
+        osize, rex = 4, 0
+        while True:
+            b = code[ins.pos]
+            if b == 0x66:
+                osize = 2
+            elif b in (0xf2, 0xf3, 0x2e, 0x3e):                 # rep/bnd/notrack : ignorés
+                pass
+            else:
+                break
+            ins.pos += 1
+        if 0x40 <= code[ins.pos] <= 0x4f:
+            rex = code[ins.pos]
+            ins.pos += 1
+            if rex & 8:
+                osize = 8
+        op = ins.u(1)
+        R, F = self.R, self.F
+        has_rex = rex != 0
+
+        def done():
+            return addr + ins.pos
+
+        def bad():
+            return EmuError(f"{addr:#x} : instruction non gérée "
+                            f"{code[:ins.pos + 1].hex(' ')}")
+
+        # ALU r/m,r  r,r/m  al/eax,imm (00…3d)
+        if op < 0x40 and op & 7 < 6:
+            alu, form = op >> 3, op & 7
+            size = 1 if form in (0, 2, 4) else osize
+            if form >= 4:
+                imm = ins.u(1) if size == 1 else ins.s(min(size, 4)) & MASK[size]
+                get_d, set_d = self._reg(RAX, size, has_rex)
+                nxt = done()
+                return self._binop(alu, get_d, set_d, lambda: imm, nxt, size, addr), nxt, False
+            _, reg, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            g_rm, s_rm = self._rm(rm, ad, size, has_rex, nxt)
+            g_r, s_r = self._reg(reg, size, has_rex)
+            if form in (0, 1):
+                return self._binop(alu, g_rm, s_rm, g_r, nxt, size, addr), nxt, False
+            return self._binop(alu, g_r, s_r, g_rm, nxt, size, addr), nxt, False
+
+        if 0x50 <= op <= 0x57:                                  # push r64
+            r = op - 0x50 | (rex & 1) << 3
+            nxt = done()
+
+            def fn():
+                self.push(R[r])
+                return nxt
+            return fn, nxt, False
+        if 0x58 <= op <= 0x5f:                                  # pop r64
+            r = op - 0x58 | (rex & 1) << 3
+            nxt = done()
+
+            def fn():
+                R[r] = self.pop()
+                return nxt
+            return fn, nxt, False
+        if op in (0x68, 0x6a):                                  # push imm
+            imm = ins.s(4 if op == 0x68 else 1) & M64
+            nxt = done()
+
+            def fn():
+                self.push(imm)
+                return nxt
+            return fn, nxt, False
+        if op == 0x63:                                          # movsxd
+            _, reg, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            g, _ = self._rm(rm, ad, 4, has_rex, nxt)
+            _, s = self._reg(reg, osize, has_rex)
+
+            def fn():
+                s(_sext(g(), 32))
+                return nxt
+            return fn, nxt, False
+        if op in (0x69, 0x6b):                                  # imul r, r/m, imm
+            _, reg, rm, ad = self._modrm(ins, rex)
+            imm = ins.s(1 if op == 0x6b else min(osize, 4))
+            nxt = done()
+            g, _ = self._rm(rm, ad, osize, has_rex, nxt)
+            _, s = self._reg(reg, osize, has_rex)
+            bits = 8 * osize
+
+            def fn():
+                full = _sext(g(), bits) * imm
+                F[0] = F[3] = _sext(full & MASK[osize], bits) != full
+                s(full)
+                return nxt
+            return fn, nxt, False
+        if 0x70 <= op <= 0x7f or op in (0xe9, 0xeb):            # jcc / jmp rel
+            rel = ins.s(4 if op == 0xe9 else 1)
+            nxt = done()
+            target = (nxt + rel) & M64
+            if op in (0xe9, 0xeb):
+                return (lambda: target), nxt, True
+            cond = self.cond[op & 0xf]
+            return (lambda: target if cond() else nxt), nxt, True
+        if op in (0x80, 0x81, 0x83):                            # groupe 1 : ALU r/m, imm
+            size = 1 if op == 0x80 else osize
+            _, alu, rm, ad = self._modrm(ins, rex)
+            alu &= 7
+            imm = ins.u(1) if op == 0x80 else ins.s(1 if op == 0x83 else min(size, 4)) & MASK[size]
+            nxt = done()
+            g, s = self._rm(rm, ad, size, has_rex, nxt)
+            return self._binop(alu, g, s, lambda: imm, nxt, size, addr), nxt, False
+        if op in (0x84, 0x85):                                  # test r/m, r
+            size = 1 if op == 0x84 else osize
+            _, reg, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            g, _ = self._rm(rm, ad, size, has_rex, nxt)
+            gr, _ = self._reg(reg, size, has_rex)
+            f = self._alu(4, size)
+
+            def fn():
+                f(g(), gr())
+                return nxt
+            return fn, nxt, False
+        if op in (0x88, 0x89, 0x8a, 0x8b):                      # mov
+            size = 1 if op in (0x88, 0x8a) else osize
+            _, reg, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            g_rm, s_rm = self._rm(rm, ad, size, has_rex, nxt)
+            g_r, s_r = self._reg(reg, size, has_rex)
+            src, dst = (g_r, s_rm) if op in (0x88, 0x89) else (g_rm, s_r)
+
+            def fn():
+                dst(src())
+                return nxt
+            return fn, nxt, False
+        if op == 0x8d:                                          # lea
+            _, reg, _, ad = self._modrm(ins, rex)
+            nxt = done()
+            if ad is None:
+                raise bad()
+            ea = self._ea(ad, nxt)
+            _, s = self._reg(reg, osize, has_rex)
+
+            def fn():
+                s(ea())
+                return nxt
+            return fn, nxt, False
+        if op == 0x90:
+            nxt = done()
+            return (lambda: nxt), nxt, False
+        if op == 0x98:                                          # cbw / cwde / cdqe
+            bits = 4 * osize
+            _, s = self._reg(RAX, osize, has_rex)
+            nxt = done()
+
+            def fn():
+                s(_sext(R[RAX] & ((1 << bits) - 1), bits))
+                return nxt
+            return fn, nxt, False
+        if op == 0x99:                                          # cwd / cdq / cqo
+            bits = 8 * osize
+            _, s = self._reg(RDX, osize, has_rex)
+            nxt = done()
+
+            def fn():
+                s(-(R[RAX] >> (bits - 1) & 1))
+                return nxt
+            return fn, nxt, False
+        if 0xb0 <= op <= 0xbf:                                  # mov r, imm
+            size = 1 if op < 0xb8 else osize
+            imm = ins.u(size)                                   # movabs si REX.W
+            _, s = self._reg((op & 7) | (rex & 1) << 3, size, has_rex)
+            nxt = done()
+
+            def fn():
+                s(imm)
+                return nxt
+            return fn, nxt, False
+        if op in (0xc0, 0xc1, 0xd0, 0xd1, 0xd2, 0xd3):          # groupe 2 : décalages
+            size = 1 if op in (0xc0, 0xd0, 0xd2) else osize
+            _, kind, rm, ad = self._modrm(ins, rex)
+            kind &= 7
+            if kind not in (4, 5, 7):
+                raise bad()
+            count = ins.u(1) if op in (0xc0, 0xc1) else 1 if op in (0xd0, 0xd1) else None
+            nxt = done()
+            g, s = self._rm(rm, ad, size, has_rex, nxt)
+            bits, cmask = 8 * size, 0x3f if size == 8 else 0x1f
+            m = MASK[size]
+
+            def fn():
+                n = (count if count is not None else R[RCX]) & cmask
+                if n:
+                    v = g()
+                    if kind == 4:
+                        r = (v << n) & m
+                        F[0] = v >> (bits - n) & 1
+                    else:
+                        sv = _sext(v, bits) if kind == 7 else v
+                        r = (sv >> n) & m
+                        F[0] = sv >> (n - 1) & 1
+                    F[1], F[2], F[3] = r == 0, r >> (bits - 1), (r ^ v) >> (bits - 1) & 1
+                    F[4] = not bin(r & 0xff).count("1") & 1
+                    s(r)
+                return nxt
+            return fn, nxt, False
+        if op == 0xc3:                                          # ret
+            return self.pop, done(), True
+        if op in (0xc6, 0xc7):                                  # mov r/m, imm
+            size = 1 if op == 0xc6 else osize
+            _, _, rm, ad = self._modrm(ins, rex)
+            imm = ins.s(1 if size == 1 else min(size, 4)) & MASK[size]
+            nxt = done()
+            _, s = self._rm(rm, ad, size, has_rex, nxt)
+
+            def fn():
+                s(imm)
+                return nxt
+            return fn, nxt, False
+        if op == 0xc9:                                          # leave
+            nxt = done()
+
+            def fn():
+                R[RSP] = R[RBP]
+                R[RBP] = self.pop()
+                return nxt
+            return fn, nxt, False
+        if op == 0xe8:                                          # call rel32
+            rel = ins.s(4)
+            nxt = done()
+            target = (nxt + rel) & M64
+
+            def fn():
+                self.push(nxt)
+                return target
+            return fn, nxt, True
+        if op in (0xf6, 0xf7):                                  # groupe 3
+            size = 1 if op == 0xf6 else osize
+            _, kind, rm, ad = self._modrm(ins, rex)
+            kind &= 7
+            imm = ins.u(min(size, 4)) if kind in (0, 1) else None
+            nxt = done()
+            g, s = self._rm(rm, ad, size, has_rex, nxt)
+            return self._group3(kind, g, s, imm, size, nxt, bad), nxt, False
+        if op in (0xfe, 0xff):                                  # groupe 4 / 5
+            size = 1 if op == 0xfe else osize
+            _, kind, rm, ad = self._modrm(ins, rex)
+            kind &= 7
+            nxt = done()
+            if kind in (2, 4, 6):                               # call / jmp / push r/m64
+                g, _ = self._rm(rm, ad, 8, has_rex, nxt)
+                if kind == 2:
+                    def fn():
+                        target = g()
+                        self.push(nxt)
+                        return target
+                    return fn, nxt, True
+                if kind == 4:
+                    return g, nxt, True
+
+                def fn():
+                    self.push(g())
+                    return nxt
+                return fn, nxt, False
+            if kind not in (0, 1):
+                raise bad()
+            g, s = self._rm(rm, ad, size, has_rex, nxt)
+            f = self._alu(0 if kind == 0 else 5, size)
+
+            def fn():
+                c = F[0]                                        # inc/dec gardent CF
+                s(f(g(), 1))
+                F[0] = c
+                return nxt
+            return fn, nxt, False
+        if op == 0x0f:
+            return self._decode_0f(ins, rex, osize, addr, done, bad)
+        raise bad()
+
+    def _limit(self, addr: int) -> int:
+        for start, end, _ in self.mem.regions:
+            if start <= addr < end:
+                return end
+        raise EmuError(f"exécution hors zone : {addr:#x}")
+
+    def _group3(self, kind, g, s, imm, size, nxt, bad):
+        R, F, bits, m = self.R, self.F, 8 * size, MASK[size]
+        if kind in (0, 1):                                      # test r/m, imm
+            f = self._alu(4, size)
+
+            def fn():
+                f(g(), imm)
+                return nxt
+            return fn
+        if kind == 2:                                           # not
+            def fn():
+                s(~g())
+                return nxt
+            return fn
+        if kind == 3:                                           # neg
+            f = self._alu(5, size)
+
+            def fn():
+                v = g()
+                s(f(0, v))
+                return nxt
+            return fn
+        get_a, set_a = self._reg(RAX, size, True)
+        get_d, set_d = self._reg(RDX, size, True)
+        if size == 1:                                           # ax = al * r/m8, ah:al…
+            get_dx = lambda: R[RAX] >> 8 & 0xff
+
+            def set_pair(hi, lo):
+                R[RAX] = R[RAX] & ~0xffff & M64 | (hi & 0xff) << 8 | lo & 0xff
+        else:
+            get_dx = get_d
+
+            def set_pair(hi, lo):
+                set_d(hi)
+                set_a(lo)
+        if kind in (4, 5):                                      # mul / imul
+            def fn():
+                a, b = get_a(), g()
+                if kind == 5:
+                    a, b = _sext(a, bits), _sext(b, bits)
+                full = a * b
+                set_pair(full >> bits, full)
+                lo = full & m
+                F[0] = F[3] = (full >> bits) != 0 if kind == 4 else _sext(lo, bits) != full
+                return nxt
+            return fn
+
+        def fn():                                               # div / idiv
+            d = g()
+            num = get_dx() << bits | get_a()
+            if kind == 7:
+                d, num = _sext(d, bits), _sext(num, 2 * bits)
+            if d == 0:
+                raise EmuError(f"division par zéro (#DE) avant {nxt:#x}")
+            q = abs(num) // abs(d) * (1 if (num < 0) == (d < 0) else -1)
+            r = num - q * d
+            if (q if kind == 6 else q + (1 << (bits - 1))) >> bits:
+                raise EmuError(f"quotient hors taille (#DE) avant {nxt:#x}")
+            set_pair(r, q)
+            return nxt
+        return fn
+
+    def _decode_0f(self, ins, rex, osize, addr, done, bad):
+        op = ins.u(1)
+        has_rex = rex != 0
+        if op == 0x1e and ins.code[ins.pos] == 0xfa:            # endbr64
+            ins.pos += 1
+            nxt = done()
+            return (lambda: nxt), nxt, False
+        if op == 0x1f:                                          # nop r/m
+            self._modrm(ins, rex)
+            nxt = done()
+            return (lambda: nxt), nxt, False
+        if 0x80 <= op <= 0x8f:                                  # jcc rel32
+            rel = ins.s(4)
+            nxt = done()
+            target = (nxt + rel) & M64
+            cond = self.cond[op & 0xf]
+            return (lambda: target if cond() else nxt), nxt, True
+        if 0x90 <= op <= 0x9f:                                  # setcc r/m8
+            _, _, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            _, s = self._rm(rm, ad, 1, has_rex, nxt)
+            cond = self.cond[op & 0xf]
+
+            def fn():
+                s(1 if cond() else 0)
+                return nxt
+            return fn, nxt, False
+        if op == 0xaf:                                          # imul r, r/m
+            _, reg, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            g, _ = self._rm(rm, ad, osize, has_rex, nxt)
+            gr, sr = self._reg(reg, osize, has_rex)
+            bits, F = 8 * osize, self.F
+
+            def fn():
+                full = _sext(gr(), bits) * _sext(g(), bits)
+                F[0] = F[3] = _sext(full & MASK[osize], bits) != full
+                sr(full)
+                return nxt
+            return fn, nxt, False
+        if op in (0xb6, 0xb7, 0xbe, 0xbf):                      # movzx / movsx
+            src = 1 if op in (0xb6, 0xbe) else 2
+            _, reg, rm, ad = self._modrm(ins, rex)
+            nxt = done()
+            g, _ = self._rm(rm, ad, src, has_rex, nxt)
+            _, s = self._reg(reg, osize, has_rex)
+            if op >= 0xbe:
+                bits = 8 * src
+
+                def fn():
+                    s(_sext(g(), bits))
+                    return nxt
+            else:
+                def fn():
+                    s(g())
+                    return nxt
+            return fn, nxt, False
+        raise bad()
+
+
+# --- relevé automatique ---
+class Extraction(NamedTuple):
+    length: int                     # longueur de saisie exigée par le shellcode
+    perm: list                      # perm[i] = position dans le buffer vu par check()
+    keystream: bytes                # octet XORé à chaque position du buffer
+    secret: bytes                   # octet attendu après XOR
+    expected: bytes                 # buffer que check() doit recevoir
+    flag: str
+    shellcode: bytes
+    ok: bool                        # le binaire émulé accepte le flag
+    output: str
+
+
+def _probe(n: int) -> bytes:
+    """n octets distincts, imprimables si possible, sans \\n ni \\0."""
+    pool = bytes(range(0x21, 0x7f)) + bytes(range(0x80, 0x100)) + bytes(range(1, 0x21))
+    pool = pool.replace(b"\n", b"")
+    if n > len(pool):
+        raise EmuError(f"longueur {n} : pas assez d’octets distincts pour la sonde")
+    return pool[:n]
+
+
+def extract(path_or_emu, target: str = "check") -> Extraction:
+    """Longueur, permutation, KEY/SECRET et flag, relevés en exécutant le binaire."""
+    emu = path_or_emu
+    if not isinstance(emu, Emulator):
+        emu = Emulator(Elf(emu), cmp_log=True)
+    if emu.cmp_log is None:
+        emu.cmp_log = []
+    elf = emu.elf
+    code = elf.span(target)
+    inside = lambda rip: elf.start <= rip < elf.start + len(elf.image)
+
+    # 1) longueur : CMP hors image (shellcode) dont l’opérande gauche suit la
+    #    longueur de la saisie d’une sonde à l’autre (1 puis 2 octets), à même
+    #    rip et même borne
+    seen = []
+    for n in (1, 2):
+        emu.run(_probe(n) + b"\n")
+        seen.append([(rip, b) for rip, _, a, b in emu.cmp_log if not inside(rip) and a == n])
+    length = next((b for rip, b in seen[0] if (rip, b) in seen[1]), None)
+    if length is None:
+        raise EmuError("aucun CMP du shellcode ne compare la longueur de la saisie")
+
+    # 2) et 3) sonde : blocs reçus par check(), CMP octet à l’intérieur
+    calls = []
+
+    def on_check(e):
+        calls.append((e.R[RDI], len(e.cmp_log)))
+    emu.watch(code.start, on_check)
+    probe = _probe(length)
+    emu.run(probe + b"\n")
+    shellcode = next((emu.mem.read(dst, n) for dst, n in emu.copies
+                      if emu.mmap_top <= dst < MMAP_TOP), b"")
+    if not calls:
+        raise EmuError(f"{target}() jamais appelée avec une saisie de {length} octets")
+
+    buf, keystream, secret = bytearray(), bytearray(), bytearray()
+    bounds = [k for _, k in calls[1:]] + [len(emu.cmp_log)]
+    for (ptr, first), last in zip(calls, bounds):
+        cmps = [(a, b) for rip, size, a, b in emu.cmp_log[first:last] if rip in code and size == 1]
+        block = emu.mem.read(ptr, len(cmps))
+        for x, (a, b) in zip(block, cmps):
+            buf.append(x)
+            keystream.append(a ^ x)
+            secret.append(b)
+    if sorted(buf) != sorted(probe):
+        raise EmuError("les blocs reçus par check() ne sont pas une permutation de la saisie")
+    where = {x: j for j, x in enumerate(buf)}
+    perm = [where[x] for x in probe]
+    expected = bytes(k ^ s for k, s in zip(keystream, secret))
+    flag = bytes(expected[perm[i]] for i in range(length))
+
+    # 4) vérification par le binaire lui-même
+    del emu.watches[code.start]
+    emu.run(flag + b"\n")
+    output = emu.stdout.decode("latin-1")
+    checks = [a == b for rip, size, a, b in emu.cmp_log if rip in code and size == 1]
+    accepted = bool(checks) and all(checks)
+    return Extraction(length, perm, bytes(keystream), bytes(secret), expected,
+                      flag.decode("latin-1"), shellcode, accepted, output)
+
+
+# --- ligne de commande ---
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("binary", nargs="?", default="basic_shellcode")
+    ap.add_argument("--input", default=None, help="exécuter le binaire avec cette saisie")
+    ap.add_argument("--bench", type=int, default=0, metavar="N",
+                    help="N exécutions du binaire avec le flag trouvé")
+    args = ap.parse_args()
+
+    try:
+        elf = Elf(args.binary)
+        emu = Emulator(elf, cmp_log=True)
+        if args.input is not None:
+            rc = emu.run(args.input.encode("latin-1") + b"\n")
+            print(emu.stdout.decode("latin-1"), end="")
+            print(f"[•] code de retour {rc}, {emu.steps} instructions, {emu.decoded} blocs décodés")
+            raise SystemExit(0)
+
+        t = time.perf_counter()
+        res = extract(emu)
+    except EmuError as e:
+        raise SystemExit(f"❌  {args.binary} : {e}")
+    dt = time.perf_counter() - t
+    print(f"[+] Shellcode          : {len(res.shellcode)} octets")
+    print(f"[+] Longueur attendue  : {res.length}")
+    print(f"[+] Permutation        : {res.perm}")
+    print(f"[+] Clé (par position) : {res.keystream.hex()}")
+    print(f"[+] SECRET             : {res.secret.hex()}")
+    print(f"[+] Buffer attendu     : {res.expected.hex()}")
+    print(f"[+] Flag               : {res.flag}")
+    print(f"[{'✓' if res.ok else '✗'}] Sortie du binaire  : {res.output.strip()}")
+    print(f"⏱  relevé en {1000 * dt:.1f} ms, {emu.decoded} blocs décodés")
+    if args.bench:
+        emu.cmp_log = None
+        emu.blocks.clear()
+        emu.run(res.flag.encode("latin-1") + b"\n")     # cache rempli
+        t = time.perf_counter()
+        for _ in range(args.bench):
+            emu.run(res.flag.encode("latin-1") + b"\n")
+        dt = time.perf_counter() - t
+        print(f"⏱  {args.bench} exécutions en {dt:.3f} s → "
+              f"{1000 * dt / args.bench:.2f} ms/exécution")
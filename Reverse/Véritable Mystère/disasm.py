@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+disasm.py
+---------
+Désassembleur muNFU en colonnes : un seul passage sur un memoryview (bytes,
+bytearray, mmap… sans copie), quatre tableaux parallèles au lieu d’un tuple
+par instruction :
+
+    op[i], a[i], b[i]   array('B')  opcode et arguments (0 si absents)
+    off[i]              array('I')  offset de l’instruction dans le byte-code
+
+et, pour chaque opcode, la liste triée des indices où il apparaît
+(construite à la première requête, par bytes.find sur la colonne op). Les
+requêtes de solve_password deviennent des consultations d’index :
+
+    lst.where(53, 2)           indices des « XORI R2, … »
+    lst.between(194, 5, i, j)  « MOVI R5, bit » entre deux POP
+
+Le balayage est linéaire, comme disas() de solve_flag.py (les tailles
+d’arguments viennent de vm.OPCODES, opcode inconnu : sans argument).
+
+Usage :  python3 disasm.py VeritableMystere.py      (listing)
+"""
+
+import argparse, bisect, struct, sys
+from array import array
+
+from vm import OPCODES
+
+ARITY = bytes(OPCODES.get(op, ("?", 0))[1] for op in range(256))
+HEADER = struct.Struct("<4sI")      # magic, nombre d’instructions
+MAGIC = b"LST1"
+
+
+class Listing:
+    """Instructions décodées, en colonnes, avec index par opcode."""
+
+    def __init__(self, bc):
+        mv = memoryview(bc).cast("B")
+        self.op, self.a, self.b, self.off = array("B"), array("B"), array("B"), array("I")
+        self._raw, self._index, self._pairs = None, {}, {}
+        self._decode(mv)
+
+    def _decode(self, mv) -> None:
+        po, pa, pb, pf = self.op.append, self.a.append, self.b.append, self.off.append
+        arity, n, pc = ARITY, len(mv), 0
+        while pc < n:
+            op = mv[pc]
+            k = arity[op]
+            if pc + k >= n:
+                raise ValueError(f"offset {pc} : instruction {op} tronquée")
+            pf(pc)
+            po(op)
+            pa(mv[pc + 1] if k else 0)
+            pb(mv[pc + 2] if k > 1 else 0)
+            pc += 1 + k
+
+    # --- forme sérialisée (layercache.py) ---
+    def to_bytes(self) -> bytes:
+        """En-tête puis colonnes op, a, b (n octets) et off (4n octets, petit-boutiste)."""
+        off = array("I", self.off)
+        if sys.byteorder == "big":
+            off.byteswap()
+        return b"".join((HEADER.pack(MAGIC, len(self)), self.op.tobytes(),
+                         self.a.tobytes(), self.b.tobytes(), off.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "Listing":
+        magic, n = HEADER.unpack_from(blob)
+        if magic != MAGIC or len(blob) != HEADER.size + 7 * n:
+            raise ValueError("listing sérialisé invalide")
+        lst = cls(b"")
+        mv, p = memoryview(blob), HEADER.size
+        for col in (lst.op, lst.a, lst.b):
+            col.frombytes(mv[p:p + n])
+            p += n
+        lst.off.frombytes(mv[p:])
+        if sys.byteorder == "big":
+            lst.off.byteswap()
+        return lst
+
+    def __len__(self) -> int:
+        return len(self.op)
+
+    def __getitem__(self, i: int) -> tuple:
+        """Instruction i sous la forme de disas() : (op,), (op, a) ou (op, a, b)."""
+        op = self.op[i]
+        return (op, self.a[i], self.b[i])[:1 + ARITY[op]]
+
+    def where(self, op: int, a: int = None) -> array:
+        """Indices (triés) des instructions `op`, ou `op a` si a est donné."""
+        if a is None:
+            pos = self._index.get(op)
+            if pos is None:                         # construit à la première requête
+                if self._raw is None:
+                    self._raw = self.op.tobytes()
+                find = self._raw.find
+                pos, i = array("I"), find(op)
+                while i >= 0:
+                    pos.append(i)
+                    i = find(op, i + 1)
+                self._index[op] = pos
+            return pos
+        key = (op, a)
+        pos = self._pairs.get(key)
+        if pos is None:
+            As = self.a
+            pos = self._pairs[key] = array("I", (i for i in self.where(op) if As[i] == a))
+        return pos
+
+    def between(self, op: int, a: int, start: int, stop: int) -> array:
+        """Indices des `op a` dans [start, stop[, par dichotomie sur l’index."""
+        pos = self.where(op, a)
+        return pos[bisect.bisect_left(pos, start):bisect.bisect_left(pos, stop)]
+
+
+# --- ligne de commande ---
+if __name__ == "__main__":
+    from solve_flag import extract_bytecode
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("file", help="VeritableMystere.py")
+    args = ap.parse_args()
+
+    lst = Listing(extract_bytecode(args.file))
+    for i in range(len(lst)):
+        op = lst.op[i]
+        name, k = OPCODES.get(op, (f"?{op}", 0))
+        print(f"{lst.off[i]:06x}  {name:<5} " + ", ".join(str(x) for x in (lst.a[i], lst.b[i])[:k]))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+layercache.py
+-------------
+Cache adressé par contenu des couches décodées d’un challenge obfusqué.
+
+Chaque couche (source externe, source interne, byte-code, listing…) est un
+objet identifié par le SHA-256 de son contenu et stocké compressé (zlib)
+sous objects/ab/cdef… ; chaque étape de décodage est une référence
+
+    refs/<étape>/<sha256 de l’entrée>  →  sha256 de la sortie
+
+Une analyse répétée ne fait donc que hacher le fichier d’entrée et suivre
+les références, sans relire ni décoder les couches intermédiaires ; deux
+échantillons qui partagent une couche (même source interne, même byte-code)
+ne la décodent qu’une fois. Les écritures passent par un fichier temporaire
+puis os.replace : plusieurs processus peuvent partager le même dossier.
+
+Usage :  python3 layercache.py DOSSIER        (état du cache)
+"""
+
+import argparse, hashlib, os, tempfile, zlib
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class LayerCache:
+    """Objets et références d’étapes de décodage dans `directory`."""
+
+    def __init__(self, directory: str, level: int = 6):
+        self.directory, self.level = directory, level
+        self.hits = self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # --- fichiers ---
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _object(self, key: str) -> str:
+        return os.path.join(self.directory, "objects", key[:2], key[2:])
+
+    def _ref(self, step: str, key: str) -> str:
+        return os.path.join(self.directory, "refs", step, key)
+
+    # --- objets ---
+    def put(self, data: bytes) -> str:
+        """Stocke `data` (si absent) et renvoie son SHA-256."""
+        key = digest(data)
+        path = self._object(key)
+        if not os.path.exists(path):
+            self._write(path, zlib.compress(data, self.level))
+        return key
+
+    def get(self, key: str) -> bytes:
+        with open(self._object(key), "rb") as f:
+            return zlib.decompress(f.read())
+
+    # --- étapes ---
+    def layer(self, step: str, key: str, compute) -> str:
+        """SHA-256 de la sortie de `step` pour l’entrée `key` ; compute() si inconnue."""
+        ref = self._ref(step, key)
+        try:
+            with open(ref) as f:
+                out = f.read().strip()
+            if os.path.exists(self._object(out)):
+                self.hits += 1
+                return out
+        except FileNotFoundError:
+            pass
+        self.misses += 1
+        out = self.put(compute())
+        self._write(ref, out.encode())
+        return out
+
+    def stats(self) -> dict:
+        objects = size = 0
+        for root, _, files in os.walk(os.path.join(self.directory, "objects")):
+            for name in files:
+                objects += 1
+                size += os.path.getsize(os.path.join(root, name))
+        refs = {}
+        top = os.path.join(self.directory, "refs")
+        if os.path.isdir(top):
+            refs = {s: len(os.listdir(os.path.join(top, s))) for s in sorted(os.listdir(top))}
+        return {"objects": objects, "bytes": size, "refs": refs}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("directory")
+    args = ap.parse_args()
+    st = LayerCache(args.directory).stats()
+    print(f"{st['objects']} objet(s), {st['bytes']} octets compressés")
+    for step, n in st["refs"].items():
+        print(f"  {step:<10} {n} référence(s)")
@@ -7,59 +7,74 @@ Usage
 -----
     python3 solve_flag.py VeritableMystere.py       -> affiche le flag
     python3 solve_flag.py VeritableMystere.py -r    -> vérifie en lançant le challenge
+    python3 solve_flag.py VeritableMystere.py --cache DOSSIER
+                                                    -> couches décodées mises en cache
 
 L’option -r (–run) sert uniquement à montrer le « Mot de passe valide ! » du
 script original ; elle est sans incidence sur le calcul du mot de passe.
 """
 
-import re, bz2, base64, sys, importlib.util, builtins, argparse
+import argparse
 from typing import List
 
+from disasm import Listing      # désassembleur en colonnes
+from layercache import LayerCache   # couches décodées, adressées par SHA-256
+from unwrap import payload, unwrap  # désobfuscation par ast, sans exécution
+from verify_pool import VerifyPool  # challenge original, en processus ouvrier
+from vm import Machine          # émulateur muNFU pré-décodé
+
 # --------------------------------------------------------------------------- #
 # 1)  Extraction du byte-code brut                                           #
 # --------------------------------------------------------------------------- #
-def extract_bytecode(chall_path: str) -> bytes:
-    src = open(chall_path, encoding="utf-8").read()
+def unwrap_outer(src: bytes) -> bytes:
+    """Couche externe → dernière couche source (exec/eval de décodeurs, voir unwrap.py)."""
+    layers = [l for l in unwrap(src) if l.source is not None]
+    return layers[-1].source.encode("utf-8")
 
-    # chaîne base64 → bz2
-    b64  = re.search(r"b64decode\('([^']+)'\)", src).group(1)
-    inner = bz2.decompress(base64.b64decode(b64))
+def bytecode_literal(inner: bytes) -> bytes:
+    """Source interne → byte-code : littéral b'…' passé à muNFU(…), sans eval."""
+    return payload(unwrap(inner))
 
-    # littéral b'…' passé à muNFU(…)
-    blob = re.search(rb"muNFU\(\s*b['\"]([^'\"]+)['\"]\s*\)", inner, re.S).group(1)
-    return eval(b"b'" + blob + b"'")
+def extract_bytecode(chall_path: str) -> bytes:
+    with open(chall_path, "rb") as f:
+        return bytecode_literal(unwrap_outer(f.read()))
+
+def load(chall_path: str, cache_dir: str = None):
+    """(byte-code, Listing), via le cache de couches si `cache_dir` est donné."""
+    if cache_dir is None:
+        bc = extract_bytecode(chall_path)
+        return bc, Listing(bc)
+    cache = LayerCache(cache_dir)
+    with open(chall_path, "rb") as f:
+        outer = cache.put(f.read())
+    inner = cache.layer("inner", outer, lambda: unwrap_outer(cache.get(outer)))
+    code = cache.layer("bytecode", inner, lambda: bytecode_literal(cache.get(inner)))
+    listing = cache.layer("listing", code, lambda: Listing(cache.get(code)).to_bytes())
+    return cache.get(code), Listing.from_bytes(cache.get(listing))
 
 # --------------------------------------------------------------------------- #
-# 2)  Désassembleur minimal (opcodes utiles)                                 #
+# 2)  Désassembleur en colonnes (voir disasm.py)                             #
 # --------------------------------------------------------------------------- #
 def disas(bc: bytes) -> List[tuple]:
-    pc, out = 0, []
-    while pc < len(bc):
-        op = bc[pc]; pc += 1
-        if op in (194, 145, 216, 30, 126, 97, 201, 53):   # 2 octets d’args
-            a, b = bc[pc], bc[pc+1]; pc += 2; out.append((op, a, b))
-        elif op in (205, 115, 120, 65, 195, 16):          # 1 octet
-            a = bc[pc]; pc += 1;       out.append((op, a))
-        else:                                             # opcode 166
-            out.append((op,))
-    return out
+    """Listing sous forme de tuples (op,), (op, a) ou (op, a, b)."""
+    lst = Listing(bc)
+    return [lst[i] for i in range(len(lst))]
 
 # --------------------------------------------------------------------------- #
 # 3)  Reconstruction du mot de passe (32 octets)                              #
 # --------------------------------------------------------------------------- #
-def solve_password(bc: bytes) -> str:
-    ops = disas(bc)
+def solve_password(bc: bytes, lst: Listing = None) -> str:
+    lst = lst or Listing(bc)
 
     # 3-a  constantes XOR poussées dans R2 : 53 02 <const>
-    xor_consts = [o[2] for o in ops if o[:2] == (53, 2)][:32]
+    xor_consts = [lst.b[i] for i in lst.where(53, 2)[:32]]
 
     # 3-b  blocs de bits attendus après chaque POP 115 02
-    pops = [i for i, o in enumerate(ops) if o[0] == 115][:32]
+    pops = lst.where(115)[:32]
     blocks = []
     for i in range(32):
-        start, stop = pops[i], pops[i+1] if i+1 < 32 else len(ops)
-        bits = [o[2] for o in ops[start:stop] if o[:2] == (194, 5)]
-        blocks.append(bits)
+        start, stop = pops[i], pops[i+1] if i+1 < 32 else len(lst)
+        blocks.append([lst.b[j] for j in lst.between(194, 5, start, stop)])
     blocks.reverse()                                      # pile LIFO → ordre naturel
 
     # 3-c  bits (LSB→MSB) → octets clairs
@@ -74,13 +89,13 @@ def solve_password(bc: bytes) -> str:
 # 4)  (optionnel) : exécute le challenge avec le bon mot de passe            #
 # --------------------------------------------------------------------------- #
 def run_original(chall_path: str, password: str):
-    old_input = builtins.input
-    builtins.input = lambda _='': password        # réponse automatique
-
-    spec = importlib.util.spec_from_file_location("vm_mod", chall_path)
-    mod  = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)                  # déclenche l’affichage
-    builtins.input = old_input
+    """Fait juger `password` par le challenge, dans un processus isolé (verify_pool.py)."""
+    with VerifyPool(chall_path, workers=1) as pool:
+        pool.check(password)
+    for _, reason in pool.failures:
+        print(f"[!] {reason}")
+    for line in pool.outputs[0]:        # ce que le challenge lui-même a affiché
+        print(line)
 
 # --------------------------------------------------------------------------- #
 # 5)  Point d’entrée                                                          #
@@ -90,12 +105,16 @@ if __name__ == "__main__":
     ap.add_argument("file", help="VeritableMystere.py")
     ap.add_argument("-r", "--run", action="store_true",
                     help="lancer aussi le challenge pour vérifier")
+    ap.add_argument("--cache", metavar="DOSSIER", default=None,
+                    help="cache des couches décodées (voir layercache.py)")
     args = ap.parse_args()
 
-    bytecode = extract_bytecode(args.file)
-    flag     = solve_password(bytecode)
+    bytecode, listing = load(args.file, args.cache)
+    flag     = solve_password(bytecode, listing)
 
     print(f"[+] Mot de passe trouvé : {flag}")
+    verdict = "valide" if Machine(bytecode).check(flag) else "INVALIDE"
+    print(f"[+] Émulateur muNFU : mot de passe {verdict}")
 
     if args.run:
         print("\n[•] Vérification dans le binaire original :")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+unwrap.py
+---------
+Désobfuscation statique des chaînes exec(bz2(b64(…))) de profondeur
+quelconque, sans exécuter le code du challenge.
+
+Chaque couche est analysée avec ast. Un appel exec / eval / compile dont
+l’argument est une composition de décodeurs connus appliqués à des
+littéraux
+
+    base64 (b64/b32/b16/b85/a85/urlsafe), bz2, zlib, gzip, lzma, marshal,
+    bytes.fromhex, .decode() / .encode(), concaténation +
+
+est évalué par un interprète restreint à ces fonctions. Le résultat devient
+la couche suivante : source (analysée à son tour) ou objet code
+(marshal.loads, terminal). Les alias d’import (import x as y, from x
+import f, __import__('x')) et les renommages à la muNFU (X = exec,
+P = '…') sont suivis. Les décompressions sont bornées (MAX_LAYER), l’entrée
+de marshal.loads aussi (MAX_MARSHAL) et la profondeur limitée (MAX_DEPTH).
+
+Les littéraux octets de la dernière couche sont extraits avec
+ast.literal_eval (ou pris dans co_consts pour un objet code). payload()
+retient celui passé à une classe définie dans cette couche (muNFU(b'…')),
+à défaut le plus long.
+
+Usage :  python3 unwrap.py CHEMIN… [--workers N] [-o resultats.jsonl]
+         (dossiers parcourus récursivement, *.py, une ligne JSON par fichier)
+"""
+
+import argparse, ast, base64, bz2, hashlib, itertools, json, lzma, marshal, os, sys, types, zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple, Optional
+
+MAX_DEPTH = 64
+MAX_LAYER = 64 << 20                # octets décompressés par couche
+MAX_MARSHAL = 16 << 20              # octets passés à marshal.loads
+
+SINKS = {"exec", "eval", "compile", "builtins.exec", "builtins.eval", "builtins.compile"}
+
+
+class UnwrapError(ValueError):
+    pass
+
+
+class Undecodable(UnwrapError):
+    """Argument d’exec/eval hors de l’interprète restreint (exec(input()), …)."""
+
+
+class Layer(NamedTuple):
+    depth: int
+    via: tuple                      # décodeurs appliqués pour obtenir la couche
+    source: Optional[str]           # texte Python…
+    code: Optional[types.CodeType]  # …ou objet code (marshal)
+
+
+# --- décodeurs autorisés ---
+def _bounded(factory):
+    def decompress(data, *args):
+        out = factory(*args).decompress(data, MAX_LAYER + 1)
+        if len(out) > MAX_LAYER:
+            raise UnwrapError(f"couche décompressée > {MAX_LAYER} octets")
+        return out
+    return decompress
+
+
+def _marshal(data):
+    if len(data) > MAX_MARSHAL:
+        raise UnwrapError(f"entrée de marshal.loads > {MAX_MARSHAL} octets")
+    obj = marshal.loads(data)
+    if not isinstance(obj, (types.CodeType, bytes, str)):
+        raise UnwrapError(f"marshal.loads → {type(obj).__name__}")
+    return obj
+
+
+DECODERS = {
+    "base64.b64decode": base64.b64decode, "base64.standard_b64decode": base64.standard_b64decode,
+    "base64.urlsafe_b64decode": base64.urlsafe_b64decode, "base64.decodebytes": base64.decodebytes,
+    "base64.b32decode": base64.b32decode, "base64.b16decode": base64.b16decode,
+    "base64.b85decode": base64.b85decode, "base64.a85decode": base64.a85decode,
+    "bz2.decompress": _bounded(bz2.BZ2Decompressor),
+    "zlib.decompress": _bounded(zlib.decompressobj),
+    "gzip.decompress": _bounded(lambda: zlib.decompressobj(31)),
+    "lzma.decompress": _bounded(lzma.LZMADecompressor),
+    "marshal.loads": _marshal,
+    "bytes.fromhex": bytes.fromhex,
+}
+METHODS = {"decode": (bytes,), "encode": (str,)}
+
+
+# --- une couche ---
+class _Scope:
+    """Alias et constantes d’une couche, puis évaluation restreinte."""
+
+    def __init__(self, tree: ast.AST):
+        self.alias, self.consts, self.classes = {}, {}, set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for a in node.names:
+                    self.alias[a.asname or a.name.split(".")[0]] = a.name if a.asname else a.name.split(".")[0]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                for a in node.names:
+                    self.alias[a.asname or a.name] = f"{node.module}.{a.name}"
+            elif isinstance(node, ast.ClassDef):
+                self.classes.add(node.name)
+        for node in ast.walk(tree):                 # X = exec, P = '…' (ordre du source)
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                    and isinstance(node.targets[0], ast.Name):
+                name, value = node.targets[0].id, node.value
+                if isinstance(value, ast.Constant) and isinstance(value.value, (str, bytes)):
+                    self.consts[name] = value.value
+                else:
+                    target = self.dotted(value)
+                    if target is not None:
+                        self.alias[name] = target
+
+    def dotted(self, node) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return self.alias.get(node.id, node.id)
+        if isinstance(node, ast.Attribute):
+            base = self.dotted(node.value)
+            return None if base is None else f"{base}.{node.attr}"
+        if isinstance(node, ast.Call) and self.dotted(node.func) == "__import__" \
+                and node.args and isinstance(node.args[0], ast.Constant):
+            return node.args[0].value
+        return None
+
+    def value(self, node, via: list):
+        """Valeur de `node` si elle ne dépend que de littéraux et de DECODERS."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes, int)):
+            return node.value
+        if isinstance(node, ast.Name) and node.id in self.consts:
+            return self.consts[node.id]
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left, right = self.value(node.left, via), self.value(node.right, via)
+            if type(left) is not type(right) or not isinstance(left, (str, bytes)):
+                raise UnwrapError(f"ligne {node.lineno} : concaténation "
+                                  f"{type(left).__name__} + {type(right).__name__}")
+            return left + right
+        if isinstance(node, ast.Call):
+            args = [self.value(a, via) for a in node.args]
+            f = node.func
+            if isinstance(f, ast.Attribute) and f.attr in METHODS \
+                    and self.dotted(f) not in DECODERS:
+                obj = self.value(f.value, via)
+                if isinstance(obj, METHODS[f.attr]):
+                    via.append(f".{f.attr}")
+                    try:
+                        return getattr(obj, f.attr)(*args)
+                    except (LookupError, ValueError, TypeError) as e:
+                        raise UnwrapError(f".{f.attr} : {e}") from None
+            name = self.dotted(f)
+            if name in DECODERS:
+                via.append(name)
+                try:
+                    return DECODERS[name](*args)
+                except UnwrapError:
+                    raise
+                except Exception as e:
+                    raise UnwrapError(f"{name} : {e}") from None
+            if name in SINKS and name.endswith("compile") and args:
+                return args[0]                      # exec(compile(x, …)) : x
+        raise Undecodable(f"ligne {getattr(node, 'lineno', '?')} : expression non décodable "
+                          f"({type(node).__name__})")
+
+    def payloads(self, tree):
+        """(valeur, décodeurs) pour chaque exec/eval/compile décodable."""
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and node.args and self.dotted(node.func) in SINKS:
+                via = []
+                try:
+                    data = self.value(node.args[0], via)
+                except Undecodable:
+                    continue                        # les erreurs de décodage remontent
+                if isinstance(data, (str, bytes, types.CodeType)):
+                    yield data, tuple(via)          # exec(1) : rien à dérouler
+
+
+def unwrap(src, max_depth: int = MAX_DEPTH) -> list:
+    """Couches successives de `src` (la couche 0 est `src` lui-même)."""
+    if isinstance(src, bytes):
+        src = src.decode("utf-8")
+    layers = [Layer(0, (), src, None)]
+    while layers[-1].source is not None:
+        cur = layers[-1]
+        tree = ast.parse(cur.source)
+        found = next(_Scope(tree).payloads(tree), None)
+        if found is None:
+            break
+        if cur.depth >= max_depth:
+            raise UnwrapError(f"plus de {max_depth} couches")
+        data, via = found
+        if isinstance(data, types.CodeType):
+            layers.append(Layer(cur.depth + 1, via, None, data))
+        else:
+            text = data.decode("utf-8") if isinstance(data, bytes) else data
+            layers.append(Layer(cur.depth + 1, via, text, None))
+    return layers
+
+
+# --- littéraux de la dernière couche ---
+def _code_bytes(code):
+    for c in code.co_consts:
+        if isinstance(c, bytes):
+            yield c
+        elif isinstance(c, types.CodeType):
+            yield from _code_bytes(c)
+
+
+def byte_literals(layer: Layer) -> list:
+    """[(appelé, octets)] : littéraux bytes passés en argument d’un appel."""
+    if layer.code is not None:
+        return [("?", b) for b in _code_bytes(layer.code)]
+    tree = ast.parse(layer.source)
+    scope, out = _Scope(tree), []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            for arg in node.args:
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, bytes):
+                    out.append((scope.dotted(node.func) or "?", ast.literal_eval(arg)))
+    return out
+
+
+def payload(layers: list) -> bytes:
+    """Octets passés à une classe de la dernière couche (le byte-code d’une VM)."""
+    last = layers[-1]
+    found = byte_literals(last)
+    if not found:
+        raise UnwrapError("aucun littéral octets dans la dernière couche")
+    classes = _Scope(ast.parse(last.source)).classes if last.source is not None else set()
+    vm = [b for callee, b in found if callee in classes]
+    return max(vm or [b for _, b in found], key=len)
+
+
+# --- lot de fichiers, en parallèle ---
+def scan(path: str) -> dict:
+    """Résumé JSON d’un échantillon : couches, littéraux, ou erreur."""
+    out = {"file": path}
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        out["sha256"] = hashlib.sha256(raw).hexdigest()
+        layers = unwrap(raw)
+        out["depth"] = layers[-1].depth
+        out["via"] = [" → ".join(l.via) for l in layers[1:]]
+        out["literals"] = [[callee, len(b), hashlib.sha256(b).hexdigest()[:16]]
+                           for callee, b in byte_literals(layers[-1])]
+        out["payload"] = len(payload(layers))
+    except (UnwrapError, SyntaxError, UnicodeDecodeError, OSError,
+            TypeError, ValueError, RecursionError, MemoryError) as e:
+        out["error"] = f"{type(e).__name__}: {e}"[:500]   # n’échoue que cet échantillon
+    return out
+
+
+def iter_files(paths):
+    for p in paths:
+        if os.path.isdir(p):
+            for root, dirs, files in os.walk(p):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(".py"):
+                        yield os.path.join(root, name)
+        else:
+            yield p
+
+
+def _scan_alone(path: str) -> dict:
+    """scan() dans un processus à lui : sa mort n’emporte que cet échantillon."""
+    with ProcessPoolExecutor(1) as ex:
+        try:
+            return ex.submit(scan, path).result()
+        except BrokenProcessPool as e:
+            return {"file": path, "error": f"BrokenProcessPool: processus d’analyse mort "
+                                          f"(plantage de l’interprète ou OOM) — {e}"[:500]}
+
+
+def scan_all(paths, workers: int = None):
+    """
+    Résumés des fichiers (dossiers parcourus), au fil de l’eau, dans le désordre.
+
+    Un processus qui meurt (marshal.loads qui plante l’interprète, OOM killer)
+    casse tout le pool : les échantillons alors en cours sont mis de côté, le
+    pool est recréé pour la suite, puis chacun des suspects est relancé seul
+    (_scan_alone) — seul le fautif finit en erreur, rien ne reste bloqué.
+    """
+    files = iter(iter_files(paths))
+    window = 4 * (workers or os.cpu_count() or 1)     # échantillons en vol
+    suspects, broken = [], True
+    while broken:
+        broken = False
+        with ProcessPoolExecutor(workers) as ex:
+            running = {ex.submit(scan, p): p for p in itertools.islice(files, window)}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    path = running.pop(fut)
+                    try:
+                        yield fut.result()
+                    except BrokenProcessPool:
+                        suspects.append(path)
+                        broken = True
+                if not broken:
+                    for p in itertools.islice(files, len(done)):
+                        running[ex.submit(scan, p)] = p
+    for path in suspects:
+        yield _scan_alone(path)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="+", help="fichiers ou dossiers d’échantillons")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("-o", "--out", default=None, help="fichier JSON lines (sinon stdout)")
+    args = ap.parse_args()
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    n = errors = 0
+    try:
+        for res in scan_all(args.paths, args.workers):
+            out.write(json.dumps(res, ensure_ascii=False) + "\n")
+            n += 1
+            errors += "error" in res
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"✅  {n} échantillon(s) analysé(s), {errors} en erreur", file=sys.stderr)
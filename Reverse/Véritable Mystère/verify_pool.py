@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+verify_pool.py
+--------------
+Vérification de mots de passe candidats par le challenge original, dans des
+processus ouvriers gardés au chaud.
+
+Chaque ouvrier décode une fois le challenge (unwrap.py) et compile sa
+dernière couche ; pour chaque candidat reçu sur stdin (une ligne), il
+ré-exécute ce code avec input() et print() remplacés dans ses builtins,
+puis répond une ligne :
+
+    1 […]  « Mot de passe valide » affiché      0 […]  sinon
+    E …    exception levée par le challenge
+
+[…] est la liste JSON des lignes que le challenge a affichées (print),
+rendue par VerifyPool dans `outputs`. Un candidat est une ligne : s’il
+contient un saut de ligne (input() n’en lirait que le début) ou n’est pas
+encodable, map() le refuse (None, raison dans `failures`) au lieu de
+désynchroniser réponses et candidats.
+
+Le canal de réponse est une copie privée de stdout : le fd 1 de l’ouvrier
+est redirigé vers stderr, une écriture parasite du challenge ne peut pas
+corrompre le protocole.
+
+Côté parent, VerifyPool envoie les candidats par lots à plusieurs ouvriers
+et lit les réponses avec selectors. Un ouvrier qui dépasse `timeout` pour
+un candidat est tué et remplacé, un ouvrier qui meurt aussi : le candidat
+en cours (comme celui qui lève une exception) est marqué None, la raison
+dans `failures`, et le reste de son lot repart vers un ouvrier neuf.
+
+Usage :  python3 verify_pool.py VeritableMystere.py [CANDIDATS|-] [--workers N]
+         python3 verify_pool.py VeritableMystere.py --bench 2000
+"""
+
+import argparse, builtins, collections, json, os, selectors, subprocess, sys, time
+
+VALID = "Mot de passe valide"
+TIMEOUT = 5.0                       # secondes par candidat
+STARTUP = 30.0                      # décodage du challenge par l’ouvrier
+BATCH = 64
+
+
+# --- côté ouvrier ---
+def _worker(path: str) -> None:
+    from unwrap import unwrap
+
+    proto = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)                                   # sorties du challenge → stderr
+    with open(path, "rb") as f:
+        last = unwrap(f.read())[-1]
+    code = last.code if last.code is not None else compile(last.source, path, "exec")
+
+    cell, said = [""], []
+    sandbox = dict(vars(builtins))
+    sandbox["input"] = lambda prompt="": cell[0]
+    sandbox["print"] = lambda *a, **kw: said.append(" ".join(map(str, a)))
+
+    proto.write(b"R\n")
+    proto.flush()
+    for line in sys.stdin.buffer:
+        cell[0] = line.rstrip(b"\n").decode("utf-8", "surrogateescape")
+        said.clear()
+        try:
+            exec(code, {"__builtins__": sandbox, "__name__": "__main__"})
+            reply = (b"1 " if any(VALID in s for s in said) else b"0 ") \
+                + json.dumps(said).encode()
+        except Exception as e:
+            reply = b"E " + f"{type(e).__name__}: {e}".encode("utf-8", "replace").replace(b"\n", b" ")
+        proto.write(reply + b"\n")
+        proto.flush()
+
+
+# --- côté parent ---
+class _Worker:
+    def __init__(self, path: str):
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.fd = self.proc.stdout.fileno()
+        self.ready, self.buf, self.pending = False, b"", collections.deque()
+        self.deadline = time.monotonic() + STARTUP
+
+    def send(self, batch, timeout: float) -> None:
+        self.pending.extend(batch)
+        try:
+            self.proc.stdin.write(b"".join(c.encode("utf-8", "surrogateescape") + b"\n"
+                                           for _, c in batch))
+            self.proc.stdin.flush()
+        except BrokenPipeError:
+            pass                                    # fin de fichier vue par select
+        if self.ready:
+            self.deadline = time.monotonic() + timeout
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.wait()
+        for f in (self.proc.stdin, self.proc.stdout):
+            try:
+                f.close()
+            except OSError:
+                pass
+
+
+class VerifyPool:
+    """Ouvriers chauds exécutant le challenge `path` pour chaque candidat."""
+
+    def __init__(self, path: str, workers: int = None, batch: int = BATCH,
+                 timeout: float = TIMEOUT):
+        self.path = os.path.abspath(path)
+        self.batch, self.timeout = batch, timeout
+        self.failures = []                          # (candidat, raison)
+        self.outputs = []                           # lignes affichées, par candidat
+        self.sel = selectors.DefaultSelector()
+        self.workers = [self._spawn() for _ in range(workers or os.cpu_count() or 1)]
+
+    def _spawn(self) -> _Worker:
+        w = _Worker(self.path)
+        self.sel.register(w.fd, selectors.EVENT_READ, w)
+        return w
+
+    def _replace(self, w: _Worker, reason: str, results, queue) -> None:
+        """Tue `w`, marque son candidat en cours, remet le reste en file."""
+        self.sel.unregister(w.fd)
+        w.kill()
+        reason = reason or f"ouvrier mort, code de sortie {w.proc.returncode}"
+        if not w.ready:
+            raise RuntimeError(f"ouvrier mort au démarrage ({reason}) : {self.path}")
+        if w.pending:
+            i, cand = w.pending.popleft()
+            results[i] = None
+            self.failures.append((cand, reason))
+            queue.extendleft(reversed(w.pending))
+        self.workers[self.workers.index(w)] = self._spawn()
+
+    def map(self, candidates) -> list:
+        """Verdict par candidat : True / False, None en cas d’exception, de délai
+        dépassé ou d’ouvrier mort (raison dans `failures`)."""
+        candidates = list(candidates)
+        results = [None] * len(candidates)
+        self.outputs = [[] for _ in candidates]
+        queue = collections.deque()
+        for i, cand in enumerate(candidates):
+            try:
+                cand.encode("utf-8", "surrogateescape")
+            except UnicodeEncodeError as e:
+                self.failures.append((cand, f"candidat non encodable : {e}"))
+                continue
+            if "\n" in cand:
+                self.failures.append((cand, "saut de ligne dans le candidat"))
+                continue
+            queue.append((i, cand))
+        left = len(queue)
+        while left:
+            for w in self.workers:
+                if not w.pending and queue:
+                    w.send([queue.popleft() for _ in range(min(self.batch, len(queue)))],
+                           self.timeout)
+            now = time.monotonic()
+            wait = max(0.0, min((w.deadline for w in self.workers if w.pending or not w.ready),
+                                default=now + self.timeout) - now)
+            for key, _ in self.sel.select(wait):
+                w = key.data
+                data = os.read(w.fd, 1 << 16)
+                if not data:
+                    left -= bool(w.pending)
+                    self._replace(w, None, results, queue)
+                    continue
+                *lines, w.buf = (w.buf + data).split(b"\n")
+                for line in lines:
+                    if line == b"R":
+                        w.ready = True
+                    else:
+                        i, cand = w.pending.popleft()
+                        if line.startswith(b"E "):
+                            self.failures.append((cand, line[2:].decode("utf-8", "replace")))
+                            results[i] = None
+                        else:
+                            results[i] = line[:1] == b"1"
+                            self.outputs[i] = json.loads(line[2:] or b"[]")
+                        left -= 1
+                    w.deadline = time.monotonic() + (self.timeout if w.ready else STARTUP)
+            now = time.monotonic()
+            for w in list(self.workers):
+                if (w.pending or not w.ready) and now > w.deadline:
+                    left -= bool(w.pending)
+                    self._replace(w, "délai dépassé", results, queue)
+        return results
+
+    def check(self, password: str) -> bool:
+        return bool(self.map([password])[0])
+
+    def close(self) -> None:
+        for w in self.workers:
+            self.sel.unregister(w.fd)
+            try:
+                w.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            w.proc.wait()
+            w.proc.stdout.close()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- ligne de commande ---
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        _worker(sys.argv[2])
+        sys.exit(0)
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("file", help="VeritableMystere.py")
+    ap.add_argument("candidates", nargs="?", default="-",
+                    help="un mot de passe par ligne (- : stdin)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--batch", type=int, default=BATCH)
+    ap.add_argument("--timeout", type=float, default=TIMEOUT)
+    ap.add_argument("--bench", type=int, default=0, metavar="N",
+                    help="N candidats aléatoires, débit affiché")
+    args = ap.parse_args()
+
+    if args.bench:
+        import random, string
+        rng = random.Random(0)
+        cands = ["".join(rng.choice(string.printable[:94]) for _ in range(32))
+                 for _ in range(args.bench)]
+    else:
+        fd = sys.stdin if args.candidates == "-" else open(args.candidates, encoding="utf-8")
+        cands = [line.rstrip("\n") for line in fd]
+
+    with VerifyPool(args.file, args.workers, args.batch, args.timeout) as pool:
+        t = time.perf_counter()
+        verdicts = pool.map(cands)
+        dt = time.perf_counter() - t
+    for cand, ok in zip(cands, verdicts):
+        if ok:
+            print(f"[+] Mot de passe valide : {cand}")
+    for cand, reason in pool.failures:
+        print(f"[!] {cand!r} : {reason}", file=sys.stderr)
+    print(f"⏱  {len(cands)} candidat(s) en {dt:.3f} s → {len(cands) / dt:,.0f} /s",
+          file=sys.stderr)
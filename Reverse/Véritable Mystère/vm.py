@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vm.py
+-----
+Émulateur de la machine virtuelle muNFU de « Véritable Mystère ».
+
+Sémantique relevée dans la couche décodée du challenge (classe muNFU) :
+8 registres, une pile, deux drapeaux posés par CMP ; le mot de passe est
+valide si R0 vaut 0 à l’arrêt. Un opcode lu hors du byte-code termine en
+« invalide » (le try/except de muNFx), les autres erreurs remontent.
+
+    op   mnémonique  effet                          op   mnémonique  effet
+    194  MOVI r i    R[r] = i                       205  INPUT r     R[r] = input()
+    126  MOV  r s    R[r] = R[s]                    120  PUSH r      pile ← R[r]
+    145  ADDI r i    R[r] += i                      115  POP  r      R[r] ← pile (0 si vide)
+     34  ADD  r s    R[r] += R[s]                   195  JMP  n      pc = n
+     53  XORI r i    R[r] = int(R[r]) ^ i            16  JE   n      pc = n si égal
+     97  SHRI r i    R[r] >>= i                      65  SKE  n      pc += 1 + n si égal
+    216  ANDI r i    R[r] &= i                      166  HALT
+     30  GETC r s    R[r] = ord(R[s][0]), R[s] = R[s][1:]  (0 si R[s] vide)
+    201  CMP  a b    égal / inférieur selon R[a] ? R[b]
+
+Au lieu de relire les octets à chaque pas, Machine décode une fois, pour
+chaque offset du byte-code (les sauts peuvent viser le milieu d’une
+instruction), un tuple (gestionnaire, a, b, offset suivant). La boucle
+d’exécution se réduit à :
+
+    fn, a, b, nxt = prog[pc]
+    pc = fn(a, b, nxt)
+
+Les gestionnaires sont des fermetures sur les registres, la pile et les
+drapeaux de la machine, réinitialisés à chaque run() : une même Machine
+teste des milliers de candidats sans rien redécoder.
+
+Usage :  python3 vm.py VeritableMystere.py MOT_DE_PASSE [--bench N]
+"""
+
+import argparse, itertools, time
+
+# --- jeu d’instructions : opcode → (mnémonique, nombre d’octets d’arguments) ---
+OPCODES = {
+    194: ("MOVI", 2), 126: ("MOV", 2), 145: ("ADDI", 2), 34: ("ADD", 2),
+    53: ("XORI", 2), 97: ("SHRI", 2), 216: ("ANDI", 2), 30: ("GETC", 2),
+    201: ("CMP", 2),
+    205: ("INPUT", 1), 120: ("PUSH", 1), 115: ("POP", 1), 195: ("JMP", 1),
+    16: ("JE", 1), 65: ("SKE", 1),
+    166: ("HALT", 0),
+}
+NREGS = 8
+HALT, FAULT = -1, -2                # pc rendus par HALT / lecture hors byte-code
+MAX_STEPS = 1_000_000
+
+
+class VMError(RuntimeError):
+    pass
+
+
+def _handlers(R, F, S, box):
+    """Gestionnaires des opcodes, liés à l’état d’une machine."""
+
+    def movi(a, b, nxt):
+        R[a] = b
+        return nxt
+
+    def mov(a, b, nxt):
+        R[a] = R[b]
+        return nxt
+
+    def addi(a, b, nxt):
+        R[a] += b
+        return nxt
+
+    def add(a, b, nxt):
+        R[a] += R[b]
+        return nxt
+
+    def xori(a, b, nxt):
+        R[a] = int(R[a]) ^ b
+        return nxt
+
+    def shri(a, b, nxt):
+        R[a] >>= b
+        return nxt
+
+    def andi(a, b, nxt):
+        R[a] &= b
+        return nxt
+
+    def getc(a, b, nxt):
+        s = R[b]
+        if len(s) < 1:
+            R[a] = 0
+        else:
+            R[a] = ord(s[0])
+            R[b] = s[1:]
+        return nxt
+
+    def cmp(a, b, nxt):
+        x, y = R[a], R[b]
+        F[0], F[1] = (0, 0) if x > y else (1, 0) if x == y else (0, 1)
+        return nxt
+
+    def input_(a, b, nxt):
+        R[a] = box[0]
+        return nxt
+
+    def push(a, b, nxt):
+        S.append(R[a])
+        return nxt
+
+    def pop(a, b, nxt):
+        R[a] = S.pop() if S else 0
+        return nxt
+
+    def jmp(a, b, nxt):
+        return a
+
+    def je(a, b, nxt):
+        return a if F[0] else nxt
+
+    def ske(a, b, nxt):
+        return nxt + 1 + a if F[0] else nxt
+
+    def halt(a, b, nxt):
+        return HALT
+
+    return {194: movi, 126: mov, 145: addi, 34: add, 53: xori, 97: shri,
+            216: andi, 30: getc, 201: cmp, 205: input_, 120: push, 115: pop,
+            195: jmp, 16: je, 65: ske, 166: halt}
+
+
+def _fault(a, b, nxt):
+    return FAULT
+
+
+def _raiser(exc):
+    def fn(a, b, nxt):
+        raise exc
+    return fn
+
+
+class Machine:
+    """Byte-code muNFU pré-décodé, exécutable pour n’importe quel mot de passe."""
+
+    def __init__(self, bc: bytes):
+        self.bc = bytes(bc)
+        self.R, self.F, self.S, self._box = [0] * NREGS, [0, 0], [], [None]
+        self.handlers = _handlers(self.R, self.F, self.S, self._box)
+        self.prog = self._decode()
+
+    def _decode(self) -> list:
+        """prog[pc] pour tout pc atteignable : JMP ≤ 255, SKE ≤ len + 256."""
+        bc, n, table = self.bc, len(self.bc), self.handlers
+        prog = [(_fault, 0, 0, 0)] * (max(n, 255) + 258)
+        for pc in range(n):
+            op = bc[pc]
+            fn = table.get(op)
+            if fn is None:                          # KeyError de rojPpxsA[op]
+                prog[pc] = (_raiser(VMError(f"pc={pc} : opcode inconnu {op}")), 0, 0, 0)
+                continue
+            arity = OPCODES[op][1]
+            if pc + arity >= n:                     # IndexError de muNFV sur l’argument
+                prog[pc] = (_raiser(VMError(f"pc={pc} : {OPCODES[op][0]} tronqué")), 0, 0, 0)
+                continue
+            a = bc[pc + 1] if arity > 0 else 0
+            b = bc[pc + 2] if arity > 1 else 0
+            prog[pc] = (fn, a, b, pc + 1 + arity)
+        return prog
+
+    def reset(self, password: str) -> None:
+        """Registres, drapeaux et pile à zéro ; `password` répondra à input()."""
+        self.R[:] = [0] * NREGS
+        self.F[0] = self.F[1] = 0
+        self.S.clear()
+        self._box[0] = password
+
+    def run(self, password: str, max_steps: int = MAX_STEPS):
+        """Exécute le byte-code avec `password` comme réponse à input() ; renvoie R0 (1 si faute)."""
+        R, prog = self.R, self.prog
+        self.reset(password)
+        pc = 0
+        for _ in itertools.repeat(None, max_steps):
+            fn, a, b, nxt = prog[pc]
+            pc = fn(a, b, nxt)
+            if pc < 0:
+                break
+        else:
+            raise VMError(f"plus de {max_steps} instructions exécutées")
+        return 1 if pc == FAULT else R[0]
+
+    def check(self, password: str) -> bool:
+        """True si le challenge afficherait « Mot de passe valide ! »."""
+        return not self.run(password)
+
+
+# --- ligne de commande ---
+if __name__ == "__main__":
+    from solve_flag import extract_bytecode
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("file", help="VeritableMystere.py")
+    ap.add_argument("password")
+    ap.add_argument("--bench", type=int, default=0, metavar="N",
+                    help="exécuter N fois et afficher le débit")
+    args = ap.parse_args()
+
+    vm = Machine(extract_bytecode(args.file))
+    print("Mot de passe valide !" if vm.check(args.password) else "Mot de passe invalide !")
+    if args.bench:
+        t = time.perf_counter()
+        for _ in range(args.bench):
+            vm.run(args.password)
+        dt = time.perf_counter() - t
+        print(f"⏱  {args.bench} exécutions en {dt:.3f} s → {args.bench / dt:,.0f} /s")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vmprof.py
+---------
+Profil d’exécution de la VM muNFU : quels opcodes, quelles zones du
+byte-code dominent.
+
+Profiler exécute le programme pré-décodé d’une vm.Machine dans sa propre
+boucle instrumentée ; Machine.run reste inchangé, le coût est nul quand on
+ne profile pas. Tout est compté dans des tableaux alloués une fois :
+
+  • hits[pc]   array('Q')  passages par offset (cumulés sur plusieurs run) ;
+                           les comptes par opcode s’en déduisent après coup ;
+  • trace      tampon circulaire des `trace` derniers pas : pc, profondeur
+               de pile et R0…R7 avant l’instruction (array('q'), -1 pour
+               une valeur non entière comme la chaîne saisie).
+
+Exports :
+  • JSON : pas exécutés, comptes par opcode, offsets et blocs les plus
+    chauds, trace ;
+  • « folded stacks » (flamegraph.pl, speedscope…) : une ligne
+    « muNFU;bloc_XXXX;MNEMO@pc  passages » ; un bloc de base commence en 0,
+    sur une cible de saut ou après un branchement, de sorte qu’une boucle
+    chaude du byte-code obfusqué ressort comme une seule tour.
+
+Usage :  python3 vmprof.py VeritableMystere.py MOT_DE_PASSE… [--json f] [--folded f]
+                                                [--trace N] [--top K]
+"""
+
+import argparse, bisect, json
+from array import array
+
+from vm import FAULT, MAX_STEPS, NREGS, OPCODES, VMError
+
+BRANCHES = {195: "JMP", 16: "JE", 65: "SKE"}
+INT64 = 1 << 63
+
+
+class Profiler:
+    """Compteurs par offset et trace circulaire pour une vm.Machine."""
+
+    def __init__(self, machine, trace: int = 0):
+        self.vm = machine
+        self.hits = array("Q", bytes(8 * len(machine.prog)))
+        self.cap = trace
+        self.t_pc = array("I", bytes(4 * trace))
+        self.t_sp = array("I", bytes(4 * trace))
+        self.t_regs = array("q", bytes(8 * NREGS * trace))
+        self.steps = self.runs = self.recorded = 0
+
+    # --- exécution ---
+    def run(self, password: str, max_steps: int = MAX_STEPS):
+        """Comme Machine.run, en comptant chaque pas."""
+        vm = self.vm
+        vm.reset(password)
+        prog, hits, pc, n = vm.prog, self.hits, 0, 0
+        record = self._record if self.cap else None
+        for n in range(1, max_steps + 1):
+            fn, a, b, nxt = prog[pc]
+            hits[pc] += 1
+            if record:
+                record(pc)
+            pc = fn(a, b, nxt)
+            if pc < 0:
+                break
+        else:
+            raise VMError(f"plus de {max_steps} instructions exécutées")
+        self.steps += n
+        self.runs += 1
+        return 1 if pc == FAULT else vm.R[0]
+
+    def _record(self, pc: int) -> None:
+        i = self.recorded % self.cap
+        self.recorded += 1
+        self.t_pc[i] = pc
+        self.t_sp[i] = len(self.vm.S)
+        base = i * NREGS
+        row = [v if v.__class__ is int else -1 for v in self.vm.R]     # chaîne saisie : -1
+        try:
+            self.t_regs[base:base + NREGS] = array("q", row)
+        except OverflowError:                       # entier hors 64 bits
+            self.t_regs[base:base + NREGS] = array("q", (v if -INT64 <= v < INT64 else -1
+                                                         for v in row))
+
+    def reset(self) -> None:
+        for col in (self.hits, self.t_pc, self.t_sp, self.t_regs):
+            col[:] = array(col.typecode, bytes(col.itemsize * len(col)))
+        self.steps = self.runs = self.recorded = 0
+
+    # --- agrégats ---
+    def mnemonic(self, pc: int) -> str:
+        bc = self.vm.bc
+        if pc >= len(bc):
+            return "FAULT"
+        return OPCODES.get(bc[pc], (f"?{bc[pc]}", 0))[0]
+
+    def opcodes(self) -> dict:
+        counts = {}
+        for pc in self.executed():
+            name = self.mnemonic(pc)
+            counts[name] = counts.get(name, 0) + self.hits[pc]
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+    def executed(self) -> list:
+        return [pc for pc, h in enumerate(self.hits) if h]
+
+    def leaders(self) -> list:
+        """Débuts de blocs de base parmi les offsets exécutés."""
+        prog, lead = self.vm.prog, {0}
+        for pc in self.executed():
+            if pc < len(self.vm.bc) and self.vm.bc[pc] in BRANCHES:
+                _, a, _, nxt = prog[pc]
+                lead.add(nxt)
+                lead.add(a if self.vm.bc[pc] != 65 else nxt + 1 + a)
+        return sorted(lead)
+
+    def blocks(self) -> dict:
+        """Passages par bloc de base (offset de tête → instructions exécutées)."""
+        lead, out = self.leaders(), {}
+        for pc in self.executed():
+            head = lead[bisect.bisect_right(lead, pc) - 1]
+            out[head] = out.get(head, 0) + self.hits[pc]
+        return out
+
+    def trace(self) -> list:
+        """Pas enregistrés, du plus ancien au plus récent."""
+        n = min(self.recorded, self.cap)
+        out = []
+        for k in range(self.recorded - n, self.recorded):
+            i = k % self.cap
+            out.append({"pc": self.t_pc[i], "op": self.mnemonic(self.t_pc[i]),
+                        "sp": self.t_sp[i], "R": list(self.t_regs[i * NREGS:(i + 1) * NREGS])})
+        return out
+
+    # --- exports ---
+    def to_json(self, top: int = 20) -> dict:
+        hot = sorted(self.executed(), key=lambda pc: -self.hits[pc])[:top]
+        blocks = sorted(self.blocks().items(), key=lambda kv: -kv[1])[:top]
+        return {
+            "runs": self.runs, "steps": self.steps,
+            "opcodes": self.opcodes(),
+            "hot_pcs": [{"pc": pc, "op": self.mnemonic(pc), "hits": self.hits[pc]} for pc in hot],
+            "hot_blocks": [{"start": s, "hits": h} for s, h in blocks],
+            "trace": self.trace() if self.cap else [],
+        }
+
+    def folded(self) -> str:
+        lead, lines = self.leaders(), []
+        for pc in self.executed():
+            head = lead[bisect.bisect_right(lead, pc) - 1]
+            lines.append(f"muNFU;bloc_{head:04x};{self.mnemonic(pc)}@{pc:04x} {self.hits[pc]}")
+        return "\n".join(lines) + "\n"
+
+
+# --- ligne de commande ---
+if __name__ == "__main__":
+    from solve_flag import extract_bytecode
+    from vm import Machine
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("file", help="VeritableMystere.py")
+    ap.add_argument("passwords", nargs="+", help="un ou plusieurs mots de passe à exécuter")
+    ap.add_argument("--json", metavar="FICHIER", default=None)
+    ap.add_argument("--folded", metavar="FICHIER", default=None,
+                    help="piles repliées pour flamegraph.pl / speedscope")
+    ap.add_argument("--trace", type=int, default=0, metavar="N",
+                    help="garder les N derniers pas (pc, pile, registres)")
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    prof = Profiler(Machine(extract_bytecode(args.file)), args.trace)
+    for pw in args.passwords:
+        verdict = "valide" if not prof.run(pw) else "invalide"
+        print(f"[•] {pw!r} : mot de passe {verdict}")
+    print(f"\n📊 {prof.runs} exécution(s), {prof.steps} instructions")
+    for name, n in list(prof.opcodes().items())[:args.top]:
+        print(f"   {name:<6} {n:>10}  {100 * n / prof.steps:5.1f} %")
+    print("\n🔥 Blocs les plus chauds")
+    for head, n in sorted(prof.blocks().items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"   bloc_{head:04x} {n:>10}  {100 * n / prof.steps:5.1f} %")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(prof.to_json(args.top), f, indent=1)
+    if args.folded:
+        with open(args.folded, "w") as f:
+            f.write(prof.folded())